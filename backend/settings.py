@@ -15,6 +15,7 @@ from pathlib import Path
 
 import environ
 import sentry_sdk
+from celery.schedules import crontab
 from django.template.context_processors import media
 
 env = environ.Env()
@@ -56,6 +57,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'seeder',
     'api_v1',
     'general_settings',
@@ -212,6 +214,20 @@ EMAIL_PORT = env('EMAIL_PORT', default='')
 DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='')
 EMAIL_USE_TLS = True
 
+# Pooled email delivery (notifications.services.email_pool)
+EMAIL_CONNECTION_MAX_IDLE = env.int('EMAIL_CONNECTION_MAX_IDLE', default=60)  # seconds
+
+# GeneralSettings snapshots are re-read from the shared cache at most this often per worker, so a
+# saved change can take this long to reach the other workers
+GENERAL_SETTINGS_LOCAL_TTL = env.float('GENERAL_SETTINGS_LOCAL_TTL', default=5.0)  # seconds
+# Rendered app-general-settings responses, keyed by settings version; with signed storage URLs
+# (AWS_QUERYSTRING_AUTH) also by signing window and never kept past half the URL lifetime
+APP_GENERAL_SETTINGS_CACHE_TIMEOUT = env.int('APP_GENERAL_SETTINGS_CACHE_TIMEOUT', default=3600)  # seconds
+
+# Buffered ScheduledActionTrack/ActivityLogs writes (processes.services.activity_log_buffer)
+ACTIVITY_LOG_BUFFER_SIZE = env.int('ACTIVITY_LOG_BUFFER_SIZE', default=100)
+ACTIVITY_LOG_FLUSH_INTERVAL = env.float('ACTIVITY_LOG_FLUSH_INTERVAL', default=2.0)  # seconds
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
@@ -226,6 +242,35 @@ CACHES = {
 # CELERY_TASK_TRACK_STARTED = True
 # CELERY_RESULT_BACKEND = 'django-db'
 
+# Process actions are kept in the database and dispatched by a periodic task
+# instead of living in the broker as long ETA messages.
+PROCESS_DISPATCH_INTERVAL = env.int('PROCESS_DISPATCH_INTERVAL', default=30)  # seconds
+PROCESS_DISPATCH_BATCH_SIZE = env.int('PROCESS_DISPATCH_BATCH_SIZE', default=500)
+# Published actions whose task has not started after this long are considered lost and dispatched again;
+# keep it well above the worst queue latency, a task starting later finds its actions reassigned and skips them
+PROCESS_DISPATCH_CLAIM_TIMEOUT = env.int('PROCESS_DISPATCH_CLAIM_TIMEOUT', default=3600)  # seconds
+# Number of scheduled actions executed by a single worker task
+PROCESS_EXECUTION_BATCH_SIZE = env.int('PROCESS_EXECUTION_BATCH_SIZE', default=50)
+# Number of scheduled jobs updated per transaction by bulk job actions; larger sets run in a task
+PROCESS_BULK_ACTION_CHUNK_SIZE = env.int('PROCESS_BULK_ACTION_CHUNK_SIZE', default=500)
+# Activity logs and action tracks are partitioned by month; partitions older than the retention
+# window are dropped (0 keeps everything) and partitions are created this many months ahead
+PROCESS_LOG_RETENTION_MONTHS = env.int('PROCESS_LOG_RETENTION_MONTHS', default=0)
+PROCESS_LOG_PARTITIONS_AHEAD = env.int('PROCESS_LOG_PARTITIONS_AHEAD', default=3)
+# Runs kept per scheduled job by the same maintenance task, older ones are deleted (0 keeps everything)
+PROCESS_JOB_RUN_HISTORY_LIMIT = env.int('PROCESS_JOB_RUN_HISTORY_LIMIT', default=100)
+
+CELERY_BEAT_SCHEDULE = {
+    'dispatch-due-process-actions': {
+        'task': 'processes.tasks.dispatch_due_process_actions',
+        'schedule': PROCESS_DISPATCH_INTERVAL,
+    },
+    'maintain-log-partitions': {
+        'task': 'processes.tasks.maintain_log_partitions',
+        'schedule': crontab(minute=15, hour=0),
+    },
+}
+
 AWS_ACCESS_KEY_ID = env('AWS_ACCESS_KEY_ID', default='')
 AWS_SECRET_ACCESS_KEY = env('AWS_SECRET_ACCESS_KEY', default='')
 AWS_SES_REGION_NAME = env('AWS_SES_REGION_NAME', default='eu-west-2')
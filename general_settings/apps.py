@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GeneralSettingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'general_settings'
+
+    def ready(self):
+        from . import signals  # noqa: F401
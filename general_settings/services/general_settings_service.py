@@ -1,19 +1,251 @@
+import hashlib
 import re
+import time
 from datetime import datetime, timedelta
+from types import MappingProxyType
+
+import pytz
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
 from django.utils import timezone
 from general_settings.models import GeneralSettings
+from general_settings.services.model_services import get_strf_date_format
 from dateutil.relativedelta import relativedelta
+from loguru import logger
+
+SETTINGS_SNAPSHOT_CACHE_KEY = 'general_settings:snapshot'
+
+
+def make_settings_snapshot(instance):
+    """
+    Return a plain, picklable copy of a GeneralSettings row (None when there is none),
+    versioned by its updated_at. The company logo is kept as its storage name.
+    """
+    if instance is None:
+        return None
+    snapshot = {field.attname: field.value_from_object(instance) for field in GeneralSettings._meta.concrete_fields}
+    snapshot['company_logo'] = instance.company_logo.name or None
+    snapshot['version'] = instance.updated_at.isoformat()
+    return snapshot
+
+
+def freeze(value):
+    """
+    Read-only copy of a JSON-like value: dicts become read-only mappings and lists tuples, at every level.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """
+    Plain, mutable copy of a value made by freeze.
+    """
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def get_version(snapshot):
+    return snapshot['version'] if snapshot else None
+
+
+def get_url_signing_window():
+    """
+    Return (start, length) in epoch seconds of the current URL signing window when the file
+    storage signs its URLs (S3 with querystring auth), otherwise None. A window lasts half the
+    signed URL lifetime, so anything rendered during it stays valid until the window is over.
+    """
+    if not getattr(default_storage, 'querystring_auth', False):
+        return None
+    length = max(int(default_storage.querystring_expire) // 2, 1)
+    return int(time.time()) // length * length, length
+
+
+def get_settings_etag(snapshot, signing_window=None):
+    """
+    Strong ETag of a settings snapshot, derived from its version (updated_at)
+    and the URL signing window when storage URLs are signed.
+    """
+    version = get_version(snapshot) or ''
+    if signing_window is not None:
+        version = f'{version}:{signing_window[0]}'
+    return f'"{hashlib.sha1(version.encode()).hexdigest()}"'
+
+
+class DateTimeFormatter:
+    """
+    Date and time formatting of the booking settings (time zone, date format and 12/24-hour clock),
+    resolved once per settings version instead of once per rendered variable.
+    """
+
+    def __init__(self, booking_settings):
+        booking_settings = booking_settings or {}
+        self.tz = pytz.timezone(booking_settings.get('time_zone') or settings.TIME_ZONE)
+        date_format = booking_settings.get('date_format')
+        self.date_format = get_strf_date_format(date_format) if date_format else date_format
+        self.time_system = booking_settings.get('time_system')
+        if self.time_system:
+            self.time_format = "%I:%M%p" if self.time_system == "12" else "%H:%M"
+        else:
+            self.time_format = None
+
+    def format_date(self, value):
+        if not value:
+            return ''
+        value = value.astimezone(self.tz).date()
+        return value.strftime(self.date_format) if self.date_format else value
+
+    def format_time(self, value):
+        if not value:
+            return ''
+        value = value.astimezone(self.tz)
+        if self.time_format is None:
+            return value
+        value = value.strftime(self.time_format)
+        return value.lower() if self.time_system == "12" else value
+
+
+BOOKING_RESTRICTION_NAMES = ['latest_possible_booking', 'earliest_possible_booking', 'max_future_bookings_per_customer']
+RESTRICTION_OFFSET_PATTERN = re.compile(r"([+-]?\d+)\s*(\w+)")
+RESTRICTION_OFFSET_UNITS = {
+    'second': 'seconds', 'seconds': 'seconds',
+    'minute': 'minutes', 'minutes': 'minutes',
+    'hour': 'hours', 'hours': 'hours',
+    'day': 'days', 'days': 'days',
+    'week': 'weeks', 'weeks': 'weeks',
+    'month': 'months', 'months': 'months',
+    'year': 'years', 'years': 'years',
+}
+
+
+class BookingRestriction:
+    """
+    A parsed earliest/latest booking restriction: either a fixed (naive) date or an offset from the current time.
+    """
+
+    def __init__(self, date=None, delta=None):
+        self.date = date
+        self.delta = delta
+
+    def resolve(self, current_time=None):
+        if self.date is not None:
+            return self.date
+        return (current_time or timezone.now()) + self.delta
+
+
+def parse_restriction_offset(time_string):
+    """
+    Parse an offset like "+2 weeks" or "3 days" into a relativedelta, None when it is not one.
+    """
+    match = RESTRICTION_OFFSET_PATTERN.match(time_string)
+    if not match:
+        return None
+    unit = RESTRICTION_OFFSET_UNITS.get(match.group(2).lower())
+    return relativedelta(**{unit: int(match.group(1))}) if unit else None
+
+
+def parse_restrictions(booking_restriction):
+    booking_restriction = booking_restriction or {}
+    parsed = {}
+    for name in ['latest_possible_booking', 'earliest_possible_booking']:
+        value = booking_restriction.get(name)
+        parsed[name] = None
+        if not value:
+            continue
+        try:
+            parsed[name] = BookingRestriction(date=datetime.strptime(value, '%Y-%m-%d'))
+        except ValueError:
+            delta = parse_restriction_offset(value)
+            parsed[name] = BookingRestriction(delta=delta) if delta is not None else None
+
+    max_booking = booking_restriction.get('max_future_bookings_per_customer')
+    parsed['max_future_bookings_per_customer'] = int(max_booking) if max_booking else None
+    return parsed
+
+
+class GeneralSettingsStore:
+    """
+    Worker-local GeneralSettings snapshot backed by the shared cache.
+    The snapshot is read from the cache at most every GENERAL_SETTINGS_LOCAL_TTL seconds and from the
+    database only when the cache has none. Saving GeneralSettings publishes the new snapshot on commit;
+    the saving worker sees it right away, the others keep serving the previous settings for up to the TTL.
+    The snapshot is frozen at every level since all threads of the worker share it.
+    """
+
+    def __init__(self):
+        # (monotonic load time, snapshot, values derived from the snapshot), swapped as a whole
+        # so readers need no lock
+        self._entry = None
+
+    @staticmethod
+    def load_snapshot():
+        snapshot = cache.get(SETTINGS_SNAPSHOT_CACHE_KEY)
+        if snapshot is None:
+            snapshot = {'settings': make_settings_snapshot(GeneralSettings.objects.first())}
+            # add, not set: never overwrite a snapshot published by a concurrent save
+            cache.add(SETTINGS_SNAPSHOT_CACHE_KEY, snapshot, timeout=None)
+        return snapshot['settings']
+
+    def get_entry(self):
+        """
+        Return (load time, snapshot, derived values) for the current settings version.
+        The derived values dict is shared by every reader of that version, see GeneralSettingsService.get_derived.
+        """
+        entry = self._entry
+        if entry is not None and time.monotonic() - entry[0] < settings.GENERAL_SETTINGS_LOCAL_TTL:
+            return entry
+
+        try:
+            snapshot = self.load_snapshot()
+        except Exception as e:
+            if entry is None:
+                raise
+            logger.warning(f"Keeping the previous general settings snapshot: {e}")
+            return entry
+
+        if entry is not None and get_version(entry[1]) == get_version(snapshot):
+            # Same version: keep the snapshot and everything derived from it
+            entry = (time.monotonic(), entry[1], entry[2])
+        else:
+            entry = (time.monotonic(), freeze(snapshot), {})
+        self._entry = entry
+        return entry
+
+    def get_snapshot(self):
+        """
+        Return the current settings as a deeply read-only mapping, or None when no GeneralSettings row exists.
+        """
+        return self.get_entry()[1]
+
+    @staticmethod
+    def publish(instance):
+        cache.set(SETTINGS_SNAPSHOT_CACHE_KEY, {'settings': make_settings_snapshot(instance)}, timeout=None)
+
+    def clear(self):
+        self._entry = None
+
+
+settings_store = GeneralSettingsStore()
 
 
 class GeneralSettingsService:
     def __init__(self):
-        self.general_settings = GeneralSettings.objects.first()
-        self.customer_settings = self.general_settings.customer if self.general_settings else None
-        self.setup_pages = self.general_settings.setup_pages if self.general_settings else None
-        self.booking_settings = self.general_settings.booking if self.general_settings else None
-        self.booking_restriction = self.general_settings.restriction if self.general_settings else None
-        self.timeslot_availability_logic = self.general_settings.timeslot_availability_logic if self.general_settings else None
-        self.business_information = self.general_settings.business_information if self.general_settings else None
+        # Read-only snapshot shared by every service instance of the worker, see GeneralSettingsStore.
+        # The sections handed to callers are plain copies they are free to modify
+        _, self.general_settings, self._derived = settings_store.get_entry()
+        self.customer_settings = thaw(self.general_settings.get('customer')) if self.general_settings else None
+        self.setup_pages = thaw(self.general_settings.get('setup_pages')) if self.general_settings else None
+        self.booking_settings = thaw(self.general_settings.get('booking')) if self.general_settings else None
+        self.booking_restriction = thaw(self.general_settings.get('restriction')) if self.general_settings else None
+        self.timeslot_availability_logic = thaw(self.general_settings.get('timeslot_availability_logic')) if self.general_settings else None
+        self.business_information = thaw(self.general_settings.get('business_information')) if self.general_settings else None
 
     @staticmethod
     def is_date(date):
@@ -24,32 +256,8 @@ class GeneralSettingsService:
 
     @staticmethod
     def restriction_time_value(time_string):
-        current_datetime = timezone.now()
-        match = re.match(r"([+-]?\d+)\s*(\w+)", time_string)
-        if match:
-            value = int(match.group(1))
-            unit = match.group(2).lower()
-
-            if unit in ['day', 'days']:
-                result = current_datetime + timedelta(days=value)
-            elif unit in ['week', 'weeks']:
-                result = current_datetime + timedelta(weeks=value)
-            elif unit in ['hour', 'hours']:
-                result = current_datetime + timedelta(hours=value)
-            elif unit in ['minute', 'minutes']:
-                result = current_datetime + timedelta(minutes=value)
-            elif unit in ['second', 'seconds']:
-                result = current_datetime + timedelta(seconds=value)
-            elif unit in ['month', 'months']:
-                result = current_datetime + relativedelta(months=value)
-            elif unit in ['year', 'years']:
-                result = current_datetime + relativedelta(years=value)
-            else:
-                return False
-
-            return result
-        else:
-            return False
+        delta = parse_restriction_offset(time_string)
+        return timezone.now() + delta if delta is not None else False
 
     def get_dashboard_url(self):
         return self.setup_pages.get('page_url_customer_dashboard', '')
@@ -57,27 +265,46 @@ class GeneralSettingsService:
     def get_referral_page_url(self):
         return self.setup_pages.get('referral_page_url')
 
+    def get_parsed_restrictions(self):
+        """
+        Return the booking restrictions parsed once per settings version:
+        BookingRestriction objects (or None) for the earliest/latest booking and an int (or None)
+        for the maximum number of future bookings per customer.
+        """
+        return self.get_derived('booking_restrictions', lambda service: parse_restrictions(service.booking_restriction))
+
     def booking_restrictions(self, restriction_name=None):
-        restrictions = {
-            "latest_possible_booking": self.booking_restriction.get("latest_possible_booking", None),
-            "earliest_possible_booking": self.booking_restriction.get("earliest_possible_booking", None),
-            "max_future_bookings_per_customer": self.booking_restriction.get("max_future_bookings_per_customer", None),
-        }
         if restriction_name:
-            if restriction_name == 'max_future_bookings_per_customer':
-                max_booking = restrictions.get(restriction_name)
-                return int(max_booking) if max_booking else None
+            restriction = self.get_parsed_restrictions().get(restriction_name)
+            if isinstance(restriction, BookingRestriction):
+                return restriction.resolve()
+            return restriction
 
-            restriction_date = self.is_date(restrictions.get(restriction_name))
-            if restriction_date:
-                return restriction_date
+        booking_restriction = self.booking_restriction or {}
+        return {name: booking_restriction.get(name, None) for name in BOOKING_RESTRICTION_NAMES}
 
-            restriction_time = self.restriction_time_value(restrictions.get(restriction_name))
-            if restriction_time:
-                return restriction_time
+    def check_booking_times(self, booking_times, current_time=None):
+        """
+        Return, for each candidate booking time (aware datetimes), whether it lies between the earliest
+        and latest possible booking. The restrictions are resolved once for the whole batch; a fixed
+        latest date allows bookings until the end of that day, in the booking time zone.
+        """
+        current_time = current_time or timezone.now()
+        restrictions = self.get_parsed_restrictions()
+        tz = self.get_datetime_formatter().tz
 
-            return None
-        return restrictions
+        earliest = restrictions['earliest_possible_booking']
+        if earliest is not None:
+            earliest = tz.localize(earliest.date) if earliest.date else earliest.resolve(current_time)
+        latest = restrictions['latest_possible_booking']
+        if latest is not None:
+            latest = (tz.localize(latest.date + timedelta(days=1)) - timedelta(microseconds=1) if latest.date
+                      else latest.resolve(current_time))
+
+        return [
+            (earliest is None or booking_time >= earliest) and (latest is None or booking_time <= latest)
+            for booking_time in booking_times
+        ]
 
     def get_booking_setting(self, status_name=None):
         all_booking_statues = {
@@ -104,11 +331,22 @@ class GeneralSettingsService:
             return all_timeslot_logic.get(logic_name)
         return all_timeslot_logic
 
+    def get_derived(self, name, build):
+        """
+        Return `build(self)`, computed once per settings version and shared by the service instances of the worker.
+        """
+        if name not in self._derived:
+            self._derived[name] = build(self)
+        return self._derived[name]
+
+    def get_datetime_formatter(self):
+        return self.get_derived('datetime_formatter', lambda service: DateTimeFormatter(service.booking_settings))
+
     def get_compony_logo_url(self):
-        if not self.general_settings:
+        if not self.general_settings or not self.general_settings['company_logo']:
             return None
-        return self.general_settings.company_logo.url if self.general_settings.company_logo else None
+        return GeneralSettings._meta.get_field('company_logo').storage.url(self.general_settings['company_logo'])
 
     def get_business_info(self):
-        return self.general_settings.business_information if self.general_settings else None
+        return self.business_information
 
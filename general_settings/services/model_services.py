@@ -85,190 +85,220 @@ def default_business_information_value():
     }
 
 
+def copy_options(options):
+    """
+    Return a fresh list of the option dicts, so callers can't alter the shared constants.
+    """
+    return [dict(option) for option in options]
+
+
+GENERAL_SETTINGS_STATUS_OPTIONS = (
+    {
+        "id": 1,
+        "label": "Approved",
+        "value": "approved"
+    },
+    {
+        "id": 2,
+        "label": "Pending Approval",
+        "value": "pending"
+    },
+    {
+        "id": 3,
+        "label": "Cancelled by Customer",
+        "value": "cancelled_by_customer"
+    },
+    {
+        "id": 4,
+        "label": "Cancelled by Staff",
+        "value": "cancelled_by_staff",
+    },
+    {
+        "id": 5,
+        "label": "No Show",
+        "value": "no_show"
+    },
+    {
+        "id": 6,
+        "label": "Completed",
+        "value": "completed"
+    },
+    {
+        "id": 7,
+        "label": 'Customer Rescheduled',
+        "value": 'customer_rescheduled',
+    },
+    {
+        "id": 8,
+        "label": 'Staff Rescheduled',
+        "value": 'staff_rescheduled',
+    },
+)
+
+
 def general_settings_status_options():
-    return [
-        {
-            "id": 1,
-            "label": "Approved",
-            "value": "approved"
-        },
-        {
-            "id": 2,
-            "label": "Pending Approval",
-            "value": "pending"
-        },
-        {
-            "id": 3,
-            "label": "Cancelled by Customer",
-            "value": "cancelled_by_customer"
-        },
-        {
-            "id": 4,
-            "label": "Cancelled by Staff",
-            "value": "cancelled_by_staff",
-        },
-        {
-            "id": 5,
-            "label": "No Show",
-            "value": "no_show"
-        },
-        {
-            "id": 6,
-            "label": "Completed",
-            "value": "completed"
-        },
-        {
-            "id": 7,
-            "label": 'Customer Rescheduled',
-            "value": 'customer_rescheduled',
-        },
-        {
-            "id": 8,
-            "label": 'Staff Rescheduled',
-            "value": 'staff_rescheduled',
-        },
-    ]
+    return copy_options(GENERAL_SETTINGS_STATUS_OPTIONS)
+
+
+GENERAL_SETTINGS_TIME_SYSTEM_OPTIONS = (
+    {
+        "id": 1,
+        "label": "12-hour clock",
+        "value": "12"
+    },
+    {
+        "id": 2,
+        "label": "24-hour clock",
+        "value": "24"
+    },
+)
 
 
 def general_settings_time_system_options():
-    return [
-        {
-            "id": 1,
-            "label": "12-hour clock",
-            "value": "12"
-        },
-        {
-            "id": 2,
-            "label": "24-hour clock",
-            "value": "24"
-        },
-    ]
+    return copy_options(GENERAL_SETTINGS_TIME_SYSTEM_OPTIONS)
+
+
+GENERAL_SETTINGS_DATE_FORMAT_OPTIONS = (
+    {
+        "id": 1,
+        "label": "MM/DD/YYYY",
+        "value": "mm/dd/yyyy"
+    },
+    {
+        "id": 2,
+        "label": "MM.DD.YYYY",
+        "value": "mm.dd.yyyy"
+    },
+    {
+        "id": 3,
+        "label": "DD/MM/YYYY",
+        "value": "dd/mm/yyyy"
+    },
+    {
+        "id": 4,
+        "label": "DD.MM.YYYY",
+        "value": "dd.mm.yyyy"
+    },
+    {
+        "id": 5,
+        "label": "YYYY-MM-DD",
+        "value": "yyyy-mm-dd"
+    },
+)
 
 
 def general_settings_date_format_options():
-    return [
-        {
-            "id": 1,
-            "label": "MM/DD/YYYY",
-            "value": "mm/dd/yyyy"
-        },
-        {
-            "id": 2,
-            "label": "MM.DD.YYYY",
-            "value": "mm.dd.yyyy"
-        },
-        {
-            "id": 3,
-            "label": "DD/MM/YYYY",
-            "value": "dd/mm/yyyy"
-        },
-        {
-            "id": 4,
-            "label": "DD.MM.YYYY",
-            "value": "dd.mm.yyyy"
-        },
-        {
-            "id": 5,
-            "label": "YYYY-MM-DD",
-            "value": "yyyy-mm-dd"
-        },
-    ]
+    return copy_options(GENERAL_SETTINGS_DATE_FORMAT_OPTIONS)
+
+STRF_DATE_FORMATS = {
+    "mm/dd/yyyy": "%m/%d/%Y",
+    "mm.dd.yyyy": "%m.%d.%Y",
+    "dd/mm/yyyy": "%d/%m/%Y",
+    "dd.mm.yyyy": "%d.%m.%Y",
+    "yyyy-mm-dd": "%Y-%m-%d"
+}
+
 
 def get_strf_date_format(value):
-    format_map = {
-        "mm/dd/yyyy": "%m/%d/%Y",
-        "mm.dd.yyyy": "%m.%d.%Y",
-        "dd/mm/yyyy": "%d/%m/%Y",
-        "dd.mm.yyyy": "%d.%m.%Y",
-        "yyyy-mm-dd": "%Y-%m-%d"
-    }
-    return format_map.get(value)
+    return STRF_DATE_FORMATS.get(value)
+
+GENERAL_SETTINGS_THOUSAND_SEPARATOR_OPTIONS = (
+    {
+        "id": 1,
+        "label": "Comma (1,000)",
+        "value": ","
+    },
+    {
+        "id": 2,
+        "label": "Dot (1.000)",
+        "value": "."
+    },
+    {
+        "id": 3,
+        "label": "Space (1 000)",
+        "value": " "
+    },
+    {
+        "id": 4,
+        "label": "None (1000)",
+        "value": ""
+    },
+)
+
 
 def general_settings_thousand_separator_options():
-    return [
-        {
-            "id": 1,
-            "label": "Comma (1,000)",
-            "value": ","
-        },
-        {
-            "id": 2,
-            "label": "Dot (1.000)",
-            "value": "."
-        },
-        {
-            "id": 3,
-            "label": "Space (1 000)",
-            "value": " "
-        },
-        {
-            "id": 4,
-            "label": "None (1000)",
-            "value": ""
-        },
-    ]
+    return copy_options(GENERAL_SETTINGS_THOUSAND_SEPARATOR_OPTIONS)
+
+
+GENERAL_SETTINGS_DECIMAL_SEPARATOR_OPTIONS = (
+    {
+        "id": 1,
+        "label": "Dot (0.99)",
+        "value": "."
+    },
+    {
+        "id": 2,
+        "label": "Comma (0,99)",
+        "value": ","
+    }
+)
 
 
 def general_settings_decimal_separator_options():
-    return [
-        {
-            "id": 1,
-            "label": "Dot (0.99)",
-            "value": "."
-        },
-        {
-            "id": 2,
-            "label": "Comma (0,99)",
-            "value": ","
-        }
-    ]
+    return copy_options(GENERAL_SETTINGS_DECIMAL_SEPARATOR_OPTIONS)
+
+
+GENERAL_SETTINGS_NUMBER_OF_DECIMALS_OPTIONS = (
+    {
+        "id": 1,
+        "label": "0",
+        "value": "0"
+    },
+    {
+        "id": 2,
+        "label": "1",
+        "value": "1"
+    },
+    {
+        "id": 3,
+        "label": "2",
+        "value": "2"
+    },
+    {
+        "id": 4,
+        "label": "3",
+        "value": "3"
+    },
+    {
+        "id": 5,
+        "label": "4",
+        "value": "4"
+    },
+)
 
 
 def general_settings_number_of_decimals_options():
-    return [
-        {
-            "id": 1,
-            "label": "0",
-            "value": "0"
-        },
-        {
-            "id": 2,
-            "label": "1",
-            "value": "1"
-        },
-        {
-            "id": 3,
-            "label": "2",
-            "value": "2"
-        },
-        {
-            "id": 4,
-            "label": "3",
-            "value": "3"
-        },
-        {
-            "id": 5,
-            "label": "4",
-            "value": "4"
-        },
-    ]
+    return copy_options(GENERAL_SETTINGS_NUMBER_OF_DECIMALS_OPTIONS)
+
+
+GENERAL_SETTINGS_TIME_DURATION_OPTIONS = (
+    {
+        "id": 1,
+        "label": "minutes",
+        "value": "minute"
+    },
+    {
+        "id": 2,
+        "label": "hours",
+        "value": "hour"
+    },
+    {
+        "id": 3,
+        "label": "days",
+        "value": "day"
+    },
+)
 
 
 def general_settings_time_duration_options():
-    return [
-        {
-            "id": 1,
-            "label": "minutes",
-            "value": "minute"
-        },
-        {
-            "id": 2,
-            "label": "hours",
-            "value": "hour"
-        },
-        {
-            "id": 3,
-            "label": "days",
-            "value": "day"
-        },
-    ]
+    return copy_options(GENERAL_SETTINGS_TIME_DURATION_OPTIONS)
@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from general_settings.models import GeneralSettings
+from general_settings.services.general_settings_service import settings_store
+
+
+def publish_settings(instance):
+    settings_store.publish(instance)
+    settings_store.clear()
+
+
+@receiver(post_save, sender=GeneralSettings)
+def publish_general_settings(sender, instance, **kwargs):
+    # Only committed settings are shared with the other workers
+    transaction.on_commit(lambda: publish_settings(instance))
+
+
+@receiver(post_delete, sender=GeneralSettings)
+def invalidate_general_settings(sender, instance, **kwargs):
+    transaction.on_commit(lambda: publish_settings(GeneralSettings.objects.first()))
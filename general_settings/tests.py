@@ -1,3 +1,262 @@
-from django.test import TestCase
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+import pytz
+from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+
+from general_settings.models import GeneralSettings
+from general_settings.services.general_settings_service import DateTimeFormatter, GeneralSettingsService, \
+    parse_restriction_offset, parse_restrictions, settings_store
+from general_settings.services.model_services import GENERAL_SETTINGS_STATUS_OPTIONS, \
+    general_settings_status_options
+from user_management.models import Account
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class GeneralSettingsSnapshotTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Account.objects.create_user(email="admin@example.com", password="strongpassword123",
+                                               is_staff=True, is_superuser=True)
+        cls.general_settings = GeneralSettings.objects.create(
+            setup_pages={'page_url_customer_dashboard': 'https://example.com/dashboard'},
+            business_information={'company_name': 'Example'},
+        )
+
+    def setUp(self):
+        cache.clear()
+        settings_store.clear()
+
+    def test_reads_are_cached(self):
+        """
+        Test the settings are loaded from the database once and then shared by every service.
+        """
+        with self.assertNumQueries(1):
+            GeneralSettingsService()
+        with self.assertNumQueries(0):
+            service = GeneralSettingsService()
+        self.assertEqual(service.get_dashboard_url(), 'https://example.com/dashboard')
+        self.assertEqual(service.general_settings['version'], self.general_settings.updated_at.isoformat())
+        with self.assertRaises(TypeError):
+            service.general_settings['setup_pages'] = {}
+
+        # Another worker only reads the shared cache
+        settings_store.clear()
+        with self.assertNumQueries(0):
+            GeneralSettingsService()
+
+    def test_snapshot_is_deeply_read_only(self):
+        """
+        Test nested settings cannot be changed through the shared snapshot and callers get their own copies.
+        """
+        snapshot = settings_store.get_snapshot()
+        with self.assertRaises(TypeError):
+            snapshot['business_information']['company_name'] = 'Changed'
+
+        service = GeneralSettingsService()
+        service.get_business_info()['company_name'] = 'Changed'
+        self.assertEqual(GeneralSettingsService().get_business_info(), {'company_name': 'Example'})
+        self.assertEqual(settings_store.get_snapshot()['business_information']['company_name'], 'Example')
+
+    def test_save_publishes_snapshot(self):
+        """
+        Test saving the settings replaces the cached snapshot with a new version.
+        """
+        version = GeneralSettingsService().general_settings['version']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.general_settings.business_information = {'company_name': 'Renamed'}
+            self.general_settings.save()
+
+        with self.assertNumQueries(0):
+            service = GeneralSettingsService()
+        self.assertEqual(service.get_business_info(), {'company_name': 'Renamed'})
+        self.assertNotEqual(service.general_settings['version'], version)
+
+    def test_formatter_per_version(self):
+        """
+        Test the date/time formatter is built once per settings version.
+        """
+        formatter = GeneralSettingsService().get_datetime_formatter()
+        self.assertIs(GeneralSettingsService().get_datetime_formatter(), formatter)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.general_settings.save()
+        self.assertIsNot(GeneralSettingsService().get_datetime_formatter(), formatter)
+
+    def test_clean_cache(self):
+        """
+        Test the clean-cache action drops the shared and the local snapshot.
+        """
+        GeneralSettingsService()
+        self.client.force_authenticate(self.user)
+        response = self.client.post('/api/v1/general-settings/clean-cache/')
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(1):
+            GeneralSettingsService()
+
+
+class DateTimeFormatterTestCase(SimpleTestCase):
+    value = pytz.utc.localize(datetime(2024, 7, 1, 13, 5))
+
+    def test_formats(self):
+        """
+        Test dates and times are converted to the booking time zone and formatted with the settings.
+        """
+        formatter = DateTimeFormatter({'time_zone': 'Europe/London', 'date_format': 'dd.mm.yyyy', 'time_system': '12'})
+        self.assertEqual(formatter.format_date(self.value), '01.07.2024')
+        self.assertEqual(formatter.format_time(self.value), '02:05pm')
+        self.assertEqual(formatter.format_time(None), '')
+
+        formatter = DateTimeFormatter({'time_zone': 'Asia/Dhaka', 'time_system': '24'})
+        self.assertEqual(formatter.format_time(self.value), '19:05')
+        self.assertEqual(formatter.format_date(self.value), self.value.date())
+
+
+class SettingsOptionsTestCase(SimpleTestCase):
+    def test_options_are_copies(self):
+        """
+        Test changing a returned option list leaves the shared options untouched.
+        """
+        options = general_settings_status_options()
+        options[0]['label'] = 'Changed'
+        options.append({'id': 9, 'label': 'Extra', 'value': 'extra'})
+
+        self.assertEqual(general_settings_status_options()[0]['label'], 'Approved')
+        self.assertEqual(len(general_settings_status_options()), len(GENERAL_SETTINGS_STATUS_OPTIONS))
+
+
+class BookingRestrictionTestCase(SimpleTestCase):
+    snapshot = {
+        'version': '2024-07-01T00:00:00+00:00',
+        'booking': {'time_zone': 'Europe/London'},
+        'restriction': {
+            'earliest_possible_booking': '+2 hours',
+            'latest_possible_booking': '2024-07-10',
+            'max_future_bookings_per_customer': '3',
+        },
+    }
+
+    def setUp(self):
+        settings_store.clear()
+        self.addCleanup(settings_store.clear)
+        patcher = mock.patch.object(settings_store, 'load_snapshot', return_value=self.snapshot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parse_offsets(self):
+        """
+        Test restriction offsets are parsed into relative deltas.
+        """
+        self.assertEqual(parse_restriction_offset('+2 weeks'), relativedelta(weeks=2))
+        self.assertEqual(parse_restriction_offset('1 month'), relativedelta(months=1))
+        self.assertIsNone(parse_restriction_offset('3 fortnights'))
+        self.assertIsNone(parse_restriction_offset('soon'))
+
+    def test_parsed_once_per_version(self):
+        """
+        Test the restriction strings are parsed once, only the offset is applied per call.
+        """
+        target = 'general_settings.services.general_settings_service.parse_restrictions'
+        with mock.patch(target, wraps=parse_restrictions) as parse:
+            earliest = GeneralSettingsService().booking_restrictions('earliest_possible_booking')
+            self.assertEqual(GeneralSettingsService().booking_restrictions('max_future_bookings_per_customer'), 3)
+            self.assertEqual(GeneralSettingsService().booking_restrictions('latest_possible_booking'),
+                             datetime(2024, 7, 10))
+        self.assertEqual(parse.call_count, 1)
+        self.assertAlmostEqual(earliest.timestamp(), (now() + timedelta(hours=2)).timestamp(), delta=5)
+
+    def test_check_booking_times(self):
+        """
+        Test a batch of candidate times is checked against the earliest and latest possible booking.
+        """
+        current_time = pytz.utc.localize(datetime(2024, 7, 1, 12, 0))
+        candidates = [
+            pytz.utc.localize(datetime(2024, 7, 1, 13, 0)),  # before the earliest possible booking
+            pytz.utc.localize(datetime(2024, 7, 1, 15, 0)),
+            pytz.utc.localize(datetime(2024, 7, 10, 22, 30)),  # 23:30 on the latest day in London
+            pytz.utc.localize(datetime(2024, 7, 10, 23, 30)),  # already the next day in London
+        ]
+        self.assertEqual(GeneralSettingsService().check_booking_times(candidates, current_time),
+                         [False, True, True, False])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AppGeneralSettingsTestCase(APITestCase):
+    url = '/api/v1/general-settings/app-general-settings/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.general_settings = GeneralSettings.objects.create(
+            phone={'show_phone_countries': 'all', 'default_phone_country': 'gb', 'included_phone_countries': [],
+                   'validate_phone_number': False, 'format_phone_number': False, 'show_dial_code_with_flag': True},
+            setup_pages={'page_url_customer_login': '', 'page_url_customer_dashboard': '', 'terms_and_policies': '',
+                         'page_url_customer_waiver_submission': None, 'referral_page_url': None},
+            business_information={'company_name': 'Example', 'business_phone': '123', 'business_address': 'Street'},
+        )
+
+    def setUp(self):
+        cache.clear()
+        settings_store.clear()
+
+    def test_conditional_requests(self):
+        """
+        Test revalidation with the ETag is answered with 304 without any database query.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['business_information']['company_name'], 'Example')
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+            cached = self.client.get(self.url)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        self.assertEqual(cached.content, response.content)
+
+    def test_etag_follows_updates(self):
+        """
+        Test saving the settings changes the ETag and the rendered response.
+        """
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.general_settings.business_information = {**self.general_settings.business_information,
+                                                          'company_name': 'Renamed'}
+            self.general_settings.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['business_information']['company_name'], 'Renamed')
+
+    @mock.patch('general_settings.services.general_settings_service.default_storage',
+                mock.Mock(querystring_auth=True, querystring_expire=3600))
+    @mock.patch('time.time')
+    def test_signed_urls_expire_the_etag(self, time_mock):
+        """
+        Test with signed storage URLs the ETag and cached response change once the signing window is over.
+        """
+        time_mock.return_value = 1800 * 1000000 + 10
+        response = self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(response['Last-Modified'], http_date(1800 * 1000000))
+
+        # Half of the URL lifetime later the response would carry URLs close to expiry
+        time_mock.return_value += 1800
+        with CaptureQueriesContext(connection) as queries:
+            renewed = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(renewed.status_code, 200)
+        self.assertNotEqual(renewed['ETag'], response['ETag'])
+        # Rendered again rather than served from the cache
+        self.assertTrue(queries.captured_queries)
+        self.assertEqual(renewed['Last-Modified'], http_date(1800 * 1000001))
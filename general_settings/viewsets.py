@@ -1,9 +1,15 @@
+import time
+
 from django.conf import settings
 from django.core.cache import cache
 from django.core.mail import send_mail
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from drf_spectacular.utils import extend_schema
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
 from common_bases.permissions import IsAdminOrHasPermission
@@ -11,8 +17,11 @@ from common_bases.serializers import EmptySerializer
 from common_bases.viewsets import InitialModelViewSet
 from .models import GeneralSettings
 from .serializers import GeneralSettingsSerializer, AppGeneralSettingsSerializer, TestEmailSerializer
+from .services.general_settings_service import settings_store, get_settings_etag, get_url_signing_window
 from .tasks import task_test_email
 
+APP_GENERAL_SETTINGS_CACHE_KEY_PREFIX = 'general_settings:app_general_settings'
+
 
 class GeneralSettingsViewSets(InitialModelViewSet):
     queryset = GeneralSettings.objects.all()
@@ -75,9 +84,39 @@ class GeneralSettingsViewSets(InitialModelViewSet):
     )
     @action(detail=False, methods=['GET'], url_path='app-general-settings')
     def app_general_settings(self, request):
-        queryset = self.get_queryset().first()
-        serializer = AppGeneralSettingsSerializer(queryset)
-        return Response(serializer.data)
+        # Validated against the settings snapshot only: an unchanged page costs no database query.
+        # Signed logo URLs expire, so with signing on the response also changes with the signing window
+        snapshot = settings_store.get_snapshot()
+        signing_window = get_url_signing_window()
+        etag = get_settings_etag(snapshot, signing_window)
+        last_modified = int(snapshot['updated_at'].timestamp()) if snapshot else None
+        timeout = settings.APP_GENERAL_SETTINGS_CACHE_TIMEOUT
+        if signing_window is not None:
+            start, length = signing_window
+            last_modified = max(last_modified or 0, start)
+            timeout = min(timeout, max(start + length - int(time.time()), 1))
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return self.set_validators(not_modified, etag, last_modified)
+
+        cache_key = f"{APP_GENERAL_SETTINGS_CACHE_KEY_PREFIX}:{snapshot['version'] if snapshot else None}"
+        if signing_window is not None:
+            cache_key = f"{cache_key}:{signing_window[0]}"
+        content = cache.get(cache_key)
+        if content is None:
+            serializer = AppGeneralSettingsSerializer(self.get_queryset().first())
+            content = JSONRenderer().render(serializer.data)
+            cache.set(cache_key, content, timeout=timeout)
+        return self.set_validators(HttpResponse(content, content_type='application/json'), etag, last_modified)
+
+    @staticmethod
+    def set_validators(response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Clients may keep the response but have to revalidate it on every use
+        response['Cache-Control'] = 'no-cache'
+        return response
 
     @action(detail=False, methods=['post'], url_path='test-email')
     def test_email(self, request, *args, **kwargs):
@@ -97,4 +136,5 @@ class GeneralSettingsViewSets(InitialModelViewSet):
     @action(detail=False, methods=['post'], url_path='clean-cache')
     def clean_cache(self, request):
         cache.clear()
+        settings_store.clear()
         return Response("Cache cleared")
@@ -0,0 +1,140 @@
+import threading
+import time
+from smtplib import SMTPServerDisconnected
+
+from django.conf import settings
+from django.core.mail import get_connection
+from loguru import logger
+
+
+class EmailDeliveryPool:
+    """
+    Worker-local email delivery layer reusing backend connections across messages.
+    Every thread sends over its own connection, so concurrent sends never wait on each other;
+    the lock only guards opening, closing and the stats.
+    """
+
+    def __init__(self, max_idle=None):
+        self.max_idle = max_idle or settings.EMAIL_CONNECTION_MAX_IDLE
+        self._local = threading.local()
+        self._connections = set()
+        self._lock = threading.Lock()
+        self.stats = {
+            'connections_opened': 0,
+            'connection_reuses': 0,
+            'messages_sent': 0,
+            'messages_failed': 0,
+            'total_latency': 0.0,
+            'max_latency': 0.0,
+        }
+
+    @property
+    def connection(self):
+        """
+        The pooled connection of the current thread.
+        """
+        return getattr(self._local, 'connection', None)
+
+    def _get_connection(self):
+        if self.connection is not None and time.monotonic() - self._local.last_used > self.max_idle:
+            # The server most likely dropped an idle connection already
+            self._close_connection()
+
+        if self.connection is not None:
+            with self._lock:
+                self.stats['connection_reuses'] += 1
+            return self.connection
+
+        connection = get_connection()
+        connection.open()
+        with self._lock:
+            self._connections.add(connection)
+            self.stats['connections_opened'] += 1
+        self._local.connection = connection
+        return connection
+
+    def _close_connection(self, connection=None):
+        connection = connection or self.connection
+        if connection is None:
+            return
+        if connection is self.connection:
+            self._local.connection = None
+        with self._lock:
+            self._connections.discard(connection)
+        try:
+            connection.close()
+        except Exception as e:
+            logger.warning(f"Error closing email connection: {e}")
+
+    def send(self, message):
+        """
+        Send a single message right away through the thread's pooled connection.
+        Errors are raised to the caller.
+        """
+        started = time.perf_counter()
+        try:
+            try:
+                sent = self._get_connection().send_messages([message])
+            except SMTPServerDisconnected:
+                # Reconnect once when the pooled connection was closed by the server
+                self._close_connection()
+                sent = self._get_connection().send_messages([message])
+        except Exception:
+            with self._lock:
+                self.stats['messages_failed'] += 1
+            self._close_connection()
+            raise
+        finally:
+            self._local.last_used = time.monotonic()
+
+        latency = time.perf_counter() - started
+        with self._lock:
+            self.stats['messages_sent'] += sent or 0
+            self.stats['messages_failed'] += 1 - (sent or 0)
+            self.stats['total_latency'] += latency
+            self.stats['max_latency'] = max(self.stats['max_latency'], latency)
+        return sent
+
+    def close(self):
+        """
+        Close the pooled connections of all threads.
+        """
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            self._close_connection(connection)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        delivered = stats['messages_sent'] + stats['messages_failed']
+        return {
+            **stats,
+            'open_connections': len(self._connections),
+            'average_latency': stats['total_latency'] / delivered if delivered else 0.0,
+        }
+
+
+_email_pool = None
+_email_pool_lock = threading.Lock()
+
+
+def get_email_pool():
+    """
+    Return the email delivery pool of the current worker process.
+    """
+    global _email_pool
+    if _email_pool is None:
+        with _email_pool_lock:
+            if _email_pool is None:
+                _email_pool = EmailDeliveryPool()
+    return _email_pool
+
+
+def close_email_pool():
+    """
+    Close the pooled connections of the current worker process.
+    """
+    if _email_pool is not None:
+        _email_pool.close()
+        logger.info(f"Email delivery stats: {_email_pool.get_stats()}")
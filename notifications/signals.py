@@ -0,0 +1,14 @@
+import atexit
+
+from celery.signals import worker_process_shutdown
+
+from notifications.services.email_pool import close_email_pool
+
+
+@worker_process_shutdown.connect
+def close_email_pool_on_worker_shutdown(**kwargs):
+    close_email_pool()
+
+
+# Web workers (and celery solo pools) have no worker_process_shutdown signal
+atexit.register(close_email_pool)
@@ -1,3 +1,109 @@
-from django.test import TestCase
+import threading
+import time
+from smtplib import SMTPServerDisconnected
+from unittest import mock
+
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase
+
+from notifications.services.email_pool import EmailDeliveryPool
+
 
 # Create your tests here.
+@mock.patch('notifications.services.email_pool.get_connection')
+class EmailDeliveryPoolTestCase(SimpleTestCase):
+    def make_pool(self, **kwargs):
+        pool = EmailDeliveryPool(**{'max_idle': 60, **kwargs})
+        self.addCleanup(pool.close)
+        return pool
+
+    @staticmethod
+    def make_message(index=0):
+        return EmailMessage('Reminder', 'Your booking starts soon', 'noreply@example.com',
+                            [f'customer{index}@example.com'])
+
+    def test_connection_is_reused(self, get_connection):
+        """
+        Test consecutive messages go through one open connection.
+        """
+        get_connection.return_value.send_messages.return_value = 1
+        pool = self.make_pool()
+        pool.send(self.make_message())
+        pool.send(self.make_message())
+
+        get_connection.assert_called_once_with()
+        self.assertEqual(get_connection.return_value.send_messages.call_count, 2)
+        stats = pool.get_stats()
+        self.assertEqual((stats['connections_opened'], stats['connection_reuses'], stats['messages_sent']), (1, 1, 2))
+
+    def test_reconnect_on_disconnect(self, get_connection):
+        """
+        Test a connection dropped by the server is reopened once and the message sent again.
+        """
+        dropped, fresh = mock.Mock(), mock.Mock()
+        dropped.send_messages.side_effect = SMTPServerDisconnected
+        fresh.send_messages.return_value = 1
+        get_connection.side_effect = [dropped, fresh]
+
+        pool = self.make_pool()
+        self.assertEqual(pool.send(self.make_message()), 1)
+        dropped.close.assert_called_once_with()
+        fresh.send_messages.assert_called_once()
+        self.assertEqual(pool.get_stats()['connections_opened'], 2)
+
+    def test_send_raises_errors(self, get_connection):
+        """
+        Test send raises delivery errors to the caller and drops the connection.
+        """
+        get_connection.return_value.send_messages.side_effect = RuntimeError('SES throttled')
+        pool = self.make_pool()
+        with self.assertRaisesMessage(RuntimeError, 'SES throttled'):
+            pool.send(self.make_message())
+        get_connection.return_value.close.assert_called_once_with()
+        self.assertIsNone(pool.connection)
+        self.assertEqual(pool.get_stats()['messages_failed'], 1)
+
+    @mock.patch('notifications.services.email_pool.time.monotonic')
+    def test_idle_connection_is_dropped(self, monotonic, get_connection):
+        """
+        Test a connection idle for longer than max_idle is closed and replaced.
+        """
+        idle, fresh = mock.Mock(), mock.Mock()
+        idle.send_messages.return_value = fresh.send_messages.return_value = 1
+        get_connection.side_effect = [idle, fresh]
+        monotonic.return_value = 1000
+        pool = self.make_pool(max_idle=60)
+        pool.send(self.make_message())
+
+        monotonic.return_value = 1061
+        pool.send(self.make_message())
+        idle.close.assert_called_once_with()
+        fresh.send_messages.assert_called_once()
+        self.assertEqual(pool.get_stats()['connections_opened'], 2)
+
+    def test_threads_send_concurrently(self, get_connection):
+        """
+        Test a slow send in one thread does not hold up another thread, each using its own connection.
+        """
+        release = threading.Event()
+        slow, fast = mock.Mock(), mock.Mock()
+        slow.send_messages.side_effect = lambda messages: release.wait(5) and 1
+        fast.send_messages.return_value = 1
+        get_connection.side_effect = [slow, fast]
+
+        pool = self.make_pool()
+        thread = threading.Thread(target=pool.send, args=[self.make_message(0)])
+        thread.start()
+        while not slow.send_messages.called:
+            time.sleep(0.01)
+        # Sent while the other thread is still waiting on its server
+        self.assertEqual(pool.send(self.make_message(1)), 1)
+        release.set()
+        thread.join()
+
+        stats = pool.get_stats()
+        self.assertEqual((stats['connections_opened'], stats['messages_sent'], stats['open_connections']), (2, 2, 2))
+        pool.close()
+        slow.close.assert_called_once_with()
+        fast.close.assert_called_once_with()
+        self.assertEqual(pool.get_stats()['open_connections'], 0)
@@ -5,7 +5,8 @@ from processes.models import ScheduledJob, ActivityLogs
 class ScheduledJobFilter(filters.FilterSet):
     min_date = filters.DateTimeFilter(field_name="run_time", lookup_expr='gte')
     max_date = filters.DateFilter(method="run_time_max")
-    event_type = filters.CharFilter(field_name="process__event_type", lookup_expr='icontains')
+    # The UI sends an event type option value, so an exact (indexed) lookup is enough
+    event_type = filters.CharFilter(field_name="process__event_type")
 
 
     class Meta:
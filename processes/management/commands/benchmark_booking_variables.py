@@ -0,0 +1,105 @@
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytz
+from django.core.management.base import BaseCommand
+
+from general_settings.services.general_settings_service import GeneralSettingsService
+from general_settings.services.model_services import get_strf_date_format
+from processes.services.process_actions_service import DynamicTemplateEngine, ProcessActionService
+
+TEMPLATE = 'Your booking on {{start_date}} at {{start_time}} ends on {{end_date}} at {{end_time}}.'
+
+
+class BenchmarkSettings(GeneralSettingsService):
+    """
+    GeneralSettingsService over fixed booking settings, without database or cache.
+    """
+
+    def __init__(self, booking_settings):
+        self.general_settings = None
+        self._derived = {}
+        self.customer_settings = None
+        self.setup_pages = {}
+        self.booking_settings = booking_settings
+        self.booking_restriction = None
+        self.timeslot_availability_logic = None
+        self.business_information = None
+
+
+def legacy_booking_variables(general_setting, booking):
+    """
+    The previous get_model_data date/time variables: time zone and formats resolved for every action.
+    """
+    tz = pytz.timezone(general_setting.get_booking_setting('time_zone'))
+    time_system = general_setting.get_booking_setting('time_system')
+    date_format = general_setting.get_booking_setting('date_format')
+    date_format = get_strf_date_format(date_format) if date_format else date_format
+
+    def format_date(value):
+        value = value.astimezone(tz).date()
+        return value.strftime(date_format) if date_format else value
+
+    def format_time(value):
+        value = value.astimezone(tz)
+        return value.strftime("%I:%M%p").lower() if time_system == "12" else value.strftime("%H:%M")
+
+    return {
+        'start_date': format_date(booking.start_datetime),
+        'end_date': format_date(booking.end_datetime),
+        'start_time': format_time(booking.start_datetime),
+        'end_time': format_time(booking.end_datetime),
+    }
+
+
+def booking_variables(general_setting, booking):
+    """
+    The same variables through the formatter built once per settings version.
+    """
+    formatter = general_setting.get_datetime_formatter()
+    return {
+        'start_date': formatter.format_date(booking.start_datetime),
+        'end_date': formatter.format_date(booking.end_datetime),
+        'start_time': formatter.format_time(booking.start_datetime),
+        'end_time': formatter.format_time(booking.end_datetime),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark rendering the booking date/time variables of process action templates.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000, help='Renders per measurement.')
+        parser.add_argument('--time-zone', default='Europe/London', help='Booking settings time zone.')
+        parser.add_argument('--time-system', default='12', choices=['12', '24'], help='Booking settings clock.')
+
+    def handle(self, *args, **options):
+        general_setting = BenchmarkSettings({
+            'time_zone': options['time_zone'], 'date_format': 'dd/mm/yyyy', 'time_system': options['time_system'],
+        })
+        start = pytz.utc.localize(datetime(2024, 7, 1, 13, 5))
+        booking = SimpleNamespace(start_datetime=start, end_datetime=start + timedelta(hours=1, minutes=30))
+        action_service = ProcessActionService(general_settings=general_setting)
+
+        renders = [
+            ('legacy (formats resolved per action)',
+             lambda: DynamicTemplateEngine(legacy_booking_variables(general_setting, booking)).render(TEMPLATE)),
+            ('formatter (resolved per settings version)',
+             lambda: DynamicTemplateEngine(booking_variables(general_setting, booking)).render(TEMPLATE)),
+            ('full get_model_data + render',
+             lambda: DynamicTemplateEngine(action_service.get_model_data(booking=booking)).render(TEMPLATE)),
+        ]
+        expected = renders[0][1]()
+        for name, render in renders:
+            assert render() == expected, name
+
+        iterations = options['iterations']
+        self.stdout.write(f"Template: {TEMPLATE}")
+        legacy = None
+        for name, render in renders:
+            elapsed = timeit.timeit(render, number=iterations)
+            legacy = legacy or elapsed
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: {elapsed / iterations * 1e6:.1f} µs/render ({legacy / elapsed:.1f}x legacy)"
+            ))
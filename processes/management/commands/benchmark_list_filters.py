@@ -0,0 +1,120 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+from processes.filters import ScheduledJobFilter, ActivityLogsFilter
+from processes.models import Process, ScheduledJob, ActivityLogs
+from processes.viewsets import ScheduledJobViewSets, ActivityLogsViewSets
+from user_management.models import Account
+
+EVENT_TYPES = ['booking_created', 'booking_updated', 'customer_created', 'waiting_list_subscribe']
+
+
+class BenchmarkRollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Report EXPLAIN plans and latencies of the scheduled job and activity log list filters on seeded data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100000, help='Number of scheduled jobs to seed.')
+        parser.add_argument('--logs', type=int, default=100000, help='Number of activity logs to seed.')
+        parser.add_argument('--users', type=int, default=2000, help='Number of accounts to seed.')
+        parser.add_argument('--page-size', type=int, default=10, help='Page size of the measured queries.')
+        parser.add_argument('--repeat', type=int, default=20, help='Number of timed runs per query.')
+        parser.add_argument('--no-plans', action='store_true', help='Only report latencies.')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options['jobs'], options['logs'], options['users'])
+                for name, filterset_class, queryset, params in self.get_scenarios():
+                    queryset = filterset_class(params, queryset=queryset).qs[:options['page_size']]
+                    self.report(name, queryset, options)
+                raise BenchmarkRollback()
+        except BenchmarkRollback:
+            pass
+
+    @staticmethod
+    def get_scenarios():
+        today = now().date()
+        jobs = ScheduledJobViewSets.queryset.all()
+        logs = ActivityLogsViewSets.queryset.all()
+        return [
+            ('jobs: no filter', ScheduledJobFilter, jobs, {}),
+            ('jobs: event_type', ScheduledJobFilter, jobs, {'event_type': 'customer_created'}),
+            ('jobs: status', ScheduledJobFilter, jobs, {'status': 'cancelled'}),
+            ('jobs: object_id', ScheduledJobFilter, jobs, {'object_id': 42}),
+            ('jobs: run_time range', ScheduledJobFilter, jobs, {
+                'min_date': (now() - timedelta(days=3)).isoformat(), 'max_date': today.isoformat(),
+            }),
+            ('logs: no filter', ActivityLogsFilter, logs, {}),
+            ('logs: email', ActivityLogsFilter, logs, {'email': 'user42@'}),
+            ('logs: action_type', ActivityLogsFilter, logs, {'action_type': 'process_job_cancelled'}),
+            ('logs: created_at range', ActivityLogsFilter, logs, {
+                'min_date': (now() - timedelta(days=30)).isoformat(), 'max_date': (today - timedelta(days=20)).isoformat(),
+            }),
+        ]
+
+    def seed(self, total_jobs, total_logs, total_users):
+        started = time.perf_counter()
+        current_time = now()
+        processes = [
+            Process.objects.create(name=f'Benchmark {event_type}', event_type=event_type)
+            for event_type in EVENT_TYPES
+        ]
+        users = Account.objects.bulk_create(
+            [Account(email=f'user{number}@benchmark.example.com', password='!') for number in range(total_users)],
+            batch_size=1000,
+        )
+        jobs = ScheduledJob.objects.bulk_create([
+            ScheduledJob(
+                process=random.choice(processes),
+                object_id=random.randint(1, total_jobs // 5 or 1),
+                status=random.choices(['completed', 'scheduled', 'cancelled'], weights=[80, 15, 5])[0],
+                run_time=current_time + timedelta(minutes=random.randint(-525600, 10080)),
+            )
+            for _ in range(total_jobs)
+        ], batch_size=5000)
+        ActivityLogs.objects.bulk_create([
+            ActivityLogs(
+                action_type=random.choice(ActivityLogs.EVENT_TYPES)[0],
+                action_track=random.choice(jobs) if jobs else None,
+                user=random.choice(users) if users else None,
+            )
+            for _ in range(total_logs)
+        ], batch_size=5000)
+
+        with connection.cursor() as cursor:
+            # auto_now_add gives every seeded row the same created_at; spread them over a year
+            for model in [ScheduledJob, ActivityLogs]:
+                cursor.execute(
+                    f"UPDATE {model._meta.db_table} SET created_at = now() - (id % 365) * interval '1 day' "
+                    f"- (id % 86400) * interval '1 second'"
+                )
+            for model in [Process, Account, ScheduledJob, ActivityLogs]:
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+        self.stdout.write(f"Seeded {total_jobs} jobs, {total_logs} logs and {total_users} users "
+                          f"in {time.perf_counter() - started:.1f}s")
+
+    def report(self, name, queryset, options):
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{name}: median {statistics.median(timings):.2f}ms, p95 {p95:.2f}ms"
+        ))
+        if not options['no_plans']:
+            self.stdout.write(queryset.explain(analyze=True))
+            self.stdout.write('')
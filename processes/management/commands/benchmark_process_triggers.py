@@ -0,0 +1,79 @@
+import time
+from contextlib import nullcontext
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from processes.models import Process, ProcessAction
+from processes.services import process_service
+from processes.services.process_service import trigger_process, trigger_processes_bulk
+
+
+class BenchmarkRollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare the throughput of trigger_process and trigger_processes_bulk on throwaway data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=1000, help='Number of events to trigger.')
+        parser.add_argument('--processes', type=int, default=3, help='Number of matching processes.')
+        parser.add_argument('--actions', type=int, default=2, help='Number of actions per process.')
+        parser.add_argument('--with-broker', action='store_true',
+                            help='Publish Celery tasks to the broker instead of skipping publication.')
+
+    def handle(self, *args, **options):
+        results = {}
+        try:
+            with transaction.atomic():
+                self.setup_processes(options['processes'], options['actions'])
+                if options['with_broker']:
+                    publisher = nullcontext()
+                else:
+                    publisher = mock.patch.object(process_service, 'publish_scheduled_action_batches')
+                with publisher:
+                    results['trigger_process'] = self.run_single(options['events'])
+                    results['trigger_processes_bulk'] = self.run_bulk(options['events'])
+                raise BenchmarkRollback()
+        except BenchmarkRollback:
+            pass
+
+        for name, elapsed in results.items():
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: {options['events']} events in {elapsed:.3f}s "
+                f"({options['events'] / elapsed:.1f} events/s)"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Speedup: {results['trigger_process'] / results['trigger_processes_bulk']:.1f}x"
+        ))
+
+    @staticmethod
+    def setup_processes(total_processes, total_actions):
+        for number in range(total_processes):
+            process = Process.objects.create(name=f'Benchmark process {number}', event_type='waiting_list_subscribe')
+            for _ in range(total_actions):
+                ProcessAction.objects.create(process=process, action_type='send_email', subject='Benchmark')
+
+    @staticmethod
+    def make_events(total_events, offset):
+        return [
+            {'event_type': 'waiting_list_subscribe', 'booking': SimpleNamespace(id=offset + number)}
+            for number in range(total_events)
+        ]
+
+    def run_single(self, total_events):
+        events = self.make_events(total_events, offset=0)
+        started = time.perf_counter()
+        for event in events:
+            trigger_process(**event)
+        return time.perf_counter() - started
+
+    def run_bulk(self, total_events):
+        # Use fresh object ids so both paths create the same number of rows
+        events = self.make_events(total_events, offset=total_events)
+        started = time.perf_counter()
+        trigger_processes_bulk(events)
+        return time.perf_counter() - started
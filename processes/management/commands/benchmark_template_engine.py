@@ -0,0 +1,53 @@
+import re
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from processes.services.process_actions_service import DynamicTemplateEngine, compile_template
+
+
+def legacy_render(data, template):
+    """
+    The previous DynamicTemplateEngine.render: re.findall plus one str.replace per placeholder.
+    """
+    pattern = r"\{\{(.*?)\}\}"
+    matches = re.findall(pattern, template)
+
+    for match in matches:
+        key = match.strip()
+        value = data.get(key, "")
+        template = template.replace(f"{{{{{key}}}}}", str(value))
+
+    return template
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark DynamicTemplateEngine.render on a large HTML email body.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tags', type=int, default=60, help='Number of placeholders in the template.')
+        parser.add_argument('--paragraph-size', type=int, default=400,
+                            help='Characters of HTML between two placeholders.')
+        parser.add_argument('--iterations', type=int, default=2000, help='Renders per measurement.')
+
+    def handle(self, *args, **options):
+        data = {f'variable_{number}': f'value {number}' for number in range(options['tags'])}
+        filler = '<p style="margin: 0 0 10px;">' + 'x' * options['paragraph_size'] + '</p>'
+        template = '<html><body>' + ''.join(
+            f'{filler}<strong>{{{{variable_{number}}}}}</strong>' for number in range(options['tags'])
+        ) + '</body></html>'
+
+        engine = DynamicTemplateEngine(data)
+        assert engine.render(template) == legacy_render(data, template)
+
+        iterations = options['iterations']
+        compile_template.cache_clear()
+        cold = timeit.timeit(lambda: (compile_template.cache_clear(), engine.render(template)), number=iterations)
+        warm = timeit.timeit(lambda: engine.render(template), number=iterations)
+        legacy = timeit.timeit(lambda: legacy_render(data, template), number=iterations)
+
+        self.stdout.write(f"Template: {len(template)} characters, {options['tags']} placeholders")
+        for name, elapsed in [('legacy', legacy), ('compiled (cold cache)', cold), ('compiled (cached)', warm)]:
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: {elapsed / iterations * 1e6:.1f} µs/render ({legacy / elapsed:.1f}x legacy)"
+            ))
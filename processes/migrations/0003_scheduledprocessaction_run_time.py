@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-18 06:54
+
+from django.db import migrations, models
+
+
+def backfill_run_time(apps, schema_editor):
+    ScheduledJob = apps.get_model('processes', 'ScheduledJob')
+    ScheduledProcessAction = apps.get_model('processes', 'ScheduledProcessAction')
+    ScheduledProcessAction.objects.update(
+        run_time=models.Subquery(
+            ScheduledJob.objects.filter(id=models.OuterRef('scheduled_job_id')).values('run_time')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledprocessaction',
+            name='context',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='scheduledprocessaction',
+            name='run_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_run_time, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='scheduledprocessaction',
+            index=models.Index(condition=models.Q(('status', 'pending'), ('task_id__isnull', True)), fields=['run_time'], name='sched_action_due_idx'),
+        ),
+    ]
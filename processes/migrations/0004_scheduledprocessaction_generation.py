@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 06:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0003_scheduledprocessaction_run_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledprocessaction',
+            name='generation',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2 on 2026-10-18 07:01
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the (large) tables for writes
+    atomic = False
+
+    dependencies = [
+        ('processes', '0004_scheduledprocessaction_generation'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='activitylogs',
+            index=models.Index(fields=['-created_at', '-id'], name='activity_log_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='scheduledjob',
+            index=models.Index(fields=['-created_at', '-id'], name='sched_job_created_idx'),
+        ),
+    ]
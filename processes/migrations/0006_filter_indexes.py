@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-18 07:02
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the (large) tables for writes
+    atomic = False
+
+    dependencies = [
+        ('processes', '0005_list_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='process',
+            name='event_type',
+            field=models.CharField(choices=[], db_index=True, max_length=50),
+        ),
+        AddIndexConcurrently(
+            model_name='activitylogs',
+            index=models.Index(fields=['action_type', '-created_at', '-id'], name='activity_log_action_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='scheduledjob',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='sched_job_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='scheduledjob',
+            index=models.Index(fields=['object_id', 'process'], name='sched_job_object_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='scheduledjob',
+            index=models.Index(fields=['run_time'], name='sched_job_run_time_idx'),
+        ),
+    ]
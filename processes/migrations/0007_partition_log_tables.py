@@ -0,0 +1,187 @@
+"""
+Convert the append-only log tables to monthly range partitions on created_at.
+
+Postgres requires the partition key in the primary key, so the tables get a composite
+(id, created_at) primary key while the Django models keep declaring `id` as their primary key:
+- ids still come from a single sequence, but the database only enforces (id, created_at) uniqueness;
+- .get(pk=...) and other lookups by id alone cannot prune partitions and probe the (id, created_at)
+  index of every partition, filter on created_at as well where possible;
+- no foreign key can point at these tables, since that needs a unique constraint on id alone.
+"""
+import datetime
+
+from django.db import migrations, transaction
+
+# Append-only tables converted to monthly range partitions on created_at
+PARTITIONED_TABLES = ['processes_activitylogs', 'processes_scheduledactiontrack']
+PARTITIONS_AHEAD = 3
+BACKFILL_BATCH_SIZE = 10000
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def get_indexes_and_foreign_keys(cursor, table):
+    """
+    Return the CREATE INDEX statements (primary key excluded) and foreign key
+    constraints of a table so they can be created again on the new table.
+    """
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p')",
+        [table, table],
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [table],
+    )
+    foreign_keys = cursor.fetchall()
+    return indexes, foreign_keys
+
+
+def restore_indexes_and_foreign_keys(cursor, table, indexes, foreign_keys):
+    for indexdef in indexes:
+        cursor.execute(indexdef)
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+
+
+def use_owned_sequence(cursor, table):
+    cursor.execute(f'CREATE SEQUENCE "{table}_id_seq" OWNED BY "{table}".id')
+    cursor.execute(f"SELECT setval('\"{table}_id_seq\"', COALESCE((SELECT max(id) FROM \"{table}\"), 0) + 1, false)")
+    cursor.execute(f'ALTER TABLE "{table}" ALTER COLUMN id SET DEFAULT nextval(\'"{table}_id_seq"\')')
+
+
+def release_old_table_names(cursor, old_table, table):
+    """
+    Free the sequence, primary key, index and foreign key names still held by the renamed table
+    so the new table can reuse them. Only its primary key is kept, for the id range copy.
+    """
+    cursor.execute(f'ALTER TABLE "{old_table}" ALTER COLUMN id DROP IDENTITY IF EXISTS')
+    cursor.execute(f'ALTER TABLE "{old_table}" ALTER COLUMN id DROP DEFAULT')
+    cursor.execute(f'DROP SEQUENCE IF EXISTS "{table}_id_seq"')
+    cursor.execute(
+        "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'", [f'"{old_table}"']
+    )
+    for (name,) in cursor.fetchall():
+        cursor.execute(f'ALTER TABLE "{old_table}" DROP CONSTRAINT "{name}"')
+    cursor.execute(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p')",
+        [old_table, f'"{old_table}"'],
+    )
+    for (name,) in cursor.fetchall():
+        cursor.execute(f'DROP INDEX "{name}"')
+    cursor.execute(
+        "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'", [f'"{old_table}"']
+    )
+    for (name,) in cursor.fetchall():
+        cursor.execute(f'ALTER TABLE "{old_table}" RENAME CONSTRAINT "{name}" TO "{old_table}_pkey"')
+
+
+def create_partitioned_table(cursor, table):
+    """
+    Swap the table for an empty partitioned copy with its partitions, primary key, sequence,
+    indexes and foreign keys, leaving the rows in "<table>_old" for the backfill.
+    """
+    indexes, foreign_keys = get_indexes_and_foreign_keys(cursor, table)
+    cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{table}_old"')
+    release_old_table_names(cursor, f'{table}_old', table)
+    # Identity columns are not supported on partitioned tables before Postgres 17, use a sequence instead
+    cursor.execute(f'CREATE TABLE "{table}" (LIKE "{table}_old") PARTITION BY RANGE (created_at)')
+    cursor.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+
+    cursor.execute(f'SELECT min(created_at) FROM "{table}_old"')
+    oldest = cursor.fetchone()[0]
+    current_month = datetime.datetime.now(datetime.timezone.utc).date().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else current_month
+    while month <= add_months(current_month, PARTITIONS_AHEAD):
+        end = add_months(month, 1)
+        cursor.execute(
+            f'CREATE TABLE "{table}_p{month:%Y%m}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{end.isoformat()} 00:00:00+00')"
+        )
+        month = end
+
+    # The partition key has to be part of the primary key
+    cursor.execute(f'ALTER TABLE "{table}" ADD PRIMARY KEY (id, created_at)')
+    cursor.execute(f'CREATE SEQUENCE "{table}_id_seq" OWNED BY "{table}".id')
+    # New rows are numbered after the old ones, which are copied over with their ids
+    cursor.execute(f"SELECT setval('\"{table}_id_seq\"', COALESCE((SELECT max(id) FROM \"{table}_old\"), 0) + 1, false)")
+    cursor.execute(f'ALTER TABLE "{table}" ALTER COLUMN id SET DEFAULT nextval(\'"{table}_id_seq"\')')
+    # Created while the table is empty, so the backfill never waits on a full-table build or validation
+    restore_indexes_and_foreign_keys(cursor, table, indexes, foreign_keys)
+
+
+def backfill_partitioned_table(connection, table):
+    """
+    Copy the rows of "<table>_old" by id range, BACKFILL_BATCH_SIZE rows per transaction, then drop it.
+    A failed run resumes after the last copied id.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT max(id) FROM "{table}_old"')
+        last_old_id = cursor.fetchone()[0] or 0
+        cursor.execute(f'SELECT COALESCE(max(id), 0) FROM "{table}" WHERE id <= %s', [last_old_id])
+        copied_id = cursor.fetchone()[0]
+
+    while copied_id < last_old_id:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO "{table}" SELECT * FROM "{table}_old" WHERE id > %s AND id <= %s',
+                [copied_id, copied_id + BACKFILL_BATCH_SIZE],
+            )
+        copied_id += BACKFILL_BATCH_SIZE
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE "{table}_old"')
+
+
+def partition_tables(apps, schema_editor):
+    """
+    Runs outside a migration transaction: the table swap is one short transaction per table and
+    the existing rows are copied in batches afterwards, so no lock is held for the whole copy.
+    Rows written meanwhile land in the new table; old rows show up as the backfill progresses.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    for table in PARTITIONED_TABLES:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [f'"{table}_old"'])
+            resuming = cursor.fetchone()[0]
+            if not resuming:
+                create_partitioned_table(cursor, table)
+        backfill_partitioned_table(connection, table)
+
+
+def unpartition_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    connection = schema_editor.connection
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            indexes, foreign_keys = get_indexes_and_foreign_keys(cursor, table)
+            cursor.execute(f'CREATE TABLE "{table}_new" (LIKE "{table}")')
+            cursor.execute(f'INSERT INTO "{table}_new" SELECT * FROM "{table}"')
+            cursor.execute(f'DROP TABLE "{table}"')
+            cursor.execute(f'ALTER TABLE "{table}_new" RENAME TO "{table}"')
+            cursor.execute(f'ALTER TABLE "{table}" ADD PRIMARY KEY (id)')
+            use_owned_sequence(cursor, table)
+            restore_indexes_and_foreign_keys(cursor, table, indexes, foreign_keys)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('processes', '0006_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tables, unpartition_tables),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2 on 2026-10-18 07:10
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+import django.db.models.deletion
+
+
+def backfill_statistics(apps, schema_editor):
+    ScheduledActionTrack = apps.get_model('processes', 'ScheduledActionTrack')
+    ActionRunStatistic = apps.get_model('processes', 'ActionRunStatistic')
+
+    rows = ScheduledActionTrack.objects.filter(action__isnull=False).annotate(day=TruncDate('created_at')).values(
+        'action__process_id', 'action__action_type', 'day'
+    ).annotate(
+        success_count=Count('id', filter=Q(status='success')),
+        failure_count=Count('id', filter=Q(status='failed')),
+    ).order_by()
+    ActionRunStatistic.objects.bulk_create([
+        ActionRunStatistic(
+            process_id=row['action__process_id'],
+            action_type=row['action__action_type'],
+            day=row['day'],
+            success_count=row['success_count'],
+            failure_count=row['failure_count'],
+        )
+        for row in rows.iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0007_partition_log_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActionRunStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action_type', models.CharField(choices=[('tx_send_whatsapp', 'Send WhatsApp Message'), ('tx_send_push_notification', 'Send Push Notification'), ('send_email', 'Send Email'), ('send_sms', 'Send SMS'), ('trigger_webhook', 'HTTP Request'), ('add_to_mailchimp_list', 'Add contact to Mailchimp')], max_length=50)),
+                ('day', models.DateField()),
+                ('success_count', models.PositiveIntegerField(default=0)),
+                ('failure_count', models.PositiveIntegerField(default=0)),
+                ('process', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='processes.process')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='actionrunstatistic',
+            index=models.Index(fields=['day'], name='action_run_statistic_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='actionrunstatistic',
+            constraint=models.UniqueConstraint(fields=('process', 'action_type', 'day'), name='action_run_statistic_unique'),
+        ),
+        migrations.RunPython(backfill_statistics, migrations.RunPython.noop),
+    ]
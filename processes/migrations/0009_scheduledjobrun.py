@@ -0,0 +1,88 @@
+# Generated by Django 4.2 on 2026-10-18 07:11
+
+import datetime
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+RUN_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+BATCH_SIZE = 1000
+
+
+def parse_run_time(entry, job):
+    try:
+        run_time = datetime.datetime.strptime(entry["run_datetime_utc"], RUN_DATETIME_FORMAT)
+        return run_time.replace(tzinfo=datetime.timezone.utc)
+    except (KeyError, TypeError, ValueError):
+        return job.run_time
+
+
+def copy_run_logs(apps, schema_editor):
+    """
+    Turn the run_logs JSON of every job into ScheduledJobRun rows (a dict holds one run, a list several).
+    """
+    ScheduledJob = apps.get_model('processes', 'ScheduledJob')
+    ScheduledJobRun = apps.get_model('processes', 'ScheduledJobRun')
+
+    runs = []
+    jobs = ScheduledJob.objects.exclude(run_logs__isnull=True).only('id', 'run_time', 'run_logs')
+    for job in jobs.iterator(chunk_size=BATCH_SIZE):
+        entries = job.run_logs if isinstance(job.run_logs, list) else [job.run_logs]
+        for entry in entries:
+            if not isinstance(entry, dict) or not entry:
+                continue
+            runs.append(ScheduledJobRun(
+                scheduled_job_id=job.id, run_id=str(entry.get("id", ""))[:8], run_time=parse_run_time(entry, job)
+            ))
+        if len(runs) >= BATCH_SIZE:
+            ScheduledJobRun.objects.bulk_create(runs)
+            runs = []
+    ScheduledJobRun.objects.bulk_create(runs)
+
+
+def restore_run_logs(apps, schema_editor):
+    """
+    Put the latest run of every job back into run_logs, as it was stored before.
+    """
+    ScheduledJob = apps.get_model('processes', 'ScheduledJob')
+    ScheduledJobRun = apps.get_model('processes', 'ScheduledJobRun')
+
+    jobs = []
+    runs = ScheduledJobRun.objects.order_by('scheduled_job_id', '-id').distinct('scheduled_job_id')
+    for run in runs.iterator(chunk_size=BATCH_SIZE):
+        jobs.append(ScheduledJob(id=run.scheduled_job_id, run_logs={
+            "id": run.run_id, "run_datetime_utc": run.run_time.strftime(RUN_DATETIME_FORMAT)
+        }))
+        if len(jobs) >= BATCH_SIZE:
+            ScheduledJob.objects.bulk_update(jobs, ['run_logs'])
+            jobs = []
+    ScheduledJob.objects.bulk_update(jobs, ['run_logs'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0008_actionrunstatistic'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledJobRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.CharField(max_length=8)),
+                ('run_time', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('scheduled_job', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='processes.scheduledjob')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='scheduledjobrun',
+            index=models.Index(fields=['scheduled_job', '-id'], name='sched_job_run_latest_idx'),
+        ),
+        migrations.RunPython(copy_run_logs, restore_run_logs),
+        migrations.RemoveField(
+            model_name='scheduledjob',
+            name='run_logs',
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-18 07:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0009_scheduledjobrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledprocessaction',
+            name='dispatched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='scheduledprocessaction',
+            index=models.Index(condition=models.Q(('status', 'pending'), ('task_id__isnull', False)), fields=['dispatched_at'], name='sched_action_claimed_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2 on 2026-10-18 07:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0010_scheduledprocessaction_dispatched_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='scheduledprocessaction',
+            name='sched_action_claimed_idx',
+        ),
+        migrations.AddField(
+            model_name='scheduledprocessaction',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='scheduledprocessaction',
+            index=models.Index(condition=models.Q(('started_at__isnull', True), ('status', 'pending'), ('task_id__isnull', False)), fields=['dispatched_at'], name='sched_action_unstarted_idx'),
+        ),
+    ]
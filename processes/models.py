@@ -1,3 +1,5 @@
+import uuid
+
 from django.contrib.auth import get_user_model
 from django.db import models
 
@@ -15,7 +17,7 @@ class Process(BaseModel):
 
     name = models.CharField(max_length=255)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='active')
-    event_type = models.CharField(max_length=50, choices=EVENT_TYPE_CHOICES)
+    event_type = models.CharField(max_length=50, choices=EVENT_TYPE_CHOICES, db_index=True)
     is_conditional = models.BooleanField(default=False)
     condition = models.JSONField(null=True, blank=True)
     has_time_offset = models.BooleanField(default=False)
@@ -65,12 +67,58 @@ class ScheduledJob(BaseModel):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='scheduled')
     run_time = models.DateTimeField()
     task_id = models.CharField(max_length=255, null=True, blank=True)
-    run_logs = models.JSONField(default=list, null=True, blank=True)  # Track each execution of the job
+
+    class Meta:
+        indexes = [
+            # Matches the list ordering and keyset pagination cursor
+            models.Index(fields=['-created_at', '-id'], name='sched_job_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='sched_job_status_idx'),
+            # Also serves the (process, object_id) lookups when scheduling jobs
+            models.Index(fields=['object_id', 'process'], name='sched_job_object_idx'),
+            models.Index(fields=['run_time'], name='sched_job_run_time_idx'),
+        ]
 
     def __str__(self):
         return self.task_id
 
 
+class ScheduledJobRun(models.Model):
+    """
+    Append-only execution history of a scheduled job (one narrow row per schedule or run).
+    """
+    scheduled_job = models.ForeignKey('ScheduledJob', on_delete=models.CASCADE, related_name='runs', db_index=False)
+    run_id = models.CharField(max_length=8)
+    run_time = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Serves both the per-job history and the latest run lookup
+            models.Index(fields=['scheduled_job', '-id'], name='sched_job_run_latest_idx'),
+        ]
+
+    @classmethod
+    def for_job(cls, job, run_time):
+        return cls(scheduled_job=job, run_id=str(uuid.uuid4())[:8], run_time=run_time)
+
+    def as_log(self):
+        """
+        The run in the shape of the former ScheduledJob.run_logs entries.
+        """
+        return {"id": self.run_id, "run_datetime_utc": self.run_time.strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def latest_run_annotations(job_ref='pk'):
+    """
+    Subquery annotations (latest_run_id, latest_run_time) with the latest run of the job referenced by `job_ref`.
+    """
+    latest_runs = ScheduledJobRun.objects.filter(scheduled_job=models.OuterRef(job_ref)).order_by('-id')
+    return {
+        'latest_run_id': models.Subquery(latest_runs.values('run_id')[:1]),
+        'latest_run_time': models.Subquery(latest_runs.values('run_time')[:1]),
+    }
+
+
 class ScheduledProcessAction(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -83,9 +131,24 @@ class ScheduledProcessAction(models.Model):
     process_action = models.ForeignKey('ProcessAction', on_delete=models.CASCADE)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     task_id = models.CharField(max_length=255, null=True, blank=True)  # Store the Celery task ID
+    run_time = models.DateTimeField(null=True, blank=True)  # When the dispatcher should enqueue the action
+    context = models.JSONField(null=True, blank=True)  # Event context passed to the task
+    generation = models.PositiveIntegerField(default=0)  # Bumped on reschedule; older tasks become no-ops
+    dispatched_at = models.DateTimeField(null=True, blank=True)  # When the task running the action was published
+    started_at = models.DateTimeField(null=True, blank=True)  # When that task claimed the action to run it
     last_run_time = models.DateTimeField(null=True, blank=True)
     error_message = models.TextField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Only actions still waiting for the dispatcher are indexed
+            models.Index(fields=['run_time'], name='sched_action_due_idx',
+                         condition=models.Q(status='pending', task_id__isnull=True)),
+            # Published actions whose task has not started yet, checked for lost tasks
+            models.Index(fields=['dispatched_at'], name='sched_action_unstarted_idx',
+                         condition=models.Q(status='pending', task_id__isnull=False, started_at__isnull=True)),
+        ]
+
 
 class ScheduledActionTrack(BaseModel):
     STATUS_CHOICES = [
@@ -98,6 +161,25 @@ class ScheduledActionTrack(BaseModel):
     schedule = models.ForeignKey('ScheduledJob', on_delete=models.CASCADE, null=True)
 
 
+class ActionRunStatistic(models.Model):
+    """
+    Daily success/failure counters per process and action type, incremented as action tracks are written.
+    """
+    process = models.ForeignKey('Process', on_delete=models.CASCADE)
+    action_type = models.CharField(max_length=50, choices=ProcessAction.ACTION_TYPE_CHOICES)
+    day = models.DateField()
+    success_count = models.PositiveIntegerField(default=0)
+    failure_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['process', 'action_type', 'day'], name='action_run_statistic_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='action_run_statistic_day_idx'),
+        ]
+
+
 class ActivityLogs(BaseModel):
     EVENT_TYPES = [
         ('sms_sent', 'SMS Sent'),
@@ -110,5 +192,12 @@ class ActivityLogs(BaseModel):
     action_track = models.ForeignKey(ScheduledJob, on_delete=models.SET_NULL, null=True)
     user = models.ForeignKey(get_user_model(), on_delete=models.SET_NULL, null=True)
 
+    class Meta:
+        indexes = [
+            # Matches the list ordering and keyset pagination cursor
+            models.Index(fields=['-created_at', '-id'], name='activity_log_created_idx'),
+            models.Index(fields=['action_type', '-created_at', '-id'], name='activity_log_action_idx'),
+        ]
+
     def __str__(self):
         return self.action_type
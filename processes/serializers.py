@@ -1,8 +1,11 @@
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
-from processes.models import Process, ProcessAction, ScheduledJob, ScheduledActionTrack, ActivityLogs
+from processes.models import Process, ProcessAction, ScheduledJob, ScheduledActionTrack, ActivityLogs, \
+    ScheduledJobRun
 
 Account = get_user_model()
 
@@ -82,11 +85,49 @@ class ScheduledActionTrackSerializer(serializers.ModelSerializer):
         exclude = ['created_at', 'action', 'schedule', 'id']
 
 
+@extend_schema_field(OpenApiTypes.OBJECT)
+class LatestRunLogField(serializers.Field):
+    """
+    Latest ScheduledJobRun of a job, read from the `latest_run_id`/`latest_run_time` annotations
+    (see latest_run_annotations) when present. `job_attr` points from the instance to its ScheduledJob.
+    A job that never ran gives an empty list, the default of the former run_logs field.
+    """
+
+    def __init__(self, job_attr=None, **kwargs):
+        self.job_attr = job_attr
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        if hasattr(instance, 'latest_run_id'):
+            if instance.latest_run_id is None:
+                return []
+            return ScheduledJobRun(run_id=instance.latest_run_id, run_time=instance.latest_run_time).as_log()
+
+        job = getattr(instance, self.job_attr) if self.job_attr else instance
+        latest_run = ScheduledJobRun.objects.filter(scheduled_job=job).order_by('-id').first()
+        return latest_run.as_log() if latest_run else []
+
+
+class ScheduledJobRunSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ScheduledJobRun
+        fields = ['id', 'run_id', 'run_time', 'created_at']
+
+
+class PaginatedScheduledJobRunResponseSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    next = serializers.CharField(allow_null=True)
+    previous = serializers.CharField(allow_null=True)
+    results = ScheduledJobRunSerializer(many=True)
+
+
 class ScheduledJobListSerializer(serializers.ModelSerializer):
     event = serializers.CharField(source='process.get_event_type_display')
     process_name = serializers.CharField(source='process.name')
     actions = JobActionsSerializer(source='process.processaction_set', many=True)
-    run_logs = serializers.JSONField()
+    run_logs = LatestRunLogField()
     run_action__logs = ScheduledActionTrackSerializer(many=True, source='scheduledactiontrack_set')
 
     class Meta:
@@ -119,6 +160,37 @@ class ScheduleJobHandleActionSerializer(serializers.Serializer):
         choices=[('cancel', 'Cancel'), ('run_now', 'Run Now'), ('run_again', 'Run Again')])
 
 
+class ScheduledJobBulkFilterSerializer(serializers.Serializer):
+    event_type = serializers.CharField(required=False)
+    process_id = serializers.IntegerField(required=False)
+    object_id = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=ScheduledJob.STATUS_CHOICES, required=False)
+    min_date = serializers.DateTimeField(required=False)
+    max_date = serializers.DateField(required=False)
+
+
+class ScheduledJobBulkActionSerializer(ScheduleJobHandleActionSerializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    filters = ScheduledJobBulkFilterSerializer(required=False)
+
+    def validate(self, attrs):
+        if not attrs.get('ids') and not attrs.get('filters'):
+            raise serializers.ValidationError({'non_field_errors': ['Provide job ids or at least one filter.']})
+        return attrs
+
+
+class ScheduledJobBulkActionProgressSerializer(serializers.Serializer):
+    operation_id = serializers.CharField()
+    action_type = serializers.CharField()
+    status = serializers.ChoiceField(choices=['pending', 'running', 'completed', 'failed'])
+    total = serializers.IntegerField(allow_null=True)
+    processed = serializers.IntegerField()
+    updated = serializers.IntegerField()
+    error = serializers.CharField(allow_null=True)
+    started_at = serializers.DateTimeField(allow_null=True)
+    finished_at = serializers.DateTimeField(allow_null=True)
+
+
 class MailchimpAudienceOptionList(serializers.Serializer):
     id = serializers.CharField(read_only=True)
     label = serializers.CharField(source='name', read_only=True)
@@ -134,7 +206,7 @@ class ActionPerformerAccountSerializer(serializers.ModelSerializer):
 class ActivityLogsListSerializer(serializers.ModelSerializer):
     action_type = serializers.CharField(source='get_action_type_display')
     actions = JobActionsSerializer(source='action_track.process.processaction_set', many=True, read_only=True)
-    run_logs = serializers.JSONField(source='action_track.run_logs', read_only=True)
+    run_logs = LatestRunLogField(job_attr='action_track')
     run_action__logs = ScheduledActionTrackSerializer(many=True, source='action_track.scheduledactiontrack_set',
                                                       read_only=True)
     user = ActionPerformerAccountSerializer()
@@ -149,3 +221,45 @@ class PaginatedActivityLogsResponseSerializer(serializers.Serializer):
     next = serializers.CharField(allow_null=True)
     previous = serializers.CharField(allow_null=True)
     results = ActivityLogsListSerializer(many=True)
+
+
+class ActivityLogBufferMetricsSerializer(serializers.Serializer):
+    entries_written = serializers.IntegerField()
+    entries_lost = serializers.IntegerField()
+    loss_rate = serializers.FloatField()
+    flushes = serializers.IntegerField()
+    average_flush_latency_ms = serializers.FloatField()
+
+
+class ActionRunStatisticQuerySerializer(serializers.Serializer):
+    min_date = serializers.DateField(required=False)
+    max_date = serializers.DateField(required=False)
+    process_id = serializers.IntegerField(required=False)
+    action_type = serializers.ChoiceField(choices=ProcessAction.ACTION_TYPE_CHOICES, required=False)
+
+    def validate(self, attrs):
+        if attrs.get('min_date') and attrs.get('max_date') and attrs['min_date'] > attrs['max_date']:
+            raise serializers.ValidationError({'min_date': ['Must be before max_date.']})
+        return attrs
+
+
+class ActionRunStatisticTotalsSerializer(serializers.Serializer):
+    success_count = serializers.IntegerField()
+    failure_count = serializers.IntegerField()
+    total = serializers.IntegerField()
+    success_rate = serializers.FloatField()
+    failure_rate = serializers.FloatField()
+
+
+class ActionRunStatisticSerializer(ActionRunStatisticTotalsSerializer):
+    day = serializers.DateField()
+    process_id = serializers.IntegerField()
+    process_name = serializers.CharField()
+    action_type = serializers.CharField()
+
+
+class ActionRunStatisticsResponseSerializer(serializers.Serializer):
+    min_date = serializers.DateField()
+    max_date = serializers.DateField()
+    totals = ActionRunStatisticTotalsSerializer()
+    results = ActionRunStatisticSerializer(many=True)
@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from loguru import logger
+
+from processes.models import ScheduledActionTrack
+from processes.services.statistics_service import record_track_statistics
+
+METRICS_CACHE_KEY_PREFIX = 'processes:activity_log_buffer'
+METRICS_COUNTERS = ['entries_written', 'entries_lost', 'flushes', 'flush_latency_us']
+
+
+class ActivityLogBuffer:
+    """
+    Worker-local sink for ScheduledActionTrack and ActivityLogs rows written from the action hot path.
+    Entries are kept in memory and written with one bulk_create per model, flushed on buffer size,
+    flush interval, task completion and worker shutdown.
+    """
+
+    def __init__(self, batch_size=None, flush_interval=None):
+        self.batch_size = batch_size or settings.ACTIVITY_LOG_BUFFER_SIZE
+        self.flush_interval = flush_interval or settings.ACTIVITY_LOG_FLUSH_INTERVAL
+        self._entries = []
+        self._timer = None
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self.stats = {
+            'entries_buffered': 0,
+            'entries_written': 0,
+            'entries_lost': 0,
+            'flushes': 0,
+            'failed_flushes': 0,
+            'total_flush_latency': 0.0,
+            'max_flush_latency': 0.0,
+            'max_entry_delay': 0.0,
+        }
+
+    def add(self, instance):
+        """
+        Buffer an unsaved model instance for the next flush.
+        """
+        with self._lock:
+            self._entries.append((time.monotonic(), instance))
+            self.stats['entries_buffered'] += 1
+            is_full = len(self._entries) >= self.batch_size
+            if not is_full and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if is_full:
+            self.flush()
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # The timer thread got its own database connection
+            connections.close_all()
+
+    def _write(self, model, instances):
+        try:
+            model.objects.bulk_create(instances, batch_size=self.batch_size)
+        except Exception as e:
+            logger.warning(f"Retrying {len(instances)} buffered {model.__name__} entries after error: {e}")
+            model.objects.bulk_create(instances, batch_size=self.batch_size)
+
+    def flush(self):
+        """
+        Write every buffered entry. Entries that still fail after one retry are logged and counted as lost.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            entries, self._entries = self._entries, []
+        if not entries:
+            return 0
+
+        by_model = defaultdict(list)
+        for _, instance in entries:
+            by_model[type(instance)].append(instance)
+
+        written = 0
+        started = time.monotonic()
+        with self._flush_lock:
+            for model, instances in by_model.items():
+                try:
+                    self._write(model, instances)
+                    written += len(instances)
+                except Exception as e:
+                    self.stats['entries_lost'] += len(instances)
+                    self.stats['failed_flushes'] += 1
+                    logger.exception(f"Lost {len(instances)} buffered {model.__name__} entries: {e}")
+                    continue
+
+                if model is ScheduledActionTrack:
+                    try:
+                        record_track_statistics(instances)
+                    except Exception as e:
+                        logger.exception(f"Could not update action run statistics: {e}")
+
+        finished = time.monotonic()
+        latency = finished - started
+        with self._lock:
+            self.stats['entries_written'] += written
+            self.stats['flushes'] += 1
+            self.stats['total_flush_latency'] += latency
+            self.stats['max_flush_latency'] = max(self.stats['max_flush_latency'], latency)
+            self.stats['max_entry_delay'] = max(self.stats['max_entry_delay'], finished - entries[0][0])
+        record_flush_metrics(written, len(entries) - written, latency)
+        return written
+
+    def close(self):
+        self.flush()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                **self.stats,
+                'pending': len(self._entries),
+                'average_flush_latency': (
+                    self.stats['total_flush_latency'] / self.stats['flushes'] if self.stats['flushes'] else 0.0
+                ),
+            }
+
+
+def record_flush_metrics(written, lost, latency):
+    """
+    Add the outcome of a flush to the counters shared by every worker in the cache.
+    """
+    values = {
+        'entries_written': written,
+        'entries_lost': lost,
+        'flushes': 1,
+        'flush_latency_us': int(latency * 1000000),
+    }
+    try:
+        for name, value in values.items():
+            key = f'{METRICS_CACHE_KEY_PREFIX}:{name}'
+            cache.add(key, 0, timeout=None)
+            cache.incr(key, value)
+    except Exception as e:
+        logger.warning(f"Could not record activity log buffer metrics: {e}")
+
+
+def get_flush_metrics():
+    """
+    Return the activity log buffer metrics aggregated over every worker.
+    """
+    counters = cache.get_many([f'{METRICS_CACHE_KEY_PREFIX}:{name}' for name in METRICS_COUNTERS])
+    metrics = {name: counters.get(f'{METRICS_CACHE_KEY_PREFIX}:{name}', 0) for name in METRICS_COUNTERS}
+    total = metrics['entries_written'] + metrics['entries_lost']
+    return {
+        'entries_written': metrics['entries_written'],
+        'entries_lost': metrics['entries_lost'],
+        'loss_rate': metrics['entries_lost'] / total if total else 0.0,
+        'flushes': metrics['flushes'],
+        'average_flush_latency_ms': (
+            metrics['flush_latency_us'] / metrics['flushes'] / 1000 if metrics['flushes'] else 0.0
+        ),
+    }
+
+
+_activity_log_buffer = None
+_activity_log_buffer_lock = threading.Lock()
+
+
+def get_activity_log_buffer():
+    """
+    Return the activity log buffer of the current worker process.
+    """
+    global _activity_log_buffer
+    if _activity_log_buffer is None:
+        with _activity_log_buffer_lock:
+            if _activity_log_buffer is None:
+                _activity_log_buffer = ActivityLogBuffer()
+    return _activity_log_buffer
+
+
+def flush_activity_log_buffer():
+    """
+    Write the buffered entries of the current worker process, if any.
+    """
+    if _activity_log_buffer is not None:
+        _activity_log_buffer.flush()
+
+
+def close_activity_log_buffer():
+    """
+    Flush the buffer of the current worker process before it exits.
+    """
+    if _activity_log_buffer is not None:
+        _activity_log_buffer.close()
+        logger.info(f"Activity log buffer stats: {_activity_log_buffer.get_stats()}")
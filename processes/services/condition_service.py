@@ -0,0 +1,98 @@
+import threading
+
+MEMBERSHIP_COMPARISONS = ['eq_in', 'was_equal', 'equal']
+NON_MEMBERSHIP_COMPARISONS = ['neq_in', 'was_not_equal', 'not_equal']
+
+_compiled_conditions = {}
+_compiled_conditions_lock = threading.Lock()
+
+
+def _as_value_set(value):
+    """
+    Turn a list of condition values into a frozenset so membership checks are O(1).
+    Values that are not lists (or contain unhashable items) are returned untouched.
+    """
+    if isinstance(value, (list, tuple, set, frozenset)):
+        try:
+            return frozenset(value)
+        except TypeError:
+            return value
+    return value
+
+
+def _compile_condition(condition):
+    """
+    Resolve the context key, expected value and comparison of a single condition once,
+    returning a function that only needs the context to be evaluated.
+    """
+    comparison = condition["comparison"]
+    target_props = condition['target_props']
+
+    if comparison in ['changed', 'not_changed']:
+        key = f"{target_props}_changed"
+    elif comparison in ['was_equal', 'was_not_equal']:
+        key = f"old_{target_props}"
+    else:
+        key = target_props
+
+    value = condition.get('value')
+    if comparison == 'changed':
+        value = True
+    elif comparison == 'not_changed':
+        value = False
+    elif comparison == 'equal':
+        value = [True if val == 'is_true' else False for val in value if val in ['is_true', 'is_false']]
+
+    if comparison in MEMBERSHIP_COMPARISONS:
+        values = _as_value_set(value)
+        return lambda context: context.get(key) in values
+    elif comparison in NON_MEMBERSHIP_COMPARISONS:
+        values = _as_value_set(value)
+        return lambda context: context.get(key) not in values
+    elif comparison == 'changed':
+        return lambda context: context.get(key) == value
+    elif comparison == 'not_changed':
+        return lambda context: context.get(key) != value
+    # Unknown comparison types never match
+    return lambda context: False
+
+
+def compile_conditions(conditions):
+    """
+    Compile a Process.condition list into a predicate taking the event context.
+    Conditions are chained with AND logic; the predicate returns None for an empty list
+    (matching the behaviour of ProcessService.evaluate_conditions).
+    """
+    checks = tuple(_compile_condition(condition) for condition in conditions or [])
+
+    def predicate(context):
+        result = None
+        for check in checks:
+            result = check(context)
+            if not result:
+                break
+        return result
+
+    return predicate
+
+
+def get_process_predicate(process):
+    """
+    Return the compiled condition predicate of a process, cached by process id and updated_at.
+    """
+    cached = _compiled_conditions.get(process.id)
+    if cached and cached[0] == process.updated_at:
+        return cached[1]
+
+    predicate = compile_conditions(process.condition)
+    with _compiled_conditions_lock:
+        _compiled_conditions[process.id] = (process.updated_at, predicate)
+    return predicate
+
+
+def invalidate_process_predicate(process_id):
+    """
+    Drop the compiled predicate of a process from the cache.
+    """
+    with _compiled_conditions_lock:
+        _compiled_conditions.pop(process_id, None)
@@ -0,0 +1,168 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
+from loguru import logger
+from rest_framework.exceptions import ValidationError
+
+from processes.filters import ScheduledJobFilter
+from processes.models import ScheduledJob, ScheduledProcessAction, ScheduledJobRun, ActivityLogs
+from processes.services.process_service import make_scheduled_action_batches, publish_scheduled_action_batches
+from processes.tasks import run_bulk_job_action
+
+BULK_ACTION_CACHE_KEY_PREFIX = 'processes:bulk_job_action'
+BULK_ACTION_CACHE_TIMEOUT = 60 * 60 * 24
+# Jobs each action applies to, matching the checks of the single job handle-action endpoint
+BULK_ACTION_JOB_CONDITIONS = {
+    'cancel': ~Q(status='cancelled'),
+    'run_now': Q(status='scheduled'),
+    'run_again': Q(status='completed'),
+}
+
+
+def get_bulk_action_queryset(action_type, ids=None, filters=None):
+    """
+    Return the jobs a bulk action applies to: the given ids and/or the jobs matching
+    the scheduled job list filters, restricted to the statuses the action is allowed on.
+    """
+    queryset = ScheduledJob.objects.all()
+    if ids:
+        queryset = queryset.filter(id__in=ids)
+    if filters:
+        filterset = ScheduledJobFilter(data=filters, queryset=queryset)
+        if not filterset.is_valid():
+            raise ValidationError({'filters': filterset.errors})
+        queryset = filterset.qs
+    return queryset.filter(BULK_ACTION_JOB_CONDITIONS[action_type])
+
+
+def cancel_jobs(queryset, job_ids, performer_id):
+    """
+    Cancel a chunk of jobs with one UPDATE per table. Returns the number of cancelled jobs.
+    """
+    with transaction.atomic():
+        job_ids = list(queryset.filter(id__in=job_ids).select_for_update(of=('self',)).values_list('id', flat=True))
+        if not job_ids:
+            return 0
+        # Bumping the generation turns already published tasks into no-ops
+        ScheduledProcessAction.objects.filter(scheduled_job_id__in=job_ids).update(
+            status='cancelled', generation=F('generation') + 1
+        )
+        ScheduledJob.objects.filter(id__in=job_ids).update(status='cancelled', updated_at=now())
+        ActivityLogs.objects.bulk_create([
+            ActivityLogs(action_type='process_job_cancelled', action_track_id=job_id, user_id=performer_id)
+            for job_id in job_ids
+        ])
+    return len(job_ids)
+
+
+def run_jobs(queryset, job_ids, performer_id):
+    """
+    Run a chunk of jobs right away: their actions are reset with one bulk UPDATE and published
+    in PROCESS_EXECUTION_BATCH_SIZE batches once the transaction commits. Returns the number of jobs run.
+    """
+    with transaction.atomic():
+        job_ids = list(queryset.filter(id__in=job_ids).select_for_update(of=('self',)).values_list('id', flat=True))
+        if not job_ids:
+            return 0
+        actions = list(
+            ScheduledProcessAction.objects.select_for_update().filter(scheduled_job_id__in=job_ids)
+            .only('id', 'generation').order_by('id')
+        )
+        batches = make_scheduled_action_batches(actions)
+        for scheduled_action in actions:
+            # A new generation makes any previously published task for this action stale
+            scheduled_action.status = 'pending'
+            scheduled_action.generation += 1
+        ScheduledProcessAction.objects.bulk_update(actions, ['status', 'generation', 'task_id', 'dispatched_at',
+                                                             'started_at'])
+
+        run_time = now()
+        ScheduledJob.objects.filter(id__in=job_ids).update(status='completed', run_time=run_time,
+                                                           updated_at=run_time)
+        ScheduledJobRun.objects.bulk_create([
+            ScheduledJobRun.for_job(ScheduledJob(id=job_id), run_time) for job_id in job_ids
+        ])
+        ActivityLogs.objects.bulk_create([
+            ActivityLogs(action_type='process_job_run', action_track_id=job_id, user_id=performer_id)
+            for job_id in job_ids
+        ])
+        transaction.on_commit(lambda: publish_scheduled_action_batches(batches, performer_id=performer_id))
+    return len(job_ids)
+
+
+BULK_ACTIONS = {
+    'cancel': cancel_jobs,
+    'run_now': run_jobs,
+    'run_again': run_jobs,
+}
+
+
+def get_bulk_action_progress(operation_id):
+    return cache.get(f'{BULK_ACTION_CACHE_KEY_PREFIX}:{operation_id}')
+
+
+def set_bulk_action_progress(progress):
+    cache.set(f'{BULK_ACTION_CACHE_KEY_PREFIX}:{progress["operation_id"]}', progress,
+              timeout=BULK_ACTION_CACHE_TIMEOUT)
+
+
+def run_bulk_action(operation_id, action_type, performer_id, ids=None, filters=None):
+    """
+    Apply a bulk action chunk by chunk (PROCESS_BULK_ACTION_CHUNK_SIZE jobs, walked by id),
+    storing the progress in the cache after every chunk.
+    """
+    progress = get_bulk_action_progress(operation_id) or {
+        'operation_id': operation_id, 'action_type': action_type, 'total': None, 'started_at': None,
+    }
+    progress.update({'status': 'running', 'processed': 0, 'updated': 0, 'error': None, 'finished_at': None})
+    progress['started_at'] = progress['started_at'] or now()
+
+    try:
+        queryset = get_bulk_action_queryset(action_type, ids, filters)
+        if progress['total'] is None:
+            progress['total'] = queryset.count()
+        set_bulk_action_progress(progress)
+
+        chunk_size = settings.PROCESS_BULK_ACTION_CHUNK_SIZE
+        last_id = 0
+        while True:
+            job_ids = list(queryset.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size])
+            if not job_ids:
+                break
+            last_id = job_ids[-1]
+            progress['updated'] += BULK_ACTIONS[action_type](queryset, job_ids, performer_id)
+            progress['processed'] += len(job_ids)
+            set_bulk_action_progress(progress)
+    except Exception as e:
+        logger.exception(f"Bulk {action_type} of scheduled jobs failed: {e}")
+        progress.update({'status': 'failed', 'error': str(e), 'finished_at': now()})
+        set_bulk_action_progress(progress)
+        raise
+
+    progress.update({'status': 'completed', 'finished_at': now()})
+    set_bulk_action_progress(progress)
+    logger.info(f"Bulk {action_type} applied to {progress['updated']} scheduled jobs.")
+    return progress
+
+
+def start_bulk_action(action_type, performer_id, ids=None, filters=None):
+    """
+    Apply a bulk action to the matching jobs. Sets of up to one chunk are handled in the request,
+    larger ones by the run_bulk_job_action task; either way the returned progress can be polled.
+    """
+    operation_id = uuid.uuid4().hex
+    total = get_bulk_action_queryset(action_type, ids, filters).count()
+    if total <= settings.PROCESS_BULK_ACTION_CHUNK_SIZE:
+        return run_bulk_action(operation_id, action_type, performer_id, ids, filters)
+
+    progress = {
+        'operation_id': operation_id, 'action_type': action_type, 'status': 'pending', 'total': total,
+        'processed': 0, 'updated': 0, 'error': None, 'started_at': now(), 'finished_at': None,
+    }
+    set_bulk_action_progress(progress)
+    run_bulk_job_action.delay(operation_id, action_type, performer_id, ids=ids, filters=filters)
+    return progress
@@ -0,0 +1,139 @@
+import datetime
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.timezone import now
+from loguru import logger
+
+from processes.models import ActivityLogs, ScheduledActionTrack
+
+# Append-only tables range-partitioned by month on created_at (see migration 0007)
+PARTITIONED_MODELS = [ActivityLogs, ScheduledActionTrack]
+
+
+def add_months(month, months):
+    """
+    Return the first day of the month `months` away from `month`.
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def get_partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def is_partitioned(table):
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [table])
+        return cursor.fetchone() is not None
+
+
+def get_month_partitions(table):
+    """
+    Return the monthly partitions of a table as {first day of month: partition name}.
+    """
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = %s::regclass",
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        if match := pattern.match(name):
+            partitions[datetime.date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def create_month_partition(table, month):
+    """
+    Create the partition of a month. Rows of that month that already landed in the
+    default partition are moved over before attaching.
+    """
+    name = get_partition_name(table, month)
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE "{name}" (LIKE "{table}")')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{table}_default" '
+            f"WHERE created_at >= %s::timestamptz AND created_at < %s::timestamptz RETURNING *) "
+            f'INSERT INTO "{name}" SELECT * FROM moved',
+            [f'{start} 00:00:00+00', f'{end} 00:00:00+00'],
+        )
+        cursor.execute(
+            f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" '
+            f"FOR VALUES FROM ('{start} 00:00:00+00') TO ('{end} 00:00:00+00')"
+        )
+    return name
+
+
+def ensure_partitions(months_ahead=None):
+    """
+    Make sure every partitioned table has partitions from the current month up to `months_ahead` months ahead.
+    """
+    months_ahead = settings.PROCESS_LOG_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    current_month = now().date().replace(day=1)
+    created = []
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        if not is_partitioned(table):
+            continue
+        existing = get_month_partitions(table)
+        for offset in range(months_ahead + 1):
+            month = add_months(current_month, offset)
+            if month not in existing:
+                created.append(create_month_partition(table, month))
+    return created
+
+
+def drop_expired_partitions(retention_months=None):
+    """
+    Drop the monthly partitions entirely older than the retention window (PROCESS_LOG_RETENTION_MONTHS).
+    Dropping a partition is a catalog operation, unlike deleting its rows one by one.
+    """
+    retention_months = settings.PROCESS_LOG_RETENTION_MONTHS if retention_months is None else retention_months
+    if not retention_months:
+        return []
+
+    oldest_kept = add_months(now().date().replace(day=1), -retention_months)
+    dropped = []
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        if not is_partitioned(table):
+            continue
+        for month, name in sorted(get_month_partitions(table).items()):
+            if month < oldest_kept:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DROP TABLE "{name}"')
+                dropped.append(name)
+        # Rows older than every monthly partition can only live in the (normally empty) default partition
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM "{table}_default" WHERE created_at < %s::timestamptz',
+                [f'{oldest_kept.isoformat()} 00:00:00+00'],
+            )
+    if dropped:
+        logger.info(f"Dropped expired log partitions: {', '.join(dropped)}")
+    return dropped
+
+
+def truncate_model(model):
+    """
+    Remove every row of a table with TRUNCATE on Postgres (all partitions at once),
+    falling back to a queryset delete on other databases.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            # TRUNCATE refuses to run while deferred FK checks of the current transaction are pending
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            cursor.execute(f'TRUNCATE TABLE "{model._meta.db_table}"')
+    else:
+        model.objects.all().delete()
@@ -1,17 +1,56 @@
 import abc
 import re
 import traceback
+from functools import lru_cache
 
-import pytz
 from django.conf import settings
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 
 from general_settings.services.general_settings_service import GeneralSettingsService
-from general_settings.services.model_services import get_strf_date_format
+from notifications.services.email_pool import get_email_pool
+from processes.services.activity_log_buffer import get_activity_log_buffer
 from processes.models import ScheduledActionTrack, ActivityLogs
 
 
+TEMPLATE_TAG_PATTERN = re.compile(r"\{\{(.*?)\}\}")
+
+
+class CompiledTemplate:
+    """
+    A template split once into literal text and placeholder keys.
+    `literals` always holds one more item than `keys`: literal, key, literal, ..., literal.
+    """
+
+    def __init__(self, template):
+        segments = TEMPLATE_TAG_PATTERN.split(template)
+        self.literals = [segments[0]]
+        self.keys = []
+        for key, literal in zip(segments[1::2], segments[2::2]):
+            if key != key.strip():
+                # Only tags written without surrounding spaces are substituted, {{ key }} is kept as text
+                self.literals[-1] += f"{{{{{key}}}}}{literal}"
+            else:
+                self.keys.append(key)
+                self.literals.append(literal)
+        self.variables = frozenset(self.keys)
+
+    def render(self, data):
+        parts = [self.literals[0]]
+        for key, literal in zip(self.keys, self.literals[1:]):
+            parts.append(str(data.get(key, "")))
+            parts.append(literal)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=512)
+def compile_template(template):
+    """
+    Parse a template into a CompiledTemplate, cached (LRU) by the template text.
+    """
+    return CompiledTemplate(template)
+
+
 class DynamicTemplateEngine:
     def __init__(self, data):
         """
@@ -24,15 +63,72 @@ class DynamicTemplateEngine:
         """
         Replaces tags like {{booking_id}} with actual values from the data.
         """
-        pattern = r"\{\{(.*?)\}\}"
-        matches = re.findall(pattern, template)
+        if not template:
+            return template
+        return compile_template(template).render(self.data)
+
+
+class LazyModelData:
+    """
+    Template data resolved on demand. Each variable is registered with a resolver that only
+    runs the first time a template asks for the variable; the result is memoized.
+    Plain values (e.g. the event context) can be mixed in with `update`.
+    """
+
+    def __init__(self):
+        self._resolvers = {}
+        self._values = {}
+
+    def add(self, resolvers):
+        for key, resolver in resolvers.items():
+            self._resolvers[key] = resolver
+            self._values.pop(key, None)
+
+    def update(self, values):
+        for key, value in values.items():
+            self._values[key] = value
+            self._resolvers.pop(key, None)
+
+    def get(self, key, default=None):
+        if key in self._values:
+            return self._values[key]
+        resolver = self._resolvers.get(key)
+        if resolver is None:
+            return default
+        value = self._values[key] = resolver()
+        return value
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __contains__(self, key):
+        return key in self._values or key in self._resolvers
+
+    def keys(self):
+        return set(self._values) | set(self._resolvers)
+
+    def resolved(self):
+        """
+        Return the variables resolved so far.
+        """
+        return dict(self._values)
+
+
+def once(func):
+    """
+    Memoize a zero-argument function, used for values shared by several variables
+    (time zone, referrer, ...) so they are computed at most once per action.
+    """
+    result = []
 
-        for match in matches:
-            key = match.strip()
-            value = self.data.get(key, "")
-            template = template.replace(f"{{{{{key}}}}}", str(value))
+    def wrapper():
+        if not result:
+            result.append(func())
+        return result[0]
 
-        return template
+    return wrapper
 
 
 class BaseAction(abc.ABC):
@@ -58,7 +154,7 @@ class EmailSendAction(BaseAction):
         email_subject = context.get('subject', '')
         message = EmailMessage(email_subject, html_message, from_email, [context.get('to_email', '')])
         message.content_subtype = 'html'
-        message.send()
+        get_email_pool().send(message)
 
 
 class WhatsAppSendAction(BaseAction):
@@ -72,7 +168,12 @@ class WhatsAppSendAction(BaseAction):
 
 
 class ProcessActionService:
-    def __init__(self):
+    def __init__(self, general_settings=None):
+        """
+        general_settings can be shared across many actions (e.g. by a batch task);
+        otherwise settings are loaded per action.
+        """
+        self.general_settings = general_settings
         self.actions = {
             'send_email': EmailSendAction(),
             'whatsapp_send': WhatsAppSendAction(),
@@ -80,35 +181,28 @@ class ProcessActionService:
 
     def set_log_action_result(self, job, action, status, message, process_execution_id=None):
         """
-        Log the action result (success or failure) into the ScheduledJob's run_logs field.
-        If process_execution_id is None, generate a new one. If it's provided and exists in the logs,
-        append the action details; otherwise, create a new log entry.
+        Log the action result (success or failure) as a ScheduledActionTrack of the job.
+        Entries are written in bulk by the worker's activity log buffer.
         """
-
-        ScheduledActionTrack.objects.create(
+        get_activity_log_buffer().add(ScheduledActionTrack(
             action=action,
             message=message,
             schedule=job,
             status=status,
-        )
+        ))
 
     @staticmethod
     def set_process_activity(action_type, job):
-        if action_type == 'send_email':
-            ActivityLogs.objects.create(
-                action_type='email_sent',
-                action_track=job
-            )
-        elif action_type == 'add_to_mailchimp_list':
-            ActivityLogs.objects.create(
-                action_type='mailchimp_contact_added_to_list',
-                action_track=job
-            )
-        elif action_type == 'send_sms':
-            ActivityLogs.objects.create(
-                action_type='sms_sent',
+        activity_types = {
+            'send_email': 'email_sent',
+            'add_to_mailchimp_list': 'mailchimp_contact_added_to_list',
+            'send_sms': 'sms_sent',
+        }
+        if action_type in activity_types:
+            get_activity_log_buffer().add(ActivityLogs(
+                action_type=activity_types[action_type],
                 action_track=job
-            )
+            ))
 
     def execute_action(self, action, job):
         """
@@ -128,116 +222,108 @@ class ProcessActionService:
     def get_model_data(self, booking=None, customer=None, transaction=None, booking_waiting_list=None, context=None):
         """
         Collects dynamic data from models like Booking, Customer, Agent, etc.
+        Variables are resolved lazily, only when a template references them (see LazyModelData).
         """
-        data = {}
-        general_setting = GeneralSettingsService()
-        customer_portal_url = general_setting.get_dashboard_url()
-        tz = pytz.timezone(general_setting.get_booking_setting('time_zone'))
-        date_format = general_setting.get_booking_setting('date_format')
-        date_format = get_strf_date_format(date_format) if date_format else date_format
-        time_system = general_setting.get_booking_setting('time_system')
-
-        if business_info := general_setting.get_business_info():
-            logo = general_setting.get_compony_logo_url()
-            data.update({
-                'business_logo_url': logo if logo else "",
-                'business_logo_image': f'<img style="height: 50px; width: auto;" src="{logo}"/>' if logo else "",
-                'business_address': business_info.get('company_name', ''),
-                'business_phone': business_info.get('business_phone', ''),
-                'business_name': business_info.get('business_address', ''),
-            })
+        data = LazyModelData()
+        general_setting = self.general_settings or GeneralSettingsService()
+        customer_portal_url = once(general_setting.get_dashboard_url)
+        # Time zone and formats are resolved once per settings version
+        formatter = once(general_setting.get_datetime_formatter)
+
+        business_info = once(general_setting.get_business_info)
+        logo = once(general_setting.get_compony_logo_url)
+        data.add({
+            'business_logo_url': lambda: (logo() or "") if business_info() else "",
+            'business_logo_image': lambda: f'<img style="height: 50px; width: auto;" src="{logo()}"/>' if business_info() and logo() else "",
+            'business_address': lambda: (business_info() or {}).get('company_name', ''),
+            'business_phone': lambda: (business_info() or {}).get('business_phone', ''),
+            'business_name': lambda: (business_info() or {}).get('business_address', ''),
+        })
 
         if booking:
-            start_date = booking.start_datetime.astimezone(tz).date() if booking.start_datetime else ''
-            if start_date and date_format:
-                start_date = start_date.strftime(date_format)
-
-            end_date = booking.end_datetime.astimezone(tz).date() if booking.end_datetime else ''
-            if end_date and date_format:
-                end_date = end_date.strftime(date_format)
-
-            start_time = booking.start_datetime.astimezone(tz) if booking.start_datetime else ''
-            if start_time and time_system:
-                start_time = start_time.strftime("%I:%M%p").lower() if time_system == "12" else start_time.strftime(
-                    "%H:%M")
-
-            end_time = booking.end_datetime.astimezone(tz) if booking.end_datetime else ''
-            if end_time and time_system:
-                end_time = end_time.strftime("%I:%M%p").lower() if time_system == "12" else end_time.strftime("%H:%M")
-
-            data.update({
-                'booking_id': booking.id,
-                'booking_code': booking.booking_code,
-                'start_date': start_date,
-                'end_date': end_date,
-                'start_time': start_time,
-                'end_time': end_time,
-                'service_name': booking.service.name if booking.service else '',
-                'service_category': booking.service.category.name if booking.service and booking.service.category else '',
-                'booking_duration': booking.duration if booking.duration else '',
-                'booking_status': booking.status if booking.status else '',
-                'total_attendees': booking.total_attendees if booking.total_attendees else '',
-                'agent_email': booking.agent.account.email if booking.agent and booking.agent.account else '',
-                'agent_full_name': booking.agent.account.get_full_name() if booking.agent and booking.agent.account else '',
-                'agent_first_name': booking.agent.account.first_name if booking.agent and booking.agent.account else '',
-                'agent_last_name': booking.agent.account.last_name if booking.agent and booking.agent.account else '',
-                'agent_phone': booking.agent.account.phone if booking.agent and booking.agent.account else '',
-                'agent_display_name': booking.agent.display_name if booking.agent else '',
-                'agent_additional_phones': booking.agent.additional_phone if booking.agent else '',
-                'agent_additional_emails': booking.agent.additional_email if booking.agent else '',
-                'location_name': booking.location.name if booking.location else '',
-                'location_display_name': booking.location.display_name if booking.location else '',
-                'location_full_address': booking.location.location if booking.location else '',
-                'location_email': booking.location.location_email if booking.location else '',
-                'location_phone': booking.location.location_phone if booking.location else '',
-                'location_additional_emails': booking.location.location_additional_email if booking.location else '',
-                'location_additional_phones': booking.location.location_additional_phone if booking.location else '',
-                'booking_payment_status': booking.payment_status if booking.payment_status else '',
-                'booking_payment_portion': booking.payment_portion if booking.payment_portion else '',
-                'booking_payment_method': booking.payment_method if booking.payment_method else '',
-                'booking_payment_amount': format(booking.subtotal, ".2f") if booking.subtotal else '',
-                'booking_price': f"{booking.booking_price_track.get('total'):.2f}" if booking.booking_price_track and booking.booking_price_track.get(
+            agent_account = once(lambda: booking.agent.account if booking.agent else None)
+            location = once(lambda: booking.location)
+            data.add({
+                'booking_id': lambda: booking.id,
+                'booking_code': lambda: booking.booking_code,
+                'start_date': lambda: formatter().format_date(booking.start_datetime),
+                'end_date': lambda: formatter().format_date(booking.end_datetime),
+                'start_time': lambda: formatter().format_time(booking.start_datetime),
+                'end_time': lambda: formatter().format_time(booking.end_datetime),
+                'service_name': lambda: booking.service.name if booking.service else '',
+                'service_category': lambda: booking.service.category.name if booking.service and booking.service.category else '',
+                'booking_duration': lambda: booking.duration if booking.duration else '',
+                'booking_status': lambda: booking.status if booking.status else '',
+                'total_attendees': lambda: booking.total_attendees if booking.total_attendees else '',
+                'agent_email': lambda: agent_account().email if agent_account() else '',
+                'agent_full_name': lambda: agent_account().get_full_name() if agent_account() else '',
+                'agent_first_name': lambda: agent_account().first_name if agent_account() else '',
+                'agent_last_name': lambda: agent_account().last_name if agent_account() else '',
+                'agent_phone': lambda: agent_account().phone if agent_account() else '',
+                'agent_display_name': lambda: booking.agent.display_name if booking.agent else '',
+                'agent_additional_phones': lambda: booking.agent.additional_phone if booking.agent else '',
+                'agent_additional_emails': lambda: booking.agent.additional_email if booking.agent else '',
+                'location_name': lambda: location().name if location() else '',
+                'location_display_name': lambda: location().display_name if location() else '',
+                'location_full_address': lambda: location().location if location() else '',
+                'location_email': lambda: location().location_email if location() else '',
+                'location_phone': lambda: location().location_phone if location() else '',
+                'location_additional_emails': lambda: location().location_additional_email if location() else '',
+                'location_additional_phones': lambda: location().location_additional_phone if location() else '',
+                'booking_payment_status': lambda: booking.payment_status if booking.payment_status else '',
+                'booking_payment_portion': lambda: booking.payment_portion if booking.payment_portion else '',
+                'booking_payment_method': lambda: booking.payment_method if booking.payment_method else '',
+                'booking_payment_amount': lambda: format(booking.subtotal, ".2f") if booking.subtotal else '',
+                'booking_price': lambda: f"{booking.booking_price_track.get('total'):.2f}" if booking.booking_price_track and booking.booking_price_track.get(
                     'total') else '',
-                'manage_booking_url_customer': f'{customer_portal_url}/?bookingId={booking.id}',
-                'manage_booking_url_agent': f'{settings.FRONT_END_URL}/dashboard/bookings/{booking.id}'
+                'manage_booking_url_customer': lambda: f'{customer_portal_url()}/?bookingId={booking.id}',
+                'manage_booking_url_agent': lambda: f'{settings.FRONT_END_URL}/dashboard/bookings/{booking.id}'
             })
 
         if customer:
-            data.update({
-                'customer_email': customer.account.email if customer.account else '',
-                'customer_full_name': customer.account.get_full_name() if customer.account else '',
-                'customer_first_name': customer.account.first_name if customer.account else '',
-                'customer_last_name': customer.account.last_name if customer.account else '',
-                'customer_phone': customer.account.phone if customer.account else '',
-                'customer_notes': customer.note if customer.note else '',
-                'referrer_email': customer.referrer_details.first().referrer.account.email if customer.referrer_details.first() else '',
-                'referrer_first_name': customer.referrer_details.first().referrer.account.first_name if customer.referrer_details.first() else '',
-                'referrer_last_name': customer.referrer_details.first().referrer.account.last_name if customer.referrer_details.first() else '',
+            # One query for the referrer instead of one per referrer variable
+            referrer = once(
+                lambda: getattr(customer.referrer_details.select_related('referrer__account').first(), 'referrer', None)
+            )
+            data.add({
+                'customer_email': lambda: customer.account.email if customer.account else '',
+                'customer_full_name': lambda: customer.account.get_full_name() if customer.account else '',
+                'customer_first_name': lambda: customer.account.first_name if customer.account else '',
+                'customer_last_name': lambda: customer.account.last_name if customer.account else '',
+                'customer_phone': lambda: customer.account.phone if customer.account else '',
+                'customer_notes': lambda: customer.note if customer.note else '',
+                'referrer_email': lambda: referrer().account.email if referrer() else '',
+                'referrer_first_name': lambda: referrer().account.first_name if referrer() else '',
+                'referrer_last_name': lambda: referrer().account.last_name if referrer() else '',
             })
 
         if transaction:
-            data.update({
-                'transaction_token': transaction.confirmation_code if transaction.confirmation_code else '',
-                'transaction_amount': transaction.amount if transaction.amount else '',
-                'transaction_processor': transaction.processor if transaction.processor else '',
-                'transaction_payment_method': transaction.method if transaction.method else '',
-                'transaction_funds_status': transaction.fund_status if transaction.fund_status else '',
-                'transaction_status': transaction.status if transaction.status else '',
-                'transaction_notes': transaction.notes if transaction.notes else '',
-                'transaction_payment_portion': transaction.payment_portion if transaction.payment_portion else '',
+            data.add({
+                'transaction_token': lambda: transaction.confirmation_code if transaction.confirmation_code else '',
+                'transaction_amount': lambda: transaction.amount if transaction.amount else '',
+                'transaction_processor': lambda: transaction.processor if transaction.processor else '',
+                'transaction_payment_method': lambda: transaction.method if transaction.method else '',
+                'transaction_funds_status': lambda: transaction.fund_status if transaction.fund_status else '',
+                'transaction_status': lambda: transaction.status if transaction.status else '',
+                'transaction_notes': lambda: transaction.notes if transaction.notes else '',
+                'transaction_payment_portion': lambda: transaction.payment_portion if transaction.payment_portion else '',
             })
 
         if booking_waiting_list:
-            data.update({
-                'waiting_list_id': booking_waiting_list.id,
-                'total_attendees': booking_waiting_list.total_attendees,
-                'customer_name': booking_waiting_list.customer.account.get_full_name() if booking_waiting_list.customer and booking_waiting_list.customer.account else '',
-                'customer_email': booking_waiting_list.customer.account.email if booking_waiting_list.customer and booking_waiting_list.customer.account else '',
-                'service_name': booking_waiting_list.service.name if booking_waiting_list.service else '',
-                'location_name': booking_waiting_list.location.name if booking_waiting_list.location else '',
-                'agent_name': booking_waiting_list.agent.account.get_full_name() if booking_waiting_list.agent and booking_waiting_list.agent.account else '',
-                'room_name': booking_waiting_list.room.name if booking_waiting_list.room else '',
-                'created_at': booking_waiting_list.created_at.strftime(
+            waiting_customer = once(
+                lambda: booking_waiting_list.customer.account
+                if booking_waiting_list.customer and booking_waiting_list.customer.account else None
+            )
+            data.add({
+                'waiting_list_id': lambda: booking_waiting_list.id,
+                'total_attendees': lambda: booking_waiting_list.total_attendees,
+                'customer_name': lambda: waiting_customer().get_full_name() if waiting_customer() else '',
+                'customer_email': lambda: waiting_customer().email if waiting_customer() else '',
+                'service_name': lambda: booking_waiting_list.service.name if booking_waiting_list.service else '',
+                'location_name': lambda: booking_waiting_list.location.name if booking_waiting_list.location else '',
+                'agent_name': lambda: booking_waiting_list.agent.account.get_full_name() if booking_waiting_list.agent and booking_waiting_list.agent.account else '',
+                'room_name': lambda: booking_waiting_list.room.name if booking_waiting_list.room else '',
+                'created_at': lambda: booking_waiting_list.created_at.strftime(
                     "%Y-%m-%d %H:%M:%S") if booking_waiting_list.created_at else '',
             })
         if context:
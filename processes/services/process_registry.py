@@ -0,0 +1,93 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+from loguru import logger
+
+from processes.models import Process, ProcessAction
+
+REGISTRY_VERSION_CACHE_KEY = 'processes:registry:version'
+
+
+class ProcessRegistry:
+    """
+    Worker-local registry of active processes (with their active actions) keyed by event type.
+    Entries are invalidated across gunicorn and celery workers through a version counter
+    stored in the shared cache, bumped whenever a Process or ProcessAction changes.
+    While the cache is unreachable every lookup loads from the database and nothing is kept.
+    """
+
+    def __init__(self):
+        self._version = None
+        self._processes = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_version():
+        version = cache.get(REGISTRY_VERSION_CACHE_KEY)
+        if version is None:
+            # Seed with a timestamp so a flushed cache never reuses a version a worker has seen
+            cache.add(REGISTRY_VERSION_CACHE_KEY, int(time.time() * 1000))
+            version = cache.get(REGISTRY_VERSION_CACHE_KEY)
+        return version
+
+    @staticmethod
+    def bump_version():
+        try:
+            cache.incr(REGISTRY_VERSION_CACHE_KEY)
+        except ValueError:
+            cache.add(REGISTRY_VERSION_CACHE_KEY, int(time.time() * 1000))
+        except Exception as e:
+            # Workers that could not read the version meanwhile dropped their entries, see get_processes
+            logger.warning(f"Could not bump the process registry version: {e}")
+
+    @staticmethod
+    def load_processes(event_type):
+        """
+        Load the active processes of an event type with their active actions
+        attached as `active_actions`, in two queries.
+        """
+        return list(
+            Process.objects.filter(event_type=event_type, status='active').prefetch_related(
+                Prefetch(
+                    'processaction_set',
+                    queryset=ProcessAction.objects.filter(status='active'),
+                    to_attr='active_actions',
+                )
+            )
+        )
+
+    def get_processes(self, event_type):
+        """
+        Return the active processes for an event type, loading them only when the
+        registry version changed or the event type has not been requested yet.
+        """
+        try:
+            version = self.get_version()
+        except Exception as e:
+            logger.warning(f"Process registry version unavailable, loading {event_type} processes: {e}")
+            # Changes made while the cache is down cannot bump the version, so nothing cached survives
+            self.clear()
+            return self.load_processes(event_type)
+
+        with self._lock:
+            if version != self._version:
+                self._processes = {}
+                self._version = version
+            processes = self._processes.get(event_type)
+
+        if processes is None:
+            processes = self.load_processes(event_type)
+            with self._lock:
+                if version == self._version:
+                    self._processes[event_type] = processes
+        return processes
+
+    def clear(self):
+        with self._lock:
+            self._processes = {}
+            self._version = None
+
+
+process_registry = ProcessRegistry()
@@ -1,22 +1,28 @@
 import uuid
 from datetime import timedelta
 
-from celery.result import AsyncResult
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 from django.utils.timezone import now
 
-from processes.models import Process, ScheduledJob, ActivityLogs, ScheduledProcessAction
-from processes.tasks import execute_scheduled_process_action
+from processes.models import ScheduledJob, ActivityLogs, ScheduledProcessAction, ScheduledJobRun
+from processes.services.condition_service import get_process_predicate
+from processes.services.process_registry import process_registry
+from processes.tasks import execute_scheduled_process_actions
 
 
 class ProcessService:
-    def __init__(self, event_type, event_time=None, booking=None, transition=None, customer=None, context=None):
+    def __init__(self, event_type, event_time=None, booking=None, transition=None, customer=None, context=None,
+                 processes=None):
         self.event_type = event_type
         self.booking = booking
         self.transition = transition
         self.customer = customer
         self.context = context
-        self.processes = Process.objects.filter(event_type=event_type, status='active')
+        self.processes = processes if processes is not None else process_registry.get_processes(event_type)
         self.event_time = event_time if event_time else timezone.now()
 
     def make_context(self, changes):
@@ -67,19 +73,36 @@ class ProcessService:
         """
         Evaluate and run processes based on the provided conditions and context.
         """
+        matched_processes = self.get_matched_processes(changes)
+
+        # Schedule or update all matched processes in one batch
+        return self.schedule_or_update_jobs(matched_processes, run_now)
+
+    def get_matched_processes(self, changes=None):
+        """
+        Return the active processes of the current event type whose conditions are met.
+        """
         if self.event_type not in ['time_slot_released', 'waiting_list_subscribe', 'waiting_list_unsubscribe']:
             context = self.make_context(changes)
         else:
             context = {}
 
-        # Iterate through all active processes for the current event type
+        # Collect all active processes for the current event type whose conditions are met
+        matched_processes = []
         for process in self.processes:
             if process.is_conditional:
                 # Evaluate conditions and continue to next process if conditions are not met
-                if not self.evaluate_conditions(process.condition, context):
+                if not self.evaluate_process_conditions(process, context):
                     continue
-            # Schedule or update the process
-            self.schedule_or_update_job(process, run_now)
+            matched_processes.append(process)
+        return matched_processes
+
+    @staticmethod
+    def evaluate_process_conditions(process, context):
+        """
+        Evaluate the conditions of a process using its compiled (and cached) predicate.
+        """
+        return get_process_predicate(process)(context)
 
     def evaluate_conditions(self, conditions, context):
         """
@@ -165,58 +188,31 @@ class ProcessService:
         return offset_time
 
     def schedule_or_update_job(self, process, run_now=False):
-        object_id = self._get_object_id(process)
-        run_time = self.get_offset_time(process.time_offset)
-
-        # Check if a job already exists for this process and object
-        existing_job = self.get_scheduled_job(process, object_id)
-
-        if not existing_job:
-            # Create a new ScheduledJob
-            existing_job = ScheduledJob.objects.create(
-                process=process,
-                object_id=object_id,
-                status='scheduled',
-                run_time=run_time,
-            )
+        return self.schedule_or_update_jobs([process], run_now)
 
-        existing_job.run_logs = {
-            "id": str(uuid.uuid4())[:8],
-            "run_datetime_utc": run_time.strftime("%Y-%m-%d %H:%M:%S"),
-        }
-        existing_job.status = 'scheduled'
-        existing_job.run_time = run_time
-        existing_job.save()
-
-        # Create or update ScheduledProcessAction for each action
-        for action in process.processaction_set.filter(status='active'):
-            scheduled_action, created = ScheduledProcessAction.objects.get_or_create(
-                scheduled_job=existing_job,
-                process_action=action,
-            )
-
-            # Check if there is an existing task
-            if scheduled_action.task_id:
-                # Revoke the existing task
-                AsyncResult(scheduled_action.task_id).revoke(terminate=True)
+    def schedule_or_update_jobs(self, processes, run_now=False):
+        """
+        Create or update the scheduled jobs of the given processes for the current event
+        and schedule their actions, using a constant number of queries.
+        """
+        return bulk_schedule_jobs([self.make_plan(process, run_now) for process in processes])
 
-                # Update the status to 'pending'
-                scheduled_action.status = 'pending'
-                scheduled_action.task_id = None  # Clear the old task ID
-                scheduled_action.save()
+    def make_plan(self, process, run_now=False):
+        """
+        Build the (process, object_id, run_time, run_now, context) plan consumed by bulk_schedule_jobs.
+        """
+        return (process, self._get_object_id(process), self.get_offset_time(process.time_offset), run_now,
+                self.context)
 
-            # Schedule the action
-            if run_now:
-                task = execute_scheduled_process_action.delay(scheduled_action.id, self.context)
-            else:
-                # Schedule the action for future execution
-                task = execute_scheduled_process_action.apply_async(
-                    args=[scheduled_action.id, self.context],
-                    eta=run_time,
-                )
-            # Update the task ID and save
-            scheduled_action.task_id = task.id
-            scheduled_action.save()
+    @staticmethod
+    def get_active_actions(process):
+        """
+        Return the active actions of a process, using the ones preloaded by the process registry.
+        """
+        active_actions = getattr(process, 'active_actions', None)
+        if active_actions is None:
+            active_actions = process.processaction_set.filter(status='active')
+        return active_actions
 
     @staticmethod
     def get_scheduled_job(process, object_id):
@@ -263,6 +259,161 @@ class ProcessService:
 
 
 ########## Individual functions ##########
+def bulk_schedule_jobs(plans):
+    """
+    Create or update ScheduledJob and ScheduledProcessAction rows for a list of
+    (process, object_id, run_time, run_now, context) plans and schedule the actions.
+    Actions that are already due are published right away, the rest are left to the dispatcher.
+    Existing rows are fetched with one query per model, missing rows are created with
+    bulk_create and task ids/statuses are written back with bulk_update.
+    When several plans target the same process and object, the last one wins.
+    Returns the scheduled job of every plan, in plan order.
+    """
+    if not plans:
+        return []
+
+    current_time = now()
+    jobs_by_key = {
+        (job.process_id, job.object_id): job
+        for job in ScheduledJob.objects.filter(
+            process_id__in={plan[0].id for plan in plans},
+            object_id__in={plan[1] for plan in plans},
+        )
+    }
+
+    # Keep only the last plan for each process/object pair
+    final_plans = {}
+    for plan in plans:
+        final_plans[(plan[0].id, plan[1])] = plan
+
+    new_jobs = []
+    updated_jobs = []
+    for (process_id, object_id), (process, _, run_time, _, _) in final_plans.items():
+        job = jobs_by_key.get((process_id, object_id))
+        if not job:
+            job = ScheduledJob(process=process, object_id=object_id)
+            jobs_by_key[(process_id, object_id)] = job
+            new_jobs.append(job)
+        else:
+            updated_jobs.append(job)
+        job.status = 'scheduled'
+        job.run_time = run_time
+        job.updated_at = current_time
+
+    due_actions = []
+    with transaction.atomic():
+        if new_jobs:
+            ScheduledJob.objects.bulk_create(new_jobs)
+        if updated_jobs:
+            ScheduledJob.objects.bulk_update(updated_jobs, ['status', 'run_time', 'updated_at'])
+        ScheduledJobRun.objects.bulk_create([
+            ScheduledJobRun.for_job(jobs_by_key[key], plan[2]) for key, plan in final_plans.items()
+        ])
+
+        actions_by_key = {
+            (scheduled_action.scheduled_job_id, scheduled_action.process_action_id): scheduled_action
+            for scheduled_action in ScheduledProcessAction.objects.filter(
+                scheduled_job_id__in=[job.id for job in jobs_by_key.values()]
+            )
+        }
+
+        new_actions = []
+        updated_actions = []
+        for key, (process, _, run_time, run_now, context) in final_plans.items():
+            job = jobs_by_key[key]
+            for action in ProcessService.get_active_actions(process):
+                scheduled_action = actions_by_key.get((job.id, action.id))
+                if not scheduled_action:
+                    scheduled_action = ScheduledProcessAction(scheduled_job=job, process_action=action)
+                    new_actions.append(scheduled_action)
+                else:
+                    updated_actions.append(scheduled_action)
+                    # Bump the generation instead of revoking: any already published task becomes stale
+                    scheduled_action.generation += 1
+                    scheduled_action.status = 'pending'
+
+                scheduled_action.run_time = current_time if run_now else run_time
+                scheduled_action.context = context
+                # Due actions are published right away, future actions are enqueued
+                # by the dispatch_due_process_actions periodic task
+                scheduled_action.task_id = None
+                if scheduled_action.run_time <= current_time:
+                    due_actions.append(scheduled_action)
+
+        # Task ids are generated up front so they are stored before the tasks are published
+        batches = make_scheduled_action_batches(due_actions)
+
+        if new_actions:
+            ScheduledProcessAction.objects.bulk_create(new_actions)
+        if updated_actions:
+            ScheduledProcessAction.objects.bulk_update(
+                updated_actions, ['status', 'task_id', 'dispatched_at', 'started_at', 'run_time', 'context', 'generation']
+            )
+
+    publish_scheduled_action_batches(batches)
+
+    return [jobs_by_key[(plan[0].id, plan[1])] for plan in plans]
+
+
+def make_scheduled_action_batches(scheduled_actions, eta=None):
+    """
+    Split scheduled actions into batches of PROCESS_EXECUTION_BATCH_SIZE and give every action
+    of a batch the task id of the execute_scheduled_process_actions task that will run it.
+    Returns (batch, eta) entries for publish_scheduled_action_batches.
+    """
+    batch_size = settings.PROCESS_EXECUTION_BATCH_SIZE
+    dispatched_at = now()
+    batches = []
+    for start in range(0, len(scheduled_actions), batch_size):
+        batch = scheduled_actions[start:start + batch_size]
+        task_id = str(uuid.uuid4())
+        for scheduled_action in batch:
+            scheduled_action.task_id = task_id
+            scheduled_action.dispatched_at = dispatched_at
+            scheduled_action.started_at = None
+        batches.append((batch, eta))
+    return batches
+
+
+def publish_scheduled_action_batches(batches, performer_id=None):
+    """
+    Publish one execute_scheduled_process_actions task per (batch, eta) entry, reusing a single
+    broker producer. An eta of None runs the batch right away.
+    The task id and generation must already be stored on each scheduled action.
+    When publishing fails, the batches not published yet are released before the error is raised.
+    """
+    if not batches:
+        return
+
+    published = 0
+    try:
+        with execute_scheduled_process_actions.app.producer_or_acquire() as producer:
+            for batch, eta in batches:
+                execute_scheduled_process_actions.apply_async(
+                    args=[[[scheduled_action.id, scheduled_action.generation] for scheduled_action in batch],
+                          performer_id],
+                    task_id=batch[0].task_id,
+                    eta=eta,
+                    producer=producer,
+                )
+                published += 1
+    except Exception:
+        release_scheduled_action_batches(batches[published:])
+        raise
+
+
+def release_scheduled_action_batches(batches):
+    """
+    Hand the actions of (batch, eta) entries back to the dispatcher. Their task id is cleared and
+    their generation bumped, so a message that reached the broker anyway is a no-op.
+    Actions claimed by another task since then are left alone.
+    """
+    for batch, _ in batches:
+        ScheduledProcessAction.objects.filter(
+            id__in=[scheduled_action.id for scheduled_action in batch], task_id=batch[0].task_id
+        ).update(task_id=None, dispatched_at=None, generation=F('generation') + 1)
+
+
 def trigger_process(event_type, event_time=None, changes=None, booking=None, transition=None,
                     customer=None, run_now=None, context=None):
     process_service = ProcessService(event_type=event_type, event_time=event_time, booking=booking,
@@ -270,24 +421,54 @@ def trigger_process(event_type, event_time=None, changes=None, booking=None, tra
     process_service.run_process(changes, run_now)
 
 
-def cancel_scheduled_job(job, action_performer):
+def trigger_processes_bulk(events):
     """
-    Cancels all actions linked to a ScheduledJob by revoking their tasks
-    and updating their statuses to 'cancelled'.
+    Trigger processes for many events at once.
+    Each event is a dict accepting the keyword arguments of trigger_process (event_type is required).
+    Events are grouped by event type so every group is evaluated against one cached process set,
+    then all ScheduledJob/ScheduledProcessAction rows are persisted and their tasks published in bulk.
+    Returns one result per event, in order: {'event_type': ..., 'scheduled_jobs': [ScheduledJob, ...]}.
     """
-    actions = ScheduledProcessAction.objects.filter(scheduled_job=job)
-    for item in actions:
-        if item.task_id:
-            # Revoke the Celery task if it exists
-            AsyncResult(item.task_id).revoke(terminate=True)
+    events = list(events)
+    events_by_type = {}
+    for index, event in enumerate(events):
+        events_by_type.setdefault(event['event_type'], []).append((index, event))
+
+    plans = []
+    plan_events = []
+    for event_type, typed_events in events_by_type.items():
+        processes = process_registry.get_processes(event_type)
+        if not processes:
+            continue
+
+        for index, event in typed_events:
+            process_service = ProcessService(
+                event_type=event_type, event_time=event.get('event_time'), booking=event.get('booking'),
+                transition=event.get('transition'), customer=event.get('customer'), context=event.get('context'),
+                processes=processes,
+            )
+            for process in process_service.get_matched_processes(event.get('changes')):
+                plans.append(process_service.make_plan(process, event.get('run_now')))
+                plan_events.append(index)
+
+    results = [{'event_type': event['event_type'], 'scheduled_jobs': []} for event in events]
+    for index, job in zip(plan_events, bulk_schedule_jobs(plans)):
+        results[index]['scheduled_jobs'].append(job)
+    return results
+
 
-        # Update the status to 'cancelled' and save the changes
-        item.status = 'cancelled'
-        item.save()
+def cancel_scheduled_job(job, action_performer):
+    """
+    Cancels all actions linked to a ScheduledJob by updating their statuses to 'cancelled'.
+    Published tasks are not revoked: bumping the generation turns them into no-ops.
+    """
+    # One UPDATE for every action of the job, the generation is bumped in the database
+    ScheduledProcessAction.objects.filter(scheduled_job=job).update(
+        status='cancelled', generation=F('generation') + 1
+    )
 
-    # Update the job status to 'cancelled' if all actions are cancelled
     job.status = 'cancelled'
-    job.save()
+    job.save(update_fields=['status', 'updated_at'])
 
     # Log the cancellation
     ActivityLogs.objects.create(
@@ -299,34 +480,37 @@ def cancel_scheduled_job(job, action_performer):
     return True, f"All actions for Job {job.id} have been successfully cancelled."
 
 
+def run_scheduled_job_actions(job, action_performer):
+    """
+    Publish every action of a job right away and record the run.
+    The actions are reset with a single bulk UPDATE before their tasks are published.
+    """
+    actions = list(ScheduledProcessAction.objects.filter(scheduled_job=job).only('id', 'generation'))
+    batches = make_scheduled_action_batches(actions)
+    for item in actions:
+        # A new generation makes any previously published task for this action stale
+        item.status = 'pending'
+        item.generation += 1
+    ScheduledProcessAction.objects.bulk_update(actions, ['status', 'generation', 'task_id', 'dispatched_at',
+                                                         'started_at'])
+    publish_scheduled_action_batches(batches, performer_id=action_performer.id)
+    ActivityLogs.objects.create(
+        action_type='process_job_run',
+        action_track=job,
+        user=action_performer
+    )
+    job.status = 'completed'
+    job.run_time = now()
+    job.save(update_fields=['status', 'run_time', 'updated_at'])
+    ScheduledJobRun.for_job(job, job.run_time).save()
+
+
 def run_scheduled_job_now(job, action_performer):
     """
     Immediately execute a scheduled job.
     """
     if job.status == 'scheduled':
-        # run_scheduled_job(job_id=job.id, run_now=True)
-        actions = ScheduledProcessAction.objects.filter(scheduled_job=job)
-        for item in actions:
-            if item.task_id:
-                AsyncResult(item.task_id).revoke(terminate=True)
-            item.status = 'pending'
-            item.task_id = None
-            item.save()
-            task = execute_scheduled_process_action.delay(item.id, None, action_performer.id)
-            item.task_id = task.id
-            item.save()
-        ActivityLogs.objects.create(
-            action_type='process_job_run',
-            action_track=job,
-            user=action_performer
-        )
-        job.status = 'completed'
-        job.run_time = now()
-        job.run_logs = {
-            "id": str(uuid.uuid4())[:8],
-            "run_datetime_utc": now().strftime("%Y-%m-%d %H:%M:%S"),
-        }
-        job.save()
+        run_scheduled_job_actions(job, action_performer)
         return True, f"Job {job.id} is now running."
     else:
         return False, f"Job {job.id} is not in a scheduled state."
@@ -337,28 +521,23 @@ def run_scheduled_job_again(job, action_performer):
     Re-run a completed or previously scheduled job.
     """
     if job.status == 'completed':
-        actions = ScheduledProcessAction.objects.filter(scheduled_job=job)
-        for item in actions:
-            if item.task_id:
-                AsyncResult(item.task_id).revoke(terminate=True)
-            item.status = 'pending'
-            item.task_id = None
-            item.save()
-            task = execute_scheduled_process_action.delay(item.id, None, action_performer.id)
-            item.task_id = task.id
-            item.save()
-        ActivityLogs.objects.create(
-            action_type='process_job_run',
-            action_track=job,
-            user=action_performer
-        )
-        job.status = 'completed'
-        job.run_time = now()
-        job.run_logs = {
-            "id": str(uuid.uuid4())[:8],
-            "run_datetime_utc": now().strftime("%Y-%m-%d %H:%M:%S"),
-        }
-        job.save()
+        run_scheduled_job_actions(job, action_performer)
         return True, f"Job {job.id} is being run again."
     else:
         return False, f"Job {job.id} has not completed yet or cannot be run again."
+
+
+def prune_scheduled_job_runs(limit=None):
+    """
+    Delete the run history of every job beyond its PROCESS_JOB_RUN_HISTORY_LIMIT latest runs
+    (0 keeps everything). Return the number of deleted runs.
+    """
+    limit = settings.PROCESS_JOB_RUN_HISTORY_LIMIT if limit is None else limit
+    if not limit:
+        return 0
+
+    expired_runs = ScheduledJobRun.objects.annotate(
+        rank=Window(RowNumber(), partition_by=F('scheduled_job_id'), order_by=F('id').desc())
+    ).filter(rank__gt=limit).values_list('id', flat=True)
+    deleted, _ = ScheduledJobRun.objects.filter(id__in=list(expired_runs)).delete()
+    return deleted
@@ -0,0 +1,74 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from processes.models import ActionRunStatistic
+
+
+def record_track_statistics(tracks):
+    """
+    Increment the daily ActionRunStatistic counters for written ScheduledActionTrack rows.
+    Only one UPDATE (or INSERT) runs per process, action type and day, whatever the number of tracks.
+    """
+    increments = Counter()
+    for track in tracks:
+        if track.action is None or track.status not in ['success', 'failed']:
+            continue
+        key = (track.action.process_id, track.action.action_type, timezone.localdate(track.created_at))
+        increments[key + (track.status,)] += 1
+
+    keys = {key[:3] for key in increments}
+    for process_id, action_type, day in keys:
+        increment_statistic(
+            process_id, action_type, day,
+            success=increments[(process_id, action_type, day, 'success')],
+            failure=increments[(process_id, action_type, day, 'failed')],
+        )
+
+
+def increment_statistic(process_id, action_type, day, success=0, failure=0):
+    lookup = {'process_id': process_id, 'action_type': action_type, 'day': day}
+    values = {'success_count': F('success_count') + success, 'failure_count': F('failure_count') + failure}
+    if ActionRunStatistic.objects.filter(**lookup).update(**values):
+        return
+    try:
+        with transaction.atomic():
+            ActionRunStatistic.objects.create(**lookup, success_count=success, failure_count=failure)
+    except IntegrityError:
+        # Another worker created the row in the meantime
+        ActionRunStatistic.objects.filter(**lookup).update(**values)
+
+
+def get_statistics(min_date=None, max_date=None, process_id=None, action_type=None):
+    """
+    Return the daily counters (one row per process, action type and day) and their totals.
+    Defaults to the last 30 days.
+    """
+    max_date = max_date or timezone.localdate()
+    min_date = min_date or max_date - timedelta(days=29)
+
+    queryset = ActionRunStatistic.objects.filter(day__gte=min_date, day__lte=max_date)
+    if process_id:
+        queryset = queryset.filter(process_id=process_id)
+    if action_type:
+        queryset = queryset.filter(action_type=action_type)
+
+    rows = list(queryset.values(
+        'day', 'process_id', 'action_type', 'success_count', 'failure_count', process_name=F('process__name')
+    ).order_by('-day', 'process_id', 'action_type'))
+    for row in rows:
+        add_rates(row)
+
+    totals = queryset.aggregate(success_count=Sum('success_count'), failure_count=Sum('failure_count'))
+    totals = add_rates({key: value or 0 for key, value in totals.items()})
+    return {'min_date': min_date, 'max_date': max_date, 'totals': totals, 'results': rows}
+
+
+def add_rates(row):
+    row['total'] = row['success_count'] + row['failure_count']
+    row['success_rate'] = row['success_count'] / row['total'] if row['total'] else 0.0
+    row['failure_rate'] = row['failure_count'] / row['total'] if row['total'] else 0.0
+    return row
@@ -0,0 +1,42 @@
+import atexit
+
+from celery.signals import task_postrun, worker_process_shutdown
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from processes.models import Process, ProcessAction
+from processes.services.activity_log_buffer import flush_activity_log_buffer, close_activity_log_buffer
+from processes.services.condition_service import invalidate_process_predicate
+from processes.services.process_registry import process_registry
+
+
+@receiver([post_save, post_delete], sender=Process)
+def invalidate_process_condition_cache(sender, instance, **kwargs):
+    invalidate_process_predicate(instance.id)
+
+
+def invalidate_registry():
+    process_registry.clear()
+    process_registry.bump_version()
+
+
+@receiver([post_save, post_delete], sender=Process)
+@receiver([post_save, post_delete], sender=ProcessAction)
+def invalidate_process_registry(sender, instance, **kwargs):
+    # Bumped once committed, otherwise other workers could cache the old rows under the new version
+    transaction.on_commit(invalidate_registry)
+
+
+@task_postrun.connect
+def flush_activity_logs_after_task(**kwargs):
+    flush_activity_log_buffer()
+
+
+@worker_process_shutdown.connect
+def flush_activity_logs_on_worker_shutdown(**kwargs):
+    close_activity_log_buffer()
+
+
+# Web workers (and celery solo pools) have no worker_process_shutdown signal
+atexit.register(close_activity_log_buffer)
@@ -1,12 +1,30 @@
+from datetime import timedelta
+from functools import reduce
+from itertools import groupby
+from operator import or_
+
 from celery import shared_task
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q
 from django.utils.timezone import now
 from loguru import logger
 Account = get_user_model()
 
 
+def is_stale_task(scheduled_action, generation, task_id):
+    """
+    A task is stale when the action was rescheduled, cancelled or re-run after it was published.
+    Tasks published before generations existed carry none and are matched on their task id instead.
+    """
+    if generation is None:
+        return scheduled_action.task_id != task_id
+    return scheduled_action.generation != generation
+
+
 @shared_task(bind=True)
-def execute_scheduled_process_action(self, scheduled_action_id, context=None, performer_id=None):
+def execute_scheduled_process_action(self, scheduled_action_id, context=None, performer_id=None, generation=None):
     from .models import ScheduledProcessAction
     from .services.process_actions_service import ProcessActionService
 
@@ -15,8 +33,12 @@ def execute_scheduled_process_action(self, scheduled_action_id, context=None, pe
     try:
         scheduled_action = ScheduledProcessAction.objects.get(id=scheduled_action_id)
 
-        if scheduled_action.status == 'completed':
-            logger.warning(f"Scheduled action {scheduled_action_id} is already completed.")
+        if scheduled_action.status in ['completed', 'cancelled']:
+            logger.warning(f"Scheduled action {scheduled_action_id} is already {scheduled_action.status}.")
+            return
+
+        if is_stale_task(scheduled_action, generation, self.request.id):
+            logger.info(f"Skipping stale task for scheduled action {scheduled_action_id}.")
             return
 
         if scheduled_action.scheduled_job.process.status == 'disabled':
@@ -27,10 +49,6 @@ def execute_scheduled_process_action(self, scheduled_action_id, context=None, pe
             logger.warning(f"Process action is already disabled.")
             return
 
-        # Update the task_id in the model
-        scheduled_action.task_id = self.request.id
-        scheduled_action.save()
-
         action_service = ProcessActionService()
         action_service.run_action(
             job=scheduled_action.scheduled_job,
@@ -42,14 +60,14 @@ def execute_scheduled_process_action(self, scheduled_action_id, context=None, pe
         # Mark as completed
         scheduled_action.status = 'completed'
         scheduled_action.last_run_time = now()
-        scheduled_action.save()
+        scheduled_action.save(update_fields=['status', 'last_run_time'])
 
         logger.success(f"Successfully executed scheduled action {scheduled_action_id}")
 
         if not ScheduledProcessAction.objects.filter(scheduled_job=scheduled_action.scheduled_job,
                                                      status='pending').exists():
             scheduled_action.scheduled_job.status = 'completed'
-            scheduled_action.scheduled_job.save()
+            scheduled_action.scheduled_job.save(update_fields=['status', 'updated_at'])
 
         return scheduled_action.process_action.action_type
 
@@ -61,10 +79,173 @@ def execute_scheduled_process_action(self, scheduled_action_id, context=None, pe
         # Update status to failed and log the error
         scheduled_action.status = 'failed'
         scheduled_action.error_message = str(e)
-        scheduled_action.save()
+        scheduled_action.save(update_fields=['status', 'error_message'])
         self.update_state(state='FAILURE', meta={"error": str(e)})
 
 
+@shared_task(bind=True)
+def execute_scheduled_process_actions(self, scheduled_actions, performer_id=None):
+    """
+    Batch variant of execute_scheduled_process_action taking [scheduled_action_id, generation] pairs.
+    All actions are loaded in one query and share one general settings snapshot, emails go through
+    the worker's pooled connection and status updates are written with bulk_update, skipping the
+    actions cancelled or rescheduled while the batch ran.
+    Only the pending actions still assigned to this task are run; they are stamped with started_at
+    first, so the dispatcher never hands them to another task.
+    """
+    from general_settings.services.general_settings_service import GeneralSettingsService
+    from .models import ScheduledJob, ScheduledProcessAction
+    from .services.process_actions_service import ProcessActionService
+
+    action_performer = Account.objects.filter(id=performer_id).first() if performer_id else None
+    generations = {scheduled_action_id: generation for scheduled_action_id, generation in scheduled_actions}
+    with transaction.atomic():
+        # Rows released by the dispatcher were given to another task and are skipped
+        claimed = list(
+            ScheduledProcessAction.objects.select_related('scheduled_job__process', 'process_action')
+            .select_for_update(of=('self',))
+            .filter(id__in=generations.keys(), task_id=self.request.id, status='pending', started_at__isnull=True)
+        )
+        ScheduledProcessAction.objects.filter(
+            id__in=[scheduled_action.id for scheduled_action in claimed]
+        ).update(started_at=now())
+
+    action_service = ProcessActionService(general_settings=GeneralSettingsService())
+
+    executed = []
+    for scheduled_action in claimed:
+        if is_stale_task(scheduled_action, generations.get(scheduled_action.id), self.request.id):
+            continue
+        if scheduled_action.scheduled_job.process.status == 'disabled':
+            continue
+        if scheduled_action.process_action.status == 'disabled':
+            continue
+
+        try:
+            action_service.run_action(
+                job=scheduled_action.scheduled_job,
+                action=scheduled_action.process_action,
+                context=scheduled_action.context,
+                action_performer=action_performer
+            )
+            scheduled_action.status = 'completed'
+            scheduled_action.last_run_time = now()
+        except Exception as e:
+            logger.exception(f"Error executing scheduled action {scheduled_action.id}: {e}")
+            scheduled_action.status = 'failed'
+            scheduled_action.error_message = str(e)
+            # Track the failure so it shows up in the job logs and statistics
+            action_service.set_log_action_result(
+                scheduled_action.scheduled_job, scheduled_action.process_action, 'failed', str(e)[:250]
+            )
+        executed.append(scheduled_action)
+
+    if executed:
+        with transaction.atomic():
+            # A cancel or reschedule committed while the batch ran wins over its results
+            unchanged = set(ScheduledProcessAction.objects.select_for_update().filter(
+                reduce(or_, (Q(id=scheduled_action.id, generation=scheduled_action.generation)
+                             for scheduled_action in executed)),
+                status='pending',
+            ).values_list('id', flat=True))
+            executed = [scheduled_action for scheduled_action in executed if scheduled_action.id in unchanged]
+            ScheduledProcessAction.objects.bulk_update(executed, ['status', 'last_run_time', 'error_message'])
+            # Complete the jobs that have no pending action left
+            ScheduledJob.objects.filter(
+                id__in={scheduled_action.scheduled_job_id for scheduled_action in executed}
+            ).exclude(status='cancelled').exclude(scheduledprocessaction__status='pending').update(
+                status='completed', updated_at=now()
+            )
+
+    completed = sum(1 for scheduled_action in executed if scheduled_action.status == 'completed')
+    logger.success(f"Executed {completed} of {len(generations)} scheduled actions "
+                   f"({len(executed) - completed} failed).")
+    return {'completed': completed, 'failed': len(executed) - completed}
+
+
+@shared_task
+def dispatch_due_process_actions():
+    """
+    Periodic task enqueueing the ScheduledProcessAction rows due before the next dispatch run.
+    Rows are claimed in batches with select_for_update(skip_locked=True), so concurrent dispatchers
+    never pick the same row, and only short ETAs (at most one dispatch interval) reach the broker.
+    Rows whose task has not started PROCESS_DISPATCH_CLAIM_TIMEOUT seconds after being published
+    (lost message) are released and dispatched again. Rows a task has started are never released,
+    so an action is not run twice when its worker is slow; a worker killed mid-batch leaves them pending.
+    """
+    from .models import ScheduledProcessAction
+    from .services.process_service import make_scheduled_action_batches, publish_scheduled_action_batches
+
+    current_time = now()
+    window_end = current_time + timedelta(seconds=settings.PROCESS_DISPATCH_INTERVAL)
+    batch_size = settings.PROCESS_DISPATCH_BATCH_SIZE
+    dispatched = 0
+
+    # A task showing up after all finds its rows assigned to another task and skips them
+    released = ScheduledProcessAction.objects.filter(
+        status='pending', task_id__isnull=False, started_at__isnull=True,
+        dispatched_at__lt=current_time - timedelta(seconds=settings.PROCESS_DISPATCH_CLAIM_TIMEOUT)
+    ).update(task_id=None, dispatched_at=None, generation=F('generation') + 1)
+    if released:
+        logger.warning(f"Released {released} scheduled process actions whose task did not start.")
+
+    while True:
+        with transaction.atomic():
+            due_actions = list(
+                ScheduledProcessAction.objects.select_for_update(skip_locked=True).filter(
+                    status='pending', task_id__isnull=True, run_time__lte=window_end
+                ).order_by('run_time')[:batch_size]
+            )
+            # Overdue actions, and future actions sharing a run time, are executed together by batch tasks
+            batches = []
+            for eta, group in groupby(
+                    due_actions,
+                    key=lambda scheduled_action: scheduled_action.run_time if scheduled_action.run_time > current_time
+                    else None):
+                batches += make_scheduled_action_batches(list(group), eta)
+            ScheduledProcessAction.objects.bulk_update(due_actions, ['task_id', 'dispatched_at'])
+
+        if not due_actions:
+            break
+
+        # Batches that could not be published are released for the next run
+        publish_scheduled_action_batches(batches)
+
+        dispatched += len(due_actions)
+        if len(due_actions) < batch_size:
+            break
+
+    if dispatched:
+        logger.info(f"Dispatched {dispatched} scheduled process actions.")
+    return dispatched
+
+
+@shared_task
+def run_bulk_job_action(operation_id, action_type, performer_id, ids=None, filters=None):
+    """
+    Apply a bulk cancel/run now/run again to a large set of scheduled jobs, chunk by chunk,
+    reporting progress in the cache (see processes.services.job_control_service).
+    """
+    from .services.job_control_service import run_bulk_action
+
+    return run_bulk_action(operation_id, action_type, performer_id, ids=ids, filters=filters)['updated']
+
+
+@shared_task
+def maintain_log_partitions():
+    """
+    Create the upcoming monthly partitions of the activity log tables, drop the
+    ones past PROCESS_LOG_RETENTION_MONTHS and trim the job run history to PROCESS_JOB_RUN_HISTORY_LIMIT.
+    """
+    from .services.partition_service import ensure_partitions, drop_expired_partitions
+    from .services.process_service import prune_scheduled_job_runs
+
+    created = ensure_partitions()
+    dropped = drop_expired_partitions()
+    pruned_runs = prune_scheduled_job_runs()
+    return {'created': created, 'dropped': dropped, 'pruned_runs': pruned_runs}
+
+
 # @shared_task
 # def execute_process_action(action_id, schedule_id, context=None):
 #     from .services.process_actions_service import ProcessActionService
@@ -1,3 +1,1217 @@
-from django.test import TestCase
+import json
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
+from django.utils.timezone import now
+from rest_framework import routers
+from rest_framework.test import APITestCase
+
+from processes.filters import ActivityLogsFilter, ScheduledJobFilter
+from processes.models import Process, ProcessAction, ScheduledJob, ScheduledActionTrack, ActivityLogs, \
+    ActionRunStatistic, ScheduledJobRun, ScheduledProcessAction
+
+from processes.services.condition_service import compile_conditions
+from processes.services.process_actions_service import (
+    DynamicTemplateEngine, ProcessActionService, compile_template
+)
+from processes.services.activity_log_buffer import ActivityLogBuffer, flush_activity_log_buffer, get_flush_metrics
+from processes.services.job_control_service import run_bulk_action
+from processes.services.partition_service import (
+    add_months, create_month_partition, drop_expired_partitions, ensure_partitions, get_month_partitions,
+    truncate_model
+)
+from processes.services.process_registry import process_registry
+from processes.services.process_service import ProcessService, cancel_scheduled_job, run_scheduled_job_again, \
+    trigger_processes_bulk, publish_scheduled_action_batches, prune_scheduled_job_runs
+from processes.viewsets import ActivityLogsViewSets
+from processes.tasks import execute_scheduled_process_action, execute_scheduled_process_actions, \
+    dispatch_due_process_actions
+from user_management.models import Account
+from utils.paginations import ApproximateCountPaginator
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# The activity log viewset is not routed by the API, the tests mount it next to the project URLs
+activity_logs_router = routers.SimpleRouter()
+activity_logs_router.register(r'activity-logs', ActivityLogsViewSets, basename='ActivityLogs')
+urlpatterns = [
+    path('api/v1/', include(activity_logs_router.urls)),
+    path('', include('backend.urls')),
+]
+
 
 # Create your tests here.
+class ConditionCompilerTestCase(SimpleTestCase):
+    conditions = [
+        {"target_props": "status", "comparison": "eq_in", "value": ["approved", "pending"]},
+        {"target_props": "agent", "comparison": "neq_in", "value": [3, 4]},
+        {"target_props": "status", "comparison": "changed", "value": []},
+        {"target_props": "session", "comparison": "was_equal", "value": [7]},
+    ]
+
+    def make_context(self, **overrides):
+        context = {
+            "status": "approved",
+            "agent": 1,
+            "status_changed": True,
+            "old_session": 7,
+        }
+        context.update(overrides)
+        return context
+
+    def assert_same_result(self, conditions, context):
+        with mock.patch.object(process_registry, 'get_processes', return_value=[]):
+            process_service = ProcessService(event_type='booking_updated')
+        interpreted = process_service.evaluate_conditions(conditions, context)
+        compiled = compile_conditions(conditions)(context)
+        self.assertEqual(compiled, interpreted)
+        return compiled
+
+    def test_all_conditions_met(self):
+        """
+        Test the compiled predicate matches when every condition is met.
+        """
+        self.assertTrue(self.assert_same_result(self.conditions, self.make_context()))
+
+    def test_condition_not_met(self):
+        """
+        Test the compiled predicate short-circuits on the first failing condition.
+        """
+        self.assertFalse(self.assert_same_result(self.conditions, self.make_context(agent=3)))
+        self.assertFalse(self.assert_same_result(self.conditions, self.make_context(status_changed=False)))
+
+    def test_equal_boolean_values(self):
+        """
+        Test the 'equal' comparison maps is_true/is_false values to booleans.
+        """
+        conditions = [{"target_props": "referrer", "comparison": "equal", "value": ["is_true"]}]
+        self.assertTrue(self.assert_same_result(conditions, {"referrer": True}))
+        self.assertFalse(self.assert_same_result(conditions, {"referrer": False}))
+
+    def test_empty_conditions(self):
+        """
+        Test an empty condition list evaluates to None like the interpreted version.
+        """
+        self.assertIsNone(self.assert_same_result([], self.make_context()))
+
+
+class DynamicTemplateEngineTestCase(SimpleTestCase):
+    def test_render_placeholders(self):
+        """
+        Test placeholders are replaced and unknown keys render as empty strings.
+        """
+        engine = DynamicTemplateEngine({'booking_id': 42, 'customer_first_name': 'Rakib'})
+        rendered = engine.render('<p>Hi {{customer_first_name}}, booking #{{booking_id}}{{unknown}}.</p>')
+        self.assertEqual(rendered, '<p>Hi Rakib, booking #42.</p>')
+
+    def test_tags_with_spaces_are_kept(self):
+        """
+        Test tags with spaces inside the braces are left as text, as they always were.
+        """
+        engine = DynamicTemplateEngine({'booking_id': 42})
+        self.assertEqual(engine.render('#{{ booking_id }} #{{booking_id}}'), '#{{ booking_id }} #42')
+        self.assertEqual(compile_template('{{ booking_id }}').variables, set())
+
+    def test_values_are_not_rendered_again(self):
+        """
+        Test a value that looks like a tag is inserted as is instead of being substituted in turn.
+        """
+        engine = DynamicTemplateEngine({'customer_notes': '{{booking_id}}', 'booking_id': 42})
+        self.assertEqual(engine.render('{{customer_notes}} / {{booking_id}}'), '{{booking_id}} / 42')
+
+    def test_render_without_placeholders(self):
+        """
+        Test templates without tags and empty templates are returned unchanged.
+        """
+        engine = DynamicTemplateEngine({})
+        self.assertEqual(engine.render('Plain text'), 'Plain text')
+        self.assertIsNone(engine.render(None))
+
+    def test_compiled_template_is_cached(self):
+        """
+        Test the same template text is parsed once and exposes its variables.
+        """
+        template = '{{start_date}} at {{start_time}}'
+        self.assertIs(compile_template(template), compile_template(template))
+        self.assertEqual(compile_template(template).variables, {'start_date', 'start_time'})
+
+
+class LazyModelDataTestCase(SimpleTestCase):
+    def test_only_referenced_variables_are_resolved(self):
+        """
+        Test model data only resolves the variables a template references, each at most once.
+        """
+        general_settings = mock.Mock()
+        general_settings.get_business_info.return_value = {'company_name': 'Acme'}
+        customer = mock.Mock(note='VIP')
+        customer.account.first_name = 'Rakib'
+
+        data = ProcessActionService(general_settings=general_settings).get_model_data(
+            customer=customer, context={'booking_id': 7}
+        )
+        rendered = DynamicTemplateEngine(data).render('{{customer_first_name}} {{customer_first_name}} #{{booking_id}}')
+
+        self.assertEqual(rendered, 'Rakib Rakib #7')
+        self.assertEqual(set(data.resolved()), {'customer_first_name', 'booking_id'})
+        customer.referrer_details.select_related.assert_not_called()
+        general_settings.get_datetime_formatter.assert_not_called()
+        general_settings.get_business_info.assert_not_called()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProcessRegistryTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        process_registry.clear()
+
+    def test_invalidated_on_commit(self):
+        """
+        Test a process created inside a transaction only invalidates the registry once committed.
+        """
+        self.assertEqual(process_registry.get_processes('booking_created'), [])
+        version = process_registry.get_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                process = Process.objects.create(name="Reminder", event_type='booking_created')
+                ProcessAction.objects.create(process=process, action_type='send_email')
+                # Other workers would still load the committed rows, so the version must not move yet
+                self.assertEqual(process_registry.get_version(), version)
+
+        processes = process_registry.get_processes('booking_created')
+        self.assertEqual([p.name for p in processes], ['Reminder'])
+        self.assertEqual(len(processes[0].active_actions), 1)
+
+    def test_cold_load_queries(self):
+        """
+        Test an uncached event type loads its processes and their actions in two queries, then none.
+        """
+        for name in ["Reminder", "Follow up"]:
+            process = Process.objects.create(name=name, event_type='booking_created')
+            ProcessAction.objects.create(process=process, action_type='send_email')
+        process_registry.get_version()
+
+        with self.assertNumQueries(2):
+            self.assertEqual(len(process_registry.get_processes('booking_created')), 2)
+        with self.assertNumQueries(0):
+            process_registry.get_processes('booking_created')
+
+    def test_cache_unavailable(self):
+        """
+        Test processes still load from the database while the cache is down and are not kept.
+        """
+        self.assertEqual(process_registry.get_processes('booking_created'), [])
+        Process.objects.create(name="Reminder", event_type='booking_created')
+
+        with mock.patch('processes.services.process_registry.cache') as broken_cache:
+            broken_cache.get.side_effect = ConnectionError('cache down')
+            broken_cache.incr.side_effect = ConnectionError('cache down')
+            process_registry.bump_version()
+            processes = process_registry.get_processes('booking_created')
+        self.assertEqual([p.name for p in processes], ['Reminder'])
+
+        # The version did not move while the cache was down, the worker must not reuse its old entries
+        Process.objects.create(name="Follow up", event_type='booking_created')
+        self.assertEqual(len(process_registry.get_processes('booking_created')), 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@mock.patch('processes.services.process_service.publish_scheduled_action_batches')
+class BulkScheduleJobsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.welcome = Process.objects.create(name="Welcome", event_type='customer_created', time_offset={})
+        cls.welcome_actions = [
+            ProcessAction.objects.create(process=cls.welcome, action_type=action_type)
+            for action_type in ['send_email', 'send_sms']
+        ]
+        ProcessAction.objects.create(process=cls.welcome, action_type='send_email', status='disabled')
+        cls.follow_up = Process.objects.create(name="Follow up", event_type='customer_created', time_offset={
+            'time_offset_value': 2, 'time_offset_unit': 'days', 'time_offset_after_before': 'after'
+        })
+        ProcessAction.objects.create(process=cls.follow_up, action_type='send_email')
+
+    def setUp(self):
+        cache.clear()
+        process_registry.clear()
+
+    @staticmethod
+    def make_events(customer_ids):
+        return [
+            {'event_type': 'customer_created', 'customer': mock.Mock(id=customer_id),
+             'context': {'customer_id': customer_id}}
+            for customer_id in customer_ids
+        ]
+
+    def test_new_and_existing_rows(self, publish):
+        """
+        Test existing jobs and actions are rescheduled, missing ones created, and only due actions published.
+        """
+        job = ScheduledJob.objects.create(process=self.welcome, object_id=1, run_time=now(), status='completed')
+        existing = ScheduledProcessAction.objects.create(
+            scheduled_job=job, process_action=self.welcome_actions[0], status='completed', task_id='old',
+            context={'customer_id': 0}
+        )
+
+        results = trigger_processes_bulk(self.make_events([1, 2]) + [{'event_type': 'booking_created'}])
+
+        self.assertEqual([result['event_type'] for result in results],
+                         ['customer_created', 'customer_created', 'booking_created'])
+        self.assertEqual([[job.process for job in result['scheduled_jobs']] for result in results],
+                         [[self.welcome, self.follow_up], [self.welcome, self.follow_up], []])
+        self.assertEqual(results[0]['scheduled_jobs'][0].id, job.id)
+        self.assertEqual(ScheduledJob.objects.count(), 4)
+        self.assertEqual(set(ScheduledJob.objects.values_list('status', flat=True)), {'scheduled'})
+        self.assertEqual(ScheduledJobRun.objects.count(), 4)
+
+        existing.refresh_from_db()
+        self.assertEqual((existing.status, existing.generation), ('pending', 1))
+        self.assertEqual(existing.context, {'customer_id': 1})
+        self.assertNotEqual(existing.task_id, 'old')
+
+        # Welcome actions are due and published, follow ups are left to the dispatcher
+        due = ScheduledProcessAction.objects.filter(scheduled_job__process=self.welcome)
+        self.assertEqual(due.count(), 4)
+        self.assertFalse(due.filter(task_id__isnull=True).exists())
+        future = ScheduledProcessAction.objects.filter(scheduled_job__process=self.follow_up)
+        self.assertEqual(future.count(), 2)
+        self.assertFalse(future.filter(task_id__isnull=False).exists())
+        self.assertFalse(future.filter(run_time__lte=now() + timedelta(days=1)).exists())
+
+        batches, = publish.call_args.args
+        self.assertEqual({scheduled_action.id for batch, eta in batches for scheduled_action in batch},
+                         set(due.values_list('id', flat=True)))
+        self.assertEqual({eta for batch, eta in batches}, {None})
+
+    def test_run_now(self, publish):
+        """
+        Test run_now makes future actions due right away.
+        """
+        trigger_processes_bulk([dict(event, run_now=True) for event in self.make_events([1])])
+        self.assertFalse(ScheduledProcessAction.objects.filter(task_id__isnull=True).exists())
+        self.assertEqual(sum(len(batch) for batch, eta in publish.call_args.args[0]), 3)
+
+    def test_query_count_is_constant(self, publish):
+        """
+        Test the number of queries does not grow with the number of events, processes or actions.
+        """
+        # Loads the process registry
+        trigger_processes_bulk(self.make_events([1]))
+        # jobs (select, create, update), runs, actions (select, create, update) and the savepoint
+        with self.assertNumQueries(9):
+            trigger_processes_bulk(self.make_events(range(1, 6)))
+        with self.assertNumQueries(9):
+            trigger_processes_bulk(self.make_events(range(1, 21)))
+
+    def test_single_event_reschedules_in_batch(self, publish):
+        """
+        Test running the processes of one event schedules every matched process in a constant number
+        of queries and reuses the existing jobs and actions when the event happens again.
+        """
+        service = ProcessService('customer_created', customer=mock.Mock(id=1), context={'customer_id': 1})
+        jobs = service.run_process()
+        self.assertEqual([job.process for job in jobs], [self.welcome, self.follow_up])
+        self.assertEqual(ScheduledProcessAction.objects.count(), 3)
+
+        service = ProcessService('customer_created', customer=mock.Mock(id=1), context={'customer_id': 1})
+        # jobs (select, update), runs, actions (select, update) and the savepoint; nothing left to create
+        with self.assertNumQueries(7):
+            rescheduled = service.run_process()
+        self.assertEqual([job.id for job in rescheduled], [job.id for job in jobs])
+        self.assertEqual(ScheduledProcessAction.objects.count(), 3)
+        self.assertEqual(set(ScheduledProcessAction.objects.values_list('generation', flat=True)), {1})
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ScheduledJobListTestCase(APITestCase):
+    url = '/api/v1/scheduled-jobs/paginated-scheduled-job-list/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Account.objects.create_user(email="admin@example.com", password="strongpassword123",
+                                               is_staff=True, is_superuser=True)
+        for index in range(3):
+            process = Process.objects.create(name=f"Process {index}", event_type='booking_created')
+            actions = [
+                ProcessAction.objects.create(process=process, action_type='send_email'),
+                ProcessAction.objects.create(process=process, action_type='send_sms'),
+            ]
+            for object_id in range(10):
+                job = ScheduledJob.objects.create(process=process, object_id=object_id,
+                                                  run_time=now() + timedelta(hours=1))
+                for action in actions:
+                    ScheduledActionTrack.objects.create(action=action, schedule=job, status='success', message='Done')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def get_query_count(self, page_size):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'page_size': page_size})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), page_size)
+        return len(queries)
+
+    def test_query_count_is_constant(self):
+        """
+        Test the scheduled job list runs the same number of queries whatever the page size.
+        """
+        self.assertEqual(self.get_query_count(1), self.get_query_count(30))
+        # count, page, process actions, action tracks
+        with self.assertNumQueries(4):
+            self.client.get(self.url, {'page_size': 30})
+
+    def test_list_payload(self):
+        """
+        Test prefetched relations are serialized like before.
+        """
+        response = self.client.get(self.url, {'page_size': 1})
+        job = response.data['results'][0]
+        self.assertEqual([action['action_type'] for action in job['actions']], ['Send Email', 'Send SMS'])
+        self.assertEqual(len(job['run_action__logs']), 2)
+        self.assertEqual(set(job['run_action__logs'][0]), {'status', 'message', 'updated_at'})
+
+    def test_cursor_pagination(self):
+        """
+        Test walking the list with cursors returns every job once, in (created_at, id) order, both ways.
+        """
+        expected = list(ScheduledJob.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        seen, pages = [], []
+        response = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 7})
+        while True:
+            self.assertNotIn('count', response.data)
+            pages.append([job['id'] for job in response.data['results']])
+            seen.extend(pages[-1])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(seen, expected)
+
+        previous = self.client.get(response.data['previous'])
+        self.assertEqual([job['id'] for job in previous.data['results']], pages[-2])
+
+    def test_invalid_cursor(self):
+        """
+        Test a malformed cursor is rejected.
+        """
+        response = self.client.get(self.url, {'pagination': 'cursor', 'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_approximate_count(self):
+        """
+        Test the approximate count falls back to an exact count on small tables.
+        """
+        response = self.client.get(self.url, {'count': 'approximate', 'status': 'scheduled'})
+        self.assertEqual(response.data['count'], 30)
+
+
+@override_settings(ROOT_URLCONF='processes.tests')
+class ActivityLogsListTestCase(APITestCase):
+    url = '/api/v1/activity-logs/paginated-activity-logs-list/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Account.objects.create_user(email="admin@example.com", password="strongpassword123",
+                                               is_staff=True, is_superuser=True)
+        for index in range(3):
+            performer = Account.objects.create_user(email=f"user{index}@example.com", password="strongpassword123")
+            process = Process.objects.create(name=f"Process {index}", event_type='booking_created')
+            actions = [
+                ProcessAction.objects.create(process=process, action_type='send_email'),
+                ProcessAction.objects.create(process=process, action_type='send_sms'),
+            ]
+            for object_id in range(5):
+                job = ScheduledJob.objects.create(process=process, object_id=object_id, run_time=now())
+                for action in actions:
+                    ScheduledActionTrack.objects.create(action=action, schedule=job, status='success', message='Done')
+                ActivityLogs.objects.create(action_type='process_job_run', action_track=job, user=performer)
+                ActivityLogs.objects.create(action_type='process_job_cancelled', action_track=job, user=performer)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def get_query_count(self, page_size):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'page_size': page_size})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), page_size)
+        return len(queries)
+
+    def test_query_count_is_constant(self):
+        """
+        Test the activity log list runs the same number of queries whatever the page size.
+        """
+        self.assertEqual(self.get_query_count(1), self.get_query_count(30))
+        # count, page (with users, jobs, processes and latest runs), process actions, action tracks
+        with self.assertNumQueries(4):
+            self.client.get(self.url, {'page_size': 30})
+
+    def test_list_payload(self):
+        """
+        Test prefetched relations are serialized like before.
+        """
+        response = self.client.get(self.url, {'page_size': 1})
+        log = response.data['results'][0]
+        self.assertEqual(log['user']['email'], 'user2@example.com')
+        self.assertEqual([action['action_type'] for action in log['actions']], ['Send Email', 'Send SMS'])
+        self.assertEqual(len(log['run_action__logs']), 2)
+        self.assertEqual(set(log['run_action__logs'][0]), {'status', 'message', 'updated_at'})
+
+    @mock.patch('utils.paginations.APPROXIMATE_COUNT_THRESHOLD', 10)
+    def test_approximate_count_of_partitioned_table(self):
+        """
+        Test the approximate count of the partitioned table sums the estimates of its partitions.
+        """
+        # Autovacuum only analyzes the partitions, never the partitioned parent
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT relid::regclass::text FROM pg_partition_tree(%s::regclass) WHERE isleaf",
+                           [ActivityLogs._meta.db_table])
+            for partition, in cursor.fetchall():
+                cursor.execute(f'ANALYZE "{partition}"')
+
+        self.assertEqual(ApproximateCountPaginator.get_estimate(ActivityLogs.objects.all(), connection), 30)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'count': 'approximate'})
+        self.assertEqual(response.data['count'], 30)
+        self.assertFalse([query for query in queries if 'COUNT(*)' in query['sql']])
+
+
+class FilterIndexTestCase(TestCase):
+    def get_plan(self, filterset_class, data):
+        queryset = filterset_class(data, queryset=filterset_class.Meta.model.objects.all()).qs
+        with connection.cursor() as cursor:
+            # The test tables are tiny, so make the planner show which index it can use (bitmap scans
+            # work for the trigram index as well, a full scan of the primary key index would not)
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_indexscan = off')
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN {sql}', params)
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+    def test_scheduled_job_filters(self):
+        """
+        Test the scheduled job filters are served by their indexes.
+        """
+        self.assertIn('processes_process_event_type', self.get_plan(ScheduledJobFilter, {'event_type': 'booking_created'}))
+        self.assertIn('sched_job_status_idx', self.get_plan(ScheduledJobFilter, {'status': 'completed'}))
+        self.assertIn('sched_job_object_idx', self.get_plan(ScheduledJobFilter, {'object_id': 1}))
+        self.assertIn('sched_job_run_time_idx', self.get_plan(ScheduledJobFilter, {'min_date': '2026-01-01T00:00'}))
+
+    def test_activity_log_filters(self):
+        """
+        Test the activity log filters are served by their indexes, including the email substring search.
+        """
+        # Each partition has its own copy of activity_log_action_idx
+        self.assertIn('_action_type_created_at_id_idx', self.get_plan(ActivityLogsFilter, {'action_type': 'email_sent'}))
+        self.assertIn('account_email_trgm_idx', self.get_plan(ActivityLogsFilter, {'email': 'example'}))
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ROOT_URLCONF='processes.tests')
+class ScheduledJobRunHistoryTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Account.objects.create_user(email="admin@example.com", password="strongpassword123",
+                                               is_staff=True, is_superuser=True)
+        process = Process.objects.create(name="Reminder", event_type='booking_created')
+        ProcessAction.objects.create(process=process, action_type='send_email')
+        cls.job = ScheduledJob.objects.create(process=process, object_id=1, run_time=now(), status='completed')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    @mock.patch('processes.services.process_service.publish_scheduled_action_batches')
+    def test_runs_are_appended(self, publish):
+        """
+        Test every run adds a history row and the lists only show the latest one.
+        """
+        for _ in range(3):
+            run_scheduled_job_again(self.job, self.user)
+        runs = list(ScheduledJobRun.objects.filter(scheduled_job=self.job).order_by('-id'))
+        self.assertEqual(len(runs), 3)
+
+        response = self.client.get('/api/v1/scheduled-jobs/paginated-scheduled-job-list/')
+        self.assertEqual(response.data['results'][0]['run_logs'], runs[0].as_log())
+        response = self.client.get('/api/v1/activity-logs/paginated-activity-logs-list/')
+        self.assertEqual(response.data['results'][0]['run_logs'], runs[0].as_log())
+
+        response = self.client.get(f'/api/v1/scheduled-jobs/{self.job.id}/run-history/', {'page_size': 2})
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual([run['run_id'] for run in response.data['results']], [run.run_id for run in runs[:2]])
+
+    def test_job_without_runs(self):
+        """
+        Test a job that never ran has an empty run log, like the former run_logs default.
+        """
+        response = self.client.get('/api/v1/scheduled-jobs/paginated-scheduled-job-list/')
+        self.assertEqual(response.data['results'][0]['run_logs'], [])
+
+    def test_history_is_pruned(self):
+        """
+        Test maintenance keeps only the latest runs of each job.
+        """
+        other_job = ScheduledJob.objects.create(process=self.job.process, object_id=2, run_time=now())
+        for job in [self.job, other_job]:
+            ScheduledJobRun.objects.bulk_create([ScheduledJobRun.for_job(job, now()) for _ in range(4)])
+        latest_runs = list(ScheduledJobRun.objects.filter(scheduled_job=self.job).order_by('-id')[:2])
+
+        self.assertEqual(prune_scheduled_job_runs(limit=2), 4)
+        self.assertEqual(list(ScheduledJobRun.objects.filter(scheduled_job=self.job).order_by('-id')), latest_runs)
+        self.assertEqual(ScheduledJobRun.objects.filter(scheduled_job=other_job).count(), 2)
+        self.assertEqual(prune_scheduled_job_runs(limit=0), 0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ScheduledJobTransitionTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Account.objects.create_user(email="admin@example.com", password="strongpassword123")
+        process = Process.objects.create(name="Reminder", event_type='booking_created')
+        cls.job = ScheduledJob.objects.create(process=process, object_id=1, run_time=now(), status='completed')
+        for action_type in ['send_email', 'send_sms', 'send_email']:
+            ScheduledProcessAction.objects.create(
+                scheduled_job=cls.job, process_action=ProcessAction.objects.create(process=process,
+                                                                                  action_type=action_type),
+                status='completed', context={'booking_id': 1}
+            )
+
+    @staticmethod
+    def get_updates(queries, model):
+        return [query['sql'] for query in queries
+                if query['sql'].startswith(f'UPDATE "{model._meta.db_table}"')]
+
+    def test_cancel(self):
+        """
+        Test cancelling a job updates all its actions in one statement and only the job status columns.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            cancel_scheduled_job(self.job, self.user)
+
+        action_updates = self.get_updates(queries, ScheduledProcessAction)
+        self.assertEqual(len(action_updates), 1)
+        self.assertIn('"generation" = ("processes_scheduledprocessaction"."generation" + 1)', action_updates[0])
+        job_updates = self.get_updates(queries, ScheduledJob)
+        self.assertEqual(len(job_updates), 1)
+        self.assertIn('"status" = ', job_updates[0])
+        self.assertNotIn('"run_time"', job_updates[0])
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(
+            set(ScheduledProcessAction.objects.values_list('status', 'generation')), {('cancelled', 1)}
+        )
+
+    @mock.patch('processes.services.process_service.publish_scheduled_action_batches')
+    def test_run_again(self, publish):
+        """
+        Test re-running a job resets its actions with one UPDATE that leaves their context alone.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            run_scheduled_job_again(self.job, self.user)
+
+        action_updates = self.get_updates(queries, ScheduledProcessAction)
+        self.assertEqual(len(action_updates), 1)
+        self.assertNotIn('"context"', action_updates[0])
+        job_updates = self.get_updates(queries, ScheduledJob)
+        self.assertEqual(len(job_updates), 1)
+        self.assertNotIn('"object_id"', job_updates[0])
+        # actions, action update, activity log, job update, run
+        self.assertEqual(len(queries), 5)
+        self.assertEqual(
+            set(ScheduledProcessAction.objects.values_list('status', 'generation')), {('pending', 1)}
+        )
+        publish.assert_called_once()
+
+    @mock.patch('processes.services.process_actions_service.ProcessActionService.run_action')
+    def test_execute_action(self, run_action):
+        """
+        Test executing an action only writes its status and run time, then the job status.
+        """
+        ScheduledProcessAction.objects.update(status='pending')
+        ScheduledProcessAction.objects.exclude(pk=ScheduledProcessAction.objects.first().pk).update(
+            status='completed'
+        )
+        scheduled_action = ScheduledProcessAction.objects.get(status='pending')
+
+        with CaptureQueriesContext(connection) as queries:
+            execute_scheduled_process_action.apply(args=[scheduled_action.id], kwargs={'generation': 0})
+
+        action_updates = self.get_updates(queries, ScheduledProcessAction)
+        self.assertEqual(len(action_updates), 1)
+        self.assertIn('"status" = ', action_updates[0])
+        self.assertIn('"last_run_time" = ', action_updates[0])
+        self.assertNotIn('"context"', action_updates[0])
+        job_updates = self.get_updates(queries, ScheduledJob)
+        self.assertEqual(len(job_updates), 1)
+        self.assertNotIn('"run_time"', job_updates[0])
+        run_action.assert_called_once()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@mock.patch('processes.services.process_actions_service.ProcessActionService.run_action')
+class StaleTaskTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.process = Process.objects.create(name="Reminder", event_type='booking_created', time_offset={})
+        ProcessAction.objects.create(process=cls.process, action_type='send_email')
+
+    def setUp(self):
+        cache.clear()
+        process_registry.clear()
+
+    def test_old_generation_is_skipped(self, run_action):
+        """
+        Test a task published for an older generation of the action does nothing.
+        """
+        scheduled_action, = create_scheduled_actions([now()], generation=2)
+        execute_scheduled_process_action.apply(args=[scheduled_action.id], kwargs={'generation': 1})
+        run_action.assert_not_called()
+        scheduled_action.refresh_from_db()
+        self.assertEqual(scheduled_action.status, 'pending')
+
+        execute_scheduled_process_action.apply(args=[scheduled_action.id], kwargs={'generation': 2})
+        run_action.assert_called_once()
+
+    def test_legacy_task_matches_task_id(self, run_action):
+        """
+        Test a task published without a generation only runs when its id is the stored task id.
+        """
+        scheduled_action, = create_scheduled_actions([now()], task_id='current')
+        execute_scheduled_process_action.apply(args=[scheduled_action.id], task_id='revoked')
+        run_action.assert_not_called()
+
+        execute_scheduled_process_action.apply(args=[scheduled_action.id], task_id='current')
+        run_action.assert_called_once()
+
+    @mock.patch('processes.services.process_service.publish_scheduled_action_batches')
+    def test_rescheduled_job_runs_new_generation(self, publish, run_action):
+        """
+        Test rescheduling a job turns the tasks already published into no-ops.
+        """
+        event = {'event_type': 'booking_created', 'booking': mock.Mock(id=1), 'context': {'booking_id': 1}}
+        trigger_processes_bulk([event])
+        trigger_processes_bulk([event])
+        (old_batches,), (new_batches,) = [call.args for call in publish.call_args_list]
+
+        for batch, _ in old_batches + new_batches:
+            execute_scheduled_process_actions.apply(
+                args=[[[scheduled_action.id, scheduled_action.generation] for scheduled_action in batch]],
+                task_id=batch[0].task_id,
+            )
+        run_action.assert_called_once()
+        self.assertEqual(ScheduledProcessAction.objects.get().status, 'completed')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ExecuteScheduledActionsBatchTestCase(TestCase):
+    task_id = 'batch-task'
+
+    @classmethod
+    def setUpTestData(cls):
+        process = Process.objects.create(name="Reminder", event_type='booking_created')
+        email, sms, failing = [ProcessAction.objects.create(process=process, action_type=action_type)
+                               for action_type in ['send_email', 'send_sms', 'trigger_webhook']]
+        cls.job, cls.other_job = [
+            ScheduledJob.objects.create(process=process, object_id=object_id, run_time=now())
+            for object_id in [1, 2]
+        ]
+
+        def create(job, process_action, status='pending'):
+            return ScheduledProcessAction.objects.create(scheduled_job=job, process_action=process_action,
+                                                         status=status, context={'booking_id': job.object_id},
+                                                         task_id=cls.task_id)
+
+        cls.completed = create(cls.job, email)
+        cls.failing = create(cls.job, failing)
+        cls.done = create(cls.job, sms, status='completed')
+        cls.other_completed = create(cls.other_job, email)
+        cls.other_pending = create(cls.other_job, sms)
+
+    def setUp(self):
+        cache.clear()
+
+    def run_batch(self, scheduled_actions):
+        return execute_scheduled_process_actions.apply(
+            args=[[[scheduled_action.id, scheduled_action.generation] for scheduled_action in scheduled_actions]],
+            task_id=self.task_id,
+        ).result
+
+    @mock.patch('general_settings.services.general_settings_service.GeneralSettingsService')
+    @mock.patch('processes.services.process_actions_service.ProcessActionService.run_action', autospec=True)
+    def test_batch_execution(self, run_action, settings_service):
+        """
+        Test a batch runs its actions with one service, records failures and completes finished jobs.
+        """
+        def fail_webhook(action_service, job, action, context, action_performer):
+            if action.action_type == 'trigger_webhook':
+                raise RuntimeError('Webhook down')
+        run_action.side_effect = fail_webhook
+
+        with CaptureQueriesContext(connection) as queries:
+            result = self.run_batch([self.completed, self.failing, self.done, self.other_completed])
+        flush_activity_log_buffer()
+
+        self.assertEqual(result, {'completed': 2, 'failed': 1})
+        self.assertEqual(run_action.call_count, 3)
+        # One settings snapshot and action service shared by the whole batch
+        settings_service.assert_called_once_with()
+        self.assertEqual(len({call.args[0] for call in run_action.call_args_list}), 1)
+        self.assertEqual([call.kwargs['context'] for call in run_action.call_args_list],
+                         [{'booking_id': 1}, {'booking_id': 1}, {'booking_id': 2}])
+
+        table = ScheduledProcessAction._meta.db_table
+        # claim and result locks
+        self.assertEqual(len([query for query in queries if query['sql'].startswith(f'SELECT "{table}"')]), 2)
+        # started_at stamp and statuses
+        self.assertEqual(len([query for query in queries if query['sql'].startswith(f'UPDATE "{table}"')]), 2)
+
+        statuses = dict(ScheduledProcessAction.objects.values_list('id', 'status'))
+        self.assertEqual(statuses, {
+            self.completed.id: 'completed', self.failing.id: 'failed', self.done.id: 'completed',
+            self.other_completed.id: 'completed', self.other_pending.id: 'pending',
+        })
+        self.assertEqual(ScheduledProcessAction.objects.get(id=self.failing.id).error_message, 'Webhook down')
+
+        # The job without pending actions is completed, the other one keeps waiting
+        self.assertEqual(ScheduledJob.objects.get(id=self.job.id).status, 'completed')
+        self.assertEqual(ScheduledJob.objects.get(id=self.other_job.id).status, 'scheduled')
+
+        failed_track = ScheduledActionTrack.objects.get(status='failed')
+        self.assertEqual((failed_track.schedule_id, failed_track.action_id, failed_track.message),
+                         (self.job.id, self.failing.process_action_id, 'Webhook down'))
+
+    @mock.patch('processes.services.process_actions_service.ProcessActionService.run_action')
+    def test_concurrent_cancel(self, run_action):
+        """
+        Test a job cancelled while its batch runs stays cancelled, with its actions.
+        """
+        user = Account.objects.create_user(email="admin@example.com", password="strongpassword123")
+        run_action.side_effect = lambda **kwargs: cancel_scheduled_job(self.job, user)
+
+        result = self.run_batch([self.completed, self.failing])
+        self.assertEqual(result, {'completed': 0, 'failed': 0})
+        self.assertEqual(
+            set(ScheduledProcessAction.objects.filter(scheduled_job=self.job).values_list('status', flat=True)),
+            {'cancelled'}
+        )
+        self.assertEqual(ScheduledJob.objects.get(id=self.job.id).status, 'cancelled')
+
+    @mock.patch('processes.services.process_actions_service.ProcessActionService.run_action')
+    def test_query_count_is_constant(self, run_action):
+        """
+        Test the number of queries does not grow with the size of the batch.
+        """
+        # Loads the general settings snapshot
+        self.run_batch([])
+        with CaptureQueriesContext(connection) as single:
+            self.run_batch([self.completed])
+        ScheduledProcessAction.objects.update(status='pending', started_at=None)
+        with CaptureQueriesContext(connection) as several:
+            self.run_batch([self.completed, self.failing, self.other_completed, self.other_pending])
+        self.assertEqual(len(several), len(single))
+        self.assertEqual(run_action.call_count, 5)
+
+
+def create_scheduled_actions(run_times, **kwargs):
+    process = Process.objects.create(name="Reminder", event_type='booking_created')
+    process_action = ProcessAction.objects.create(process=process, action_type='send_email')
+    job = ScheduledJob.objects.create(process=process, object_id=1, run_time=now())
+    return [
+        ScheduledProcessAction.objects.create(scheduled_job=job, process_action=process_action, run_time=run_time,
+                                              **kwargs)
+        for run_time in run_times
+    ]
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PROCESS_DISPATCH_INTERVAL=60)
+@mock.patch('processes.services.process_service.publish_scheduled_action_batches')
+class DispatchDueProcessActionsTestCase(TestCase):
+    def setUp(self):
+        current_time = now()
+        self.soon = current_time + timedelta(seconds=30)
+        self.overdue = create_scheduled_actions([current_time - timedelta(hours=1), current_time])
+        self.upcoming = create_scheduled_actions([self.soon, self.soon])
+        self.later = create_scheduled_actions([current_time + timedelta(hours=1)])
+        self.claimed = create_scheduled_actions([current_time], task_id='published')
+
+    @staticmethod
+    def get_task_ids(scheduled_actions):
+        return [ScheduledProcessAction.objects.get(id=scheduled_action.id).task_id
+                for scheduled_action in scheduled_actions]
+
+    def test_dispatch_window(self, publish):
+        """
+        Test overdue actions run right away, upcoming ones get their run time as eta and later ones wait.
+        """
+        self.assertEqual(dispatch_due_process_actions(), 4)
+
+        batches, = publish.call_args.args
+        self.assertEqual(
+            [(sorted(scheduled_action.id for scheduled_action in batch), eta) for batch, eta in batches],
+            [(sorted(scheduled_action.id for scheduled_action in self.overdue), None),
+             (sorted(scheduled_action.id for scheduled_action in self.upcoming), self.soon)]
+        )
+        # Every action of a batch is claimed with the id of the task running it
+        for batch, _ in batches:
+            self.assertEqual(set(self.get_task_ids(batch)), {batch[0].task_id})
+        self.assertEqual(self.get_task_ids(self.later), [None])
+        self.assertEqual(self.get_task_ids(self.claimed), ['published'])
+
+        # Claimed rows are not dispatched again
+        publish.reset_mock()
+        self.assertEqual(dispatch_due_process_actions(), 0)
+        publish.assert_not_called()
+
+    @override_settings(PROCESS_DISPATCH_BATCH_SIZE=3)
+    def test_claims_in_batches(self, publish):
+        """
+        Test due actions are claimed PROCESS_DISPATCH_BATCH_SIZE rows per transaction.
+        """
+        self.assertEqual(dispatch_due_process_actions(), 4)
+        self.assertEqual(publish.call_count, 2)
+
+    @mock.patch.object(execute_scheduled_process_actions.app, 'producer_or_acquire')
+    @mock.patch.object(execute_scheduled_process_actions, 'apply_async', side_effect=[None, ConnectionError])
+    def test_release_on_publish_failure(self, apply_async, producer, publish):
+        """
+        Test only the batches that could not be published are released, with a new generation.
+        """
+        publish.side_effect = publish_scheduled_action_batches
+        with self.assertRaises(ConnectionError):
+            dispatch_due_process_actions()
+        self.assertEqual(apply_async.call_count, 2)
+
+        published_task_id = apply_async.call_args_list[0].kwargs['task_id']
+        self.assertEqual(self.get_task_ids(self.overdue), [published_task_id] * 2)
+        self.assertEqual(self.get_task_ids(self.upcoming), [None] * 2)
+        self.assertEqual(
+            set(ScheduledProcessAction.objects.filter(id__in=[a.id for a in self.overdue + self.upcoming])
+                .values_list('task_id', 'generation')),
+            {(published_task_id, 0), (None, 1)}
+        )
+
+        # The next run only dispatches the released batch
+        publish.side_effect = None
+        self.assertEqual(dispatch_due_process_actions(), 2)
+
+    @override_settings(PROCESS_DISPATCH_CLAIM_TIMEOUT=600)
+    def test_lost_tasks_are_released(self, publish):
+        """
+        Test actions still pending long after their task was published are dispatched again.
+        """
+        lost, recent = create_scheduled_actions([now(), now()], task_id='lost')
+        ScheduledProcessAction.objects.filter(id=lost.id).update(dispatched_at=now() - timedelta(minutes=11))
+        ScheduledProcessAction.objects.filter(id=recent.id).update(dispatched_at=now() - timedelta(minutes=9))
+
+        self.assertEqual(dispatch_due_process_actions(), 5)
+        lost.refresh_from_db()
+        self.assertNotIn(lost.task_id, [None, 'lost'])
+        self.assertEqual(lost.generation, 1)
+        self.assertEqual(self.get_task_ids([recent]), ['lost'])
+
+    @mock.patch('processes.services.process_actions_service.ProcessActionService.run_action')
+    def test_late_task_runs_once(self, run_action, publish):
+        """
+        Test a task starting after its actions were released skips them, so they only run once.
+        """
+        queued, = create_scheduled_actions([now()], task_id='queued')
+        ScheduledProcessAction.objects.filter(id=queued.id).update(dispatched_at=now() - timedelta(hours=2))
+
+        dispatch_due_process_actions()
+        released, = [scheduled_action for batch, _ in publish.call_args.args[0] for scheduled_action in batch
+                     if scheduled_action.id == queued.id]
+
+        # The first task finally starts, then the task it was replaced with
+        execute_scheduled_process_actions.apply(args=[[[queued.id, queued.generation]]], task_id='queued')
+        run_action.assert_not_called()
+        execute_scheduled_process_actions.apply(args=[[[queued.id, released.generation]]],
+                                                task_id=released.task_id)
+        run_action.assert_called_once()
+        self.assertEqual(ScheduledProcessAction.objects.get(id=queued.id).status, 'completed')
+
+    @mock.patch('processes.services.process_actions_service.ProcessActionService.run_action')
+    def test_started_task_is_not_released(self, run_action, publish):
+        """
+        Test actions of a task still running past the claim timeout are not dispatched again.
+        """
+        slow, = create_scheduled_actions([now()], task_id='slow')
+        ScheduledProcessAction.objects.filter(id=slow.id).update(dispatched_at=now() - timedelta(hours=2))
+        # The dispatcher runs while the slow task is still executing the action
+        run_action.side_effect = lambda **kwargs: dispatch_due_process_actions()
+
+        execute_scheduled_process_actions.apply(args=[[[slow.id, slow.generation]]], task_id='slow')
+        dispatched = [scheduled_action.id for batch, _ in publish.call_args.args[0] for scheduled_action in batch]
+        self.assertNotIn(slow.id, dispatched)
+        run_action.assert_called_once()
+        slow.refresh_from_db()
+        self.assertEqual((slow.status, slow.task_id, slow.generation), ('completed', 'slow', 0))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DispatchSkipLockedTestCase(TransactionTestCase):
+    @mock.patch('processes.services.process_service.publish_scheduled_action_batches')
+    def test_locked_rows_are_skipped(self, publish):
+        """
+        Test rows locked by a concurrent dispatcher are skipped instead of waited for.
+        """
+        locked, free = create_scheduled_actions([now(), now()])
+        row_locked = threading.Event()
+        release = threading.Event()
+
+        def lock_row():
+            with transaction.atomic():
+                ScheduledProcessAction.objects.select_for_update().get(id=locked.id)
+                row_locked.set()
+                release.wait(10)
+            connection.close()
+
+        locker = threading.Thread(target=lock_row)
+        locker.start()
+        try:
+            row_locked.wait(10)
+            self.assertEqual(dispatch_due_process_actions(), 1)
+        finally:
+            release.set()
+            locker.join()
+
+        batches, = publish.call_args.args
+        self.assertEqual([scheduled_action.id for batch, _ in batches for scheduled_action in batch], [free.id])
+        self.assertIsNone(ScheduledProcessAction.objects.get(id=locked.id).task_id)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class BulkJobActionTestCase(APITestCase):
+    url = '/api/v1/scheduled-jobs/bulk-action/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Account.objects.create_user(email="admin@example.com", password="strongpassword123",
+                                               is_staff=True, is_superuser=True)
+        cls.processes = [Process.objects.create(name=f"Process {index}", event_type='booking_created')
+                         for index in range(2)]
+        for process in cls.processes:
+            action = ProcessAction.objects.create(process=process, action_type='send_email')
+            for object_id in range(5):
+                job = ScheduledJob.objects.create(process=process, object_id=object_id, run_time=now(),
+                                                  status='scheduled' if object_id else 'completed')
+                ScheduledProcessAction.objects.create(scheduled_job=job, process_action=action)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_cancel_by_filter(self):
+        """
+        Test cancelling the jobs of one process with the list filters.
+        """
+        process = self.processes[0]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'action_type': 'cancel', 'filters': {'process_id': process.id}},
+                                        format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['status'], response.data['total'], response.data['updated']),
+                         ('completed', 5, 5))
+        self.assertEqual(len([query for query in queries
+                              if query['sql'].startswith('UPDATE "processes_scheduledprocessaction"')]), 1)
+
+        self.assertEqual(set(ScheduledJob.objects.filter(process=process).values_list('status', flat=True)),
+                         {'cancelled'})
+        self.assertFalse(ScheduledJob.objects.exclude(process=process).filter(status='cancelled').exists())
+        self.assertEqual(
+            set(ScheduledProcessAction.objects.filter(scheduled_job__process=process)
+                .values_list('status', 'generation')), {('cancelled', 1)}
+        )
+        self.assertEqual(ActivityLogs.objects.filter(action_type='process_job_cancelled').count(), 5)
+
+        status_response = self.client.get(f"{self.url}{response.data['operation_id']}/")
+        self.assertEqual(status_response.data['updated'], 5)
+
+    @override_settings(PROCESS_BULK_ACTION_CHUNK_SIZE=3)
+    @mock.patch('processes.services.job_control_service.publish_scheduled_action_batches')
+    @mock.patch('processes.services.job_control_service.run_bulk_job_action')
+    def test_run_now_in_task(self, task, publish):
+        """
+        Test large sets are handed to a task that runs the jobs chunk by chunk and reports progress.
+        """
+        response = self.client.post(self.url, {'action_type': 'run_now', 'filters': {'status': 'scheduled'}},
+                                    format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual((response.data['status'], response.data['total']), ('pending', 8))
+        task.delay.assert_called_once()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            run_bulk_action(*task.delay.call_args.args, **task.delay.call_args.kwargs)
+        self.assertEqual(publish.call_count, 3)
+
+        response = self.client.get(f"{self.url}{response.data['operation_id']}/")
+        self.assertEqual((response.data['status'], response.data['processed'], response.data['updated']),
+                         ('completed', 8, 8))
+        self.assertFalse(ScheduledJob.objects.filter(status='scheduled').exists())
+        self.assertEqual(ScheduledJobRun.objects.count(), 8)
+        self.assertFalse(ScheduledProcessAction.objects.filter(generation=0, scheduled_job__object_id__gt=0).exists())
+
+    def test_requires_ids_or_filters(self):
+        """
+        Test a bulk action without ids or filters is rejected instead of touching every job.
+        """
+        response = self.client.post(self.url, {'action_type': 'cancel'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(f'{self.url}0123abcd/')
+        self.assertEqual(response.status_code, 404)
+
+
+class LogPartitionTestCase(TestCase):
+    table = ActivityLogs._meta.db_table
+
+    def test_partition_maintenance(self):
+        """
+        Test upcoming partitions are created and partitions past the retention window are dropped.
+        """
+        current_month = now().date().replace(day=1)
+        expired_month = add_months(current_month, -13)
+        create_month_partition(self.table, expired_month)
+
+        ensure_partitions(months_ahead=2)
+        partitions = get_month_partitions(self.table)
+        for offset in range(3):
+            self.assertIn(add_months(current_month, offset), partitions)
+
+        dropped = drop_expired_partitions(retention_months=12)
+        self.assertIn(f"{self.table}_p{expired_month:%Y%m}", dropped)
+        self.assertNotIn(expired_month, get_month_partitions(self.table))
+
+    def test_truncate(self):
+        """
+        Test clearing the logs removes rows from every partition.
+        """
+        ActivityLogs.objects.create(action_type='email_sent')
+        log = ActivityLogs.objects.create(action_type='sms_sent')
+        ActivityLogs.objects.filter(id=log.id).update(created_at=now() - timedelta(days=400))
+
+        truncate_model(ActivityLogs)
+        self.assertFalse(ActivityLogs.objects.exists())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ActivityLogBufferTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_flush_on_size(self):
+        """
+        Test entries are written in bulk once the buffer is full, not one by one.
+        """
+        buffer = ActivityLogBuffer(batch_size=3, flush_interval=60)
+        buffer.add(ActivityLogs(action_type='email_sent'))
+        buffer.add(ScheduledActionTrack(status='success', message='Done'))
+        self.assertFalse(ActivityLogs.objects.exists())
+
+        with self.assertNumQueries(2):
+            buffer.add(ActivityLogs(action_type='sms_sent'))
+        self.assertEqual(ActivityLogs.objects.count(), 2)
+        self.assertEqual(ScheduledActionTrack.objects.count(), 1)
+        self.assertEqual(buffer.get_stats()['entries_written'], 3)
+        self.assertEqual(get_flush_metrics()['flushes'], 1)
+
+    def test_failed_flush_counts_lost_entries(self):
+        """
+        Test entries failing after a retry are counted as lost instead of raising.
+        """
+        buffer = ActivityLogBuffer(batch_size=10, flush_interval=60)
+        buffer.add(ActivityLogs(action_type='email_sent'))
+        with mock.patch.object(ActivityLogs.objects, 'bulk_create', side_effect=RuntimeError('down')) as bulk_create:
+            self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(bulk_create.call_count, 2)
+        self.assertEqual(buffer.get_stats()['entries_lost'], 1)
+        self.assertEqual(get_flush_metrics()['loss_rate'], 1.0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ROOT_URLCONF='processes.tests')
+class ExportTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Account.objects.create_user(email="admin@example.com", password="strongpassword123",
+                                               is_staff=True, is_superuser=True)
+        process = Process.objects.create(name="Reminder", event_type='booking_created')
+        for object_id in range(5):
+            job = ScheduledJob.objects.create(process=process, object_id=object_id, run_time=now(),
+                                              status='completed' if object_id % 2 else 'scheduled')
+            ActivityLogs.objects.create(action_type='email_sent', action_track=job, user=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_csv_export(self):
+        """
+        Test scheduled jobs stream as CSV with the list filters applied.
+        """
+        response = self.client.get('/api/v1/scheduled-jobs/export/', {'status': 'completed'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['id', 'process_id', 'process_name'])
+        self.assertEqual(len(lines), 3)
+
+    def test_ndjson_export(self):
+        """
+        Test activity logs stream as one JSON object per line.
+        """
+        response = self.client.get('/api/v1/activity-logs/export/', {'export_format': 'ndjson'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['user_email'], 'admin@example.com')
+        self.assertEqual(rows[0]['process_name'], 'Reminder')
+
+    def test_unknown_format(self):
+        """
+        Test an unsupported export format is rejected.
+        """
+        response = self.client.get('/api/v1/activity-logs/export/', {'export_format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ActionRunStatisticTestCase(APITestCase):
+    url = '/api/v1/scheduled-jobs/statistics/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Account.objects.create_user(email="admin@example.com", password="strongpassword123",
+                                               is_staff=True, is_superuser=True)
+        cls.process = Process.objects.create(name="Reminder", event_type='booking_created')
+        cls.email = ProcessAction.objects.create(process=cls.process, action_type='send_email')
+        cls.sms = ProcessAction.objects.create(process=cls.process, action_type='send_sms')
+        cls.job = ScheduledJob.objects.create(process=cls.process, object_id=1, run_time=now())
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_counters_follow_written_tracks(self):
+        """
+        Test flushed action tracks increment one counter row per process, action type and day.
+        """
+        buffer = ActivityLogBuffer(batch_size=100, flush_interval=60)
+        for action, status in [(self.email, 'success'), (self.email, 'success'), (self.email, 'failed'),
+                               (self.sms, 'success')]:
+            buffer.add(ScheduledActionTrack(action=action, schedule=self.job, status=status))
+        buffer.flush()
+        buffer.add(ScheduledActionTrack(action=self.email, schedule=self.job, status='failed'))
+        buffer.flush()
+
+        email = ActionRunStatistic.objects.get(action_type='send_email')
+        self.assertEqual((email.success_count, email.failure_count), (2, 2))
+        self.assertEqual(ActionRunStatistic.objects.count(), 2)
+
+        response = self.client.get(self.url, {'action_type': 'send_email'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['totals']['total'], 4)
+        self.assertEqual(response.data['totals']['success_rate'], 0.5)
+        self.assertEqual(response.data['results'][0]['process_name'], 'Reminder')
+
+    def test_invalid_range(self):
+        """
+        Test an inverted date range is rejected.
+        """
+        response = self.client.get(self.url, {'min_date': '2024-02-01', 'max_date': '2024-01-01'})
+        self.assertEqual(response.status_code, 400)
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
@@ -10,15 +11,41 @@ from common_bases.permissions import IsAdminOrHasPermission
 from common_bases.serializers import EmptySerializer
 from common_bases.viewsets import InitialModelViewSet
 from processes.filters import ScheduledJobFilter, ActivityLogsFilter
-from processes.models import Process, ProcessAction, ScheduledJob, ActivityLogs
+from processes.models import Process, ProcessAction, ScheduledJob, ActivityLogs, ScheduledActionTrack, \
+    ScheduledJobRun, latest_run_annotations
 from processes.serializers import ChoicesSerializer, ProcessSerializer, ProcessActionCreateOrUpdateSerializer, \
     ProcessUpdateSerializer, ScheduledJobListSerializer, PaginatedScheduledJobResponseSerializer, ProcessListSerializer, \
     ProcessOptionSerializer, ProcessActionTestSerializer, ScheduleJobHandleActionSerializer, \
     MailchimpAudienceOptionList, \
-    PaginatedActivityLogsResponseSerializer, ActivityLogsListSerializer, ChoiceSerializer
+    PaginatedActivityLogsResponseSerializer, ActivityLogsListSerializer, ChoiceSerializer, \
+    ActivityLogBufferMetricsSerializer, ActionRunStatisticQuerySerializer, ActionRunStatisticsResponseSerializer, \
+    ScheduledJobRunSerializer, PaginatedScheduledJobRunResponseSerializer, ScheduledJobBulkActionSerializer, \
+    ScheduledJobBulkActionProgressSerializer
 from processes.services.process_service import cancel_scheduled_job, \
     run_scheduled_job_now, run_scheduled_job_again
-from utils.paginations import StandardResultsSetPagination
+from processes.services.activity_log_buffer import get_flush_metrics
+from processes.services.job_control_service import start_bulk_action, get_bulk_action_progress
+from processes.services.partition_service import truncate_model
+from processes.services.statistics_service import get_statistics
+from utils.exports import streaming_export_response
+from utils.paginations import get_list_pagination, StandardResultsSetPagination
+
+
+def get_job_relation_prefetches(prefix=''):
+    """
+    Prefetches of the process actions and action tracks serialized with a scheduled job,
+    limited to the serialized columns. `prefix` is the lookup path to the job.
+    """
+    return [
+        Prefetch(
+            f'{prefix}process__processaction_set',
+            queryset=ProcessAction.objects.only('id', 'process_id', 'action_type'),
+        ),
+        Prefetch(
+            f'{prefix}scheduledactiontrack_set',
+            queryset=ScheduledActionTrack.objects.only('id', 'schedule_id', 'status', 'message', 'updated_at'),
+        ),
+    ]
 
 
 class ProcessViewSets(InitialModelViewSet):
@@ -201,17 +228,44 @@ class ProcessViewSets(InitialModelViewSet):
 
 
 class ScheduledJobViewSets(InitialModelViewSet):
-    queryset = ScheduledJob.objects.all().order_by('-created_at')
+    queryset = ScheduledJob.objects.all().order_by('-created_at', '-id')
     permission_classes = [IsAdminUser]
     filterset_class = ScheduledJobFilter
-    custom_pagination = StandardResultsSetPagination()
     filter_backends = [DjangoFilterBackend]
+    export_columns = [
+        ('id', 'id'),
+        ('process_id', 'process_id'),
+        ('process_name', 'process__name'),
+        ('event_type', 'process__event_type'),
+        ('object_id', 'object_id'),
+        ('status', 'status'),
+        ('run_time', 'run_time'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ]
 
     def get_serializer_class(self):
         if self.action == 'handle_action':
             return ScheduleJobHandleActionSerializer
+        elif self.action == 'statistics':
+            return ActionRunStatisticQuerySerializer
+        elif self.action == 'run_history':
+            return ScheduledJobRunSerializer
+        elif self.action == 'bulk_action':
+            return ScheduledJobBulkActionSerializer
+        elif self.action == 'bulk_action_status':
+            return ScheduledJobBulkActionProgressSerializer
         return ScheduledJobListSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'scheduled_job_list':
+            # Load everything ScheduledJobListSerializer touches up front: one query per relation, not per job
+            queryset = queryset.select_related('process').prefetch_related(
+                *get_job_relation_prefetches()
+            ).annotate(**latest_run_annotations())
+        return queryset
+
     @extend_schema(
         request=None,
         responses={
@@ -222,6 +276,12 @@ class ScheduledJobViewSets(InitialModelViewSet):
                              location=OpenApiParameter.QUERY),
             OpenApiParameter(name='page_size', description='Result page size', required=False, type=int,
                              location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='pagination', description='Set to "cursor" for keyset pagination on (created_at, id)',
+                             required=False, type=str, enum=['cursor'], location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='cursor', description='Cursor from the next/previous link (cursor pagination)',
+                             required=False, type=str, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='count', description='Set to "approximate" to use the planner row estimate',
+                             required=False, type=str, enum=['approximate'], location=OpenApiParameter.QUERY),
             OpenApiParameter(name='event_type', description='Filter by event type', required=False,
                              type=str, location=OpenApiParameter.QUERY),
             OpenApiParameter(name='process_id', description='Filter by process', required=False, type=int,
@@ -242,9 +302,128 @@ class ScheduledJobViewSets(InitialModelViewSet):
     def scheduled_job_list(self, request):
         queryset = self.get_queryset()
         queryset = self.filter_queryset(queryset)
-        result_page = self.custom_pagination.paginate_queryset(queryset, request)
+        pagination = get_list_pagination(request)
+        result_page = pagination.paginate_queryset(queryset, request)
         serializer = self.get_serializer(result_page, many=True)
-        return self.custom_pagination.get_paginated_response(serializer.data)
+        return pagination.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        request=None,
+        responses={
+            (200, 'text/csv'): OpenApiTypes.STR,
+            (200, 'application/x-ndjson'): OpenApiTypes.STR,
+        },
+        parameters=[
+            OpenApiParameter(name='export_format', description='Export format', required=False, type=str,
+                             enum=['csv', 'ndjson'], location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='event_type', description='Filter by event type', required=False,
+                             type=str, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='process_id', description='Filter by process', required=False, type=int,
+                             location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='object_id', description='Filter by object id', required=False, type=int,
+                             location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='status', description='Filter by status', required=False, type=str,
+                             location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='max_date', description='Filter by max date', required=False,
+                             type=OpenApiTypes.DATETIME, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='min_date', description='Filter by min date', required=False,
+                             type=OpenApiTypes.DATETIME, location=OpenApiParameter.QUERY)
+        ],
+        operation_id='scheduled_job_export',
+        tags=['ScheduledJobs'],
+    )
+    @action(detail=False, methods=['GET'], name='Scheduled Job Export', url_path='export')
+    def scheduled_job_export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return streaming_export_response(
+            queryset, self.export_columns, request.query_params.get('export_format'), 'scheduled-jobs'
+        )
+
+    @extend_schema(
+        request=None,
+        responses={
+            200: ActionRunStatisticsResponseSerializer,
+        },
+        parameters=[
+            OpenApiParameter(name='min_date', description='First day (defaults to 30 days ago)', required=False,
+                             type=OpenApiTypes.DATE, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='max_date', description='Last day (defaults to today)', required=False,
+                             type=OpenApiTypes.DATE, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='process_id', description='Filter by process', required=False, type=int,
+                             location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='action_type', description='Filter by action type', required=False,
+                             type=str, location=OpenApiParameter.QUERY),
+        ],
+        operation_id='scheduled_job_statistics',
+        tags=['ScheduledJobs'],
+    )
+    @action(detail=False, methods=['GET'], name='Scheduled Job Statistics', url_path='statistics')
+    def statistics(self, request):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        statistics = get_statistics(**serializer.validated_data)
+        return Response(ActionRunStatisticsResponseSerializer(statistics).data)
+
+    @extend_schema(
+        request=None,
+        responses={
+            200: PaginatedScheduledJobRunResponseSerializer,
+        },
+        parameters=[
+            OpenApiParameter(name='page', description='Result page number', required=False, type=int,
+                             location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='page_size', description='Result page size', required=False, type=int,
+                             location=OpenApiParameter.QUERY),
+        ],
+        operation_id='scheduled_job_run_history',
+        tags=['ScheduledJobs'],
+    )
+    @action(detail=True, methods=['GET'], name='Scheduled Job Run History', url_path='run-history')
+    def run_history(self, request, pk=None):
+        job = get_object_or_404(ScheduledJob, pk=pk)
+        queryset = ScheduledJobRun.objects.filter(scheduled_job=job).order_by('-id')
+        pagination = StandardResultsSetPagination()
+        result_page = pagination.paginate_queryset(queryset, request)
+        serializer = self.get_serializer(result_page, many=True)
+        return pagination.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        request=ScheduledJobBulkActionSerializer,
+        responses={
+            200: ScheduledJobBulkActionProgressSerializer,
+            202: ScheduledJobBulkActionProgressSerializer,
+        },
+        operation_id='scheduled_job_bulk_action',
+        tags=['ScheduledJobs'],
+    )
+    @action(detail=False, methods=['POST'], name='Scheduled jobs bulk action', url_path='bulk-action')
+    def bulk_action(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # Filters are passed to the task as the same strings the list endpoint receives
+        filters = {key: str(value) for key, value in serializer.validated_data.get('filters', {}).items()}
+        progress = start_bulk_action(
+            serializer.validated_data['action_type'], request.user.id,
+            ids=serializer.validated_data.get('ids'), filters=filters,
+        )
+        response_status = status.HTTP_200_OK if progress['status'] == 'completed' else status.HTTP_202_ACCEPTED
+        return Response(ScheduledJobBulkActionProgressSerializer(progress).data, status=response_status)
+
+    @extend_schema(
+        request=None,
+        responses={
+            200: ScheduledJobBulkActionProgressSerializer,
+        },
+        operation_id='scheduled_job_bulk_action_status',
+        tags=['ScheduledJobs'],
+    )
+    @action(detail=False, methods=['GET'], name='Scheduled jobs bulk action status',
+            url_path=r'bulk-action/(?P<operation_id>[0-9a-f]+)')
+    def bulk_action_status(self, request, operation_id=None):
+        progress = get_bulk_action_progress(operation_id)
+        if progress is None:
+            return Response({"non_field_errors": ["Unknown bulk action."]}, status=status.HTTP_404_NOT_FOUND)
+        return Response(ScheduledJobBulkActionProgressSerializer(progress).data)
 
     @extend_schema(
         request=ScheduleJobHandleActionSerializer,
@@ -274,15 +453,24 @@ class ScheduledJobViewSets(InitialModelViewSet):
 
 
 class ActivityLogsViewSets(InitialModelViewSet):
-    queryset = ActivityLogs.objects.select_related('action_track').all().order_by('-created_at')
+    queryset = ActivityLogs.objects.select_related('action_track').all().order_by('-created_at', '-id')
     filterset_class = ActivityLogsFilter
-    custom_pagination = StandardResultsSetPagination()
     filter_backends = [DjangoFilterBackend]
+    export_columns = [
+        ('id', 'id'),
+        ('action_type', 'action_type'),
+        ('action_view_link', 'action_view_link'),
+        ('scheduled_job_id', 'action_track_id'),
+        ('process_name', 'action_track__process__name'),
+        ('user_id', 'user_id'),
+        ('user_email', 'user__email'),
+        ('created_at', 'created_at'),
+    ]
 
     required_permissions = []
 
     def get_permissions(self):
-        if self.action == 'activity_logs_list':
+        if self.action in ['activity_logs_list', 'activity_logs_export', 'log_buffer_metrics']:
             self.required_permissions = ['processes.api_read_activitylogs']
             self.permission_classes = [IsAdminOrHasPermission]
         elif self.action == 'clear_activity_logs':
@@ -290,11 +478,22 @@ class ActivityLogsViewSets(InitialModelViewSet):
             self.permission_classes = [IsAdminOrHasPermission]
         return super(self.__class__, self).get_permissions()
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'activity_logs_list':
+            # Load everything ActivityLogsListSerializer touches up front: one query per relation, not per log
+            queryset = queryset.select_related('user', 'action_track__process').prefetch_related(
+                *get_job_relation_prefetches('action_track__')
+            ).annotate(**latest_run_annotations('action_track_id'))
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'action_option_list':
             return ChoiceSerializer
         elif self.action == 'activity_logs_list':
             return ActivityLogsListSerializer
+        elif self.action == 'log_buffer_metrics':
+            return ActivityLogBufferMetricsSerializer
         return EmptySerializer
 
     @extend_schema(
@@ -323,6 +522,12 @@ class ActivityLogsViewSets(InitialModelViewSet):
                              location=OpenApiParameter.QUERY),
             OpenApiParameter(name='page_size', description='Result page size', required=False, type=int,
                              location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='pagination', description='Set to "cursor" for keyset pagination on (created_at, id)',
+                             required=False, type=str, enum=['cursor'], location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='cursor', description='Cursor from the next/previous link (cursor pagination)',
+                             required=False, type=str, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='count', description='Set to "approximate" to use the planner row estimate',
+                             required=False, type=str, enum=['approximate'], location=OpenApiParameter.QUERY),
             OpenApiParameter(name='action_type', description='Filter by action type', required=False,
                              type=str, location=OpenApiParameter.QUERY),
             OpenApiParameter(name='email', description='Filter by user email', required=False,
@@ -341,9 +546,38 @@ class ActivityLogsViewSets(InitialModelViewSet):
     def activity_logs_list(self, request):
         queryset = self.get_queryset()
         queryset = self.filter_queryset(queryset)
-        result_page = self.custom_pagination.paginate_queryset(queryset, request)
+        pagination = get_list_pagination(request)
+        result_page = pagination.paginate_queryset(queryset, request)
         serializer = self.get_serializer(result_page, many=True)
-        return self.custom_pagination.get_paginated_response(serializer.data)
+        return pagination.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        request=None,
+        responses={
+            (200, 'text/csv'): OpenApiTypes.STR,
+            (200, 'application/x-ndjson'): OpenApiTypes.STR,
+        },
+        parameters=[
+            OpenApiParameter(name='export_format', description='Export format', required=False, type=str,
+                             enum=['csv', 'ndjson'], location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='action_type', description='Filter by action type', required=False,
+                             type=str, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='email', description='Filter by user email', required=False,
+                             type=str, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='max_date', description='Filter by max date', required=False,
+                             type=OpenApiTypes.DATETIME, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='min_date', description='Filter by min date', required=False,
+                             type=OpenApiTypes.DATETIME, location=OpenApiParameter.QUERY)
+        ],
+        operation_id='activity_logs_export',
+        tags=['ActivityLogs'],
+    )
+    @action(detail=False, methods=['GET'], name='Activity Logs Export', url_path='export')
+    def activity_logs_export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return streaming_export_response(
+            queryset, self.export_columns, request.query_params.get('export_format'), 'activity-logs'
+        )
 
     @extend_schema(
         request=None,
@@ -355,6 +589,18 @@ class ActivityLogsViewSets(InitialModelViewSet):
     )
     @action(detail=False, methods=['POST'], name='Clear Activity Logs', url_path='clear-activity-logs')
     def clear_activity_logs(self, request, *args, **kwargs):
-        queryset = ActivityLogs.objects.all()
-        queryset.delete()
+        truncate_model(ActivityLogs)
         return Response({'message': 'Activity logs cleared successfully!'})
+
+    @extend_schema(
+        request=None,
+        responses={
+            200: ActivityLogBufferMetricsSerializer,
+        },
+        operation_id='log_buffer_metrics',
+        tags=['ActivityLogs'],
+    )
+    @action(detail=False, methods=['GET'], name='Activity Log Buffer Metrics', url_path='log-buffer-metrics')
+    def log_buffer_metrics(self, request, *args, **kwargs):
+        serializer = self.get_serializer(get_flush_metrics())
+        return Response(serializer.data)
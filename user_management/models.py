@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 from common_bases.base_models import BaseModel
 from .managers import AccountManager
@@ -18,6 +20,12 @@ class Account(AbstractUser):
 
     objects = AccountManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Trigram index for email icontains searches (matches Django's UPPER(...) LIKE UPPER(...))
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='account_email_trgm_idx'),
+        ]
+
 
 class EmailUpdateRequest(BaseModel):
     user = models.OneToOneField(get_user_model(), on_delete=models.CASCADE)
@@ -3,6 +3,8 @@ from django.conf import settings
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 
+from notifications.services.email_pool import get_email_pool
+
 
 @shared_task
 def send_account_activate_email(to, context, from_email=settings.DEFAULT_FROM_EMAIL):
@@ -11,7 +13,7 @@ def send_account_activate_email(to, context, from_email=settings.DEFAULT_FROM_EM
     email_subject = 'Insurace School of Texas | Verify Account'
     message = EmailMessage(email_subject, html_message, from_email, [to])
     message.content_subtype = 'html'
-    message.send()
+    get_email_pool().send(message)
 
 
 @shared_task
@@ -21,7 +23,7 @@ def send_account_reset_password_email(to, context, from_email=settings.DEFAULT_F
     email_subject = 'Insurace School of Texas | Reset Password'
     message = EmailMessage(email_subject, html_message, from_email, [to])
     message.content_subtype = 'html'
-    message.send()
+    get_email_pool().send(message)
 
 
 @shared_task
@@ -31,7 +33,7 @@ def send_customer_account_reset_password_email(to, context, from_email=settings.
     email_subject = 'Insurace School of Texas | Reset Password'
     message = EmailMessage(email_subject, html_message, from_email, [to])
     message.content_subtype = 'html'
-    message.send()
+    get_email_pool().send(message)
 
 
 @shared_task
@@ -41,7 +43,7 @@ def send_staff_invitation_email(to, context, from_email=settings.DEFAULT_FROM_EM
     email_subject = 'Insurace School of Texas | Invitation to Join Team'
     message = EmailMessage(email_subject, html_message, from_email, [to])
     message.content_subtype = 'html'
-    message.send()
+    get_email_pool().send(message)
 
 
 @shared_task
@@ -51,4 +53,4 @@ def send_email_update_link(to, context, from_email=settings.DEFAULT_FROM_EMAIL):
     email_subject = 'Insurace School of Texas | Update Email'
     message = EmailMessage(email_subject, html_message, from_email, [to])
     message.content_subtype = 'html'
-    message.send()
+    get_email_pool().send(message)
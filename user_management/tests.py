@@ -1,10 +1,15 @@
+from smtplib import SMTPException
+from unittest import mock
+
 from django.contrib.auth.models import Permission
+from django.test import SimpleTestCase
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from roles.models import CustomGroup
 from user_management.models import Account
+from user_management.tasks import send_account_activate_email
 
 
 # Create your tests here.
@@ -877,3 +882,15 @@ class AuthViewSetsTestCase(APITestCase):
 
         # Assert the response status code
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AccountEmailTaskTestCase(SimpleTestCase):
+    @mock.patch('user_management.tasks.get_email_pool')
+    def test_delivery_error_fails_the_task(self, get_email_pool):
+        """
+        Test account emails are sent right away so a delivery error fails the task.
+        """
+        get_email_pool.return_value.send.side_effect = SMTPException('Connection refused')
+        result = send_account_activate_email.apply(args=['customer@example.com', {}])
+        self.assertTrue(result.failed())
+        self.assertIsInstance(result.result, SMTPException)
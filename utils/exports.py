@@ -0,0 +1,50 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils.timezone import now
+from rest_framework.exceptions import ValidationError
+
+from utils.echo_class import Echo
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+EXPORT_CHUNK_SIZE = 2000
+
+
+def iter_csv_rows(rows, columns):
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for header, _ in columns])
+    for row in rows:
+        yield writer.writerow([row[field] for _, field in columns])
+
+
+def iter_ndjson_rows(rows, columns):
+    for row in rows:
+        yield json.dumps({header: row[field] for header, field in columns}, cls=DjangoJSONEncoder) + '\n'
+
+
+def streaming_export_response(queryset, columns, export_format, filename, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream a queryset as CSV or NDJSON. `columns` is a list of (header, field lookup) pairs;
+    only those values are selected and rows are read in chunks from a server-side cursor,
+    so memory use does not grow with the result size.
+    """
+    export_format = export_format or 'csv'
+    if export_format not in EXPORT_CONTENT_TYPES:
+        raise ValidationError({'export_format': [f'Choose one of: {", ".join(EXPORT_CONTENT_TYPES)}.']})
+
+    rows = queryset.values(*[field for _, field in columns]).iterator(chunk_size=chunk_size)
+    if export_format == 'ndjson':
+        content = iter_ndjson_rows(rows, columns)
+    else:
+        content = iter_csv_rows(rows, columns)
+
+    response = StreamingHttpResponse(content, content_type=EXPORT_CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = (
+        f'attachment; filename="{filename}-{now().strftime("%Y%m%d%H%M%S")}.{export_format}"'
+    )
+    return response
@@ -1,7 +1,169 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Below this planner estimate the exact count is cheap enough to run
+APPROXIMATE_COUNT_THRESHOLD = 10000
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator using the Postgres planner estimate instead of COUNT(*).
+    Unfiltered querysets read pg_class.reltuples (summed over the partitions of partitioned tables);
+    filtered ones use the row estimate of the query plan. Small estimates fall back to an exact count.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return super().count
+
+        estimate = self.get_estimate(queryset, connection)
+        if estimate is None or estimate < APPROXIMATE_COUNT_THRESHOLD:
+            return super().count
+        return estimate
+
+    @staticmethod
+    def get_estimate(queryset, connection):
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                # Autovacuum never analyzes partitioned parents, their partitions hold the estimates
+                cursor.execute(
+                    "SELECT c.relkind, c.reltuples, ("
+                    "  SELECT sum(p.reltuples) FILTER (WHERE p.reltuples >= 0)"
+                    "  FROM pg_partition_tree(c.oid) t JOIN pg_class p ON p.oid = t.relid WHERE t.isleaf"
+                    ") FROM pg_class c WHERE c.oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                relkind, reltuples, partition_tuples = row
+                if relkind == 'p':
+                    return int(partition_tuples) if partition_tuples is not None else None
+                # reltuples is -1 until the table has been vacuumed or analyzed
+                return int(reltuples) if reltuples >= 0 else None
+
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
 
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 1000
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.count_query_param) == 'approximate':
+            self.django_paginator_class = ApproximateCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on (created_at, id), newest first.
+    Pages are fetched with a range condition on the ('-created_at', '-id') index instead of
+    COUNT(*) and OFFSET, so deep pages cost the same as the first one.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            created_at = parse_datetime(cursor['created_at'])
+            if created_at is None:
+                raise ValueError
+            return created_at, int(cursor['id']), bool(cursor.get('reverse'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, reverse=False):
+        cursor = {'created_at': instance.created_at.isoformat(), 'id': instance.id}
+        if reverse:
+            cursor['reverse'] = True
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor[2])
+
+        if cursor:
+            created_at, pk = cursor[0], cursor[1]
+            if reverse:
+                queryset = queryset.filter(created_at__gte=created_at).exclude(created_at=created_at, id__lte=pk)
+            else:
+                queryset = queryset.filter(created_at__lte=created_at).exclude(created_at=created_at, id__gte=pk)
+
+        ordering = ('created_at', 'id') if reverse else ('-created_at', '-id')
+        results = list(queryset.order_by(*ordering)[:page_size + 1])
+        has_more = len(results) > page_size
+        self.page = results[:page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+def get_list_pagination(request):
+    """
+    Return the paginator for a list request: keyset pagination with ?pagination=cursor,
+    page numbers otherwise. A new instance is used per request since paginators keep request state.
+    """
+    if request.query_params.get('pagination') == 'cursor':
+        return KeysetPagination()
+    return StandardResultsSetPagination()